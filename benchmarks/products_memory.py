@@ -0,0 +1,105 @@
+"""Замер памяти на один продукт: классы со слотами и копии классов до перехода на слоты.
+
+Запуск: python -m benchmarks.products_memory [количество]
+"""
+
+import sys
+import tracemalloc
+from abc import ABC
+
+from src.products import LawnGrass, Product, Smartphone
+from src.reporting import silenced
+
+
+class DictProduct(ABC):
+    """Product до перехода на слоты: те же поля экземпляра, но в __dict__ (подписчики - атрибут класса)."""
+
+    def __init__(self, name: str, description: str, price: float, quantity: int) -> None:
+        self.name = name
+        self.description = description
+        self._price = price if price > 0 else 0
+        self._quantity = quantity
+
+
+class DictSmartphone(DictProduct):
+    """Smartphone до перехода на слоты."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        price: float,
+        quantity: int,
+        efficiency: float,
+        model: str,
+        memory: int,
+        color: str,
+    ) -> None:
+        self.efficiency = efficiency
+        self.model = model
+        self.memory = memory
+        self.color = color
+        super().__init__(name, description, price, quantity)
+
+
+class DictLawnGrass(DictProduct):
+    """LawnGrass до перехода на слоты."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        price: float,
+        quantity: int,
+        country: str,
+        germination_period: str,
+        color: str,
+    ) -> None:
+        self.country = country
+        self.germination_period = germination_period
+        self.color = color
+        super().__init__(name, description, price, quantity)
+
+
+# Класс со слотами -> его копия до перехода на слоты
+BEFORE_SLOTS = {Product: DictProduct, Smartphone: DictSmartphone, LawnGrass: DictLawnGrass}
+
+
+def _make_args(cls: type, index: int) -> tuple:
+    """Возвращает аргументы конструктора для index-го продукта класса cls."""
+    base = (f"Товар {index}", f"Описание {index}", 100.0 + index, index + 1)
+    if issubclass(cls, (Smartphone, DictSmartphone)):
+        return base + (90.0, "Модель", 256, "Черный")
+    if issubclass(cls, (LawnGrass, DictLawnGrass)):
+        return base + ("Россия", "7 дней", "Зеленый")
+    return base
+
+
+def bytes_per_product(cls: type, count: int) -> float:
+    """
+    Измеряет среднее число байт, выделенных на один экземпляр cls.
+
+    Строки создаются заранее, поэтому в замер попадают только сами объекты.
+    """
+    args = [_make_args(cls, index) for index in range(count)]
+    with silenced():
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        products = [cls(*product_args) for product_args in args]
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    # Вычитаем сам список с указателями на объекты
+    return (after - before - sys.getsizeof(products)) / count
+
+
+def main(count: int = 100_000) -> None:
+    """Печатает таблицу байт на продукт до и после перехода на слоты."""
+    print(f"{'Класс':<12}{'__dict__':>12}{'__slots__':>12}{'Экономия':>12}")
+    for cls, dict_cls in BEFORE_SLOTS.items():
+        with_dict = bytes_per_product(dict_cls, count)
+        with_slots = bytes_per_product(cls, count)
+        print(f"{cls.__name__:<12}{with_dict:>12.1f}{with_slots:>12.1f}{1 - with_slots / with_dict:>11.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
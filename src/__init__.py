@@ -1,5 +1,19 @@
+from .catalog import Catalog
 from .categories import Category
 from .products import Product
-from .utils import load_categories_from_json
+from .utils import (
+    ShardConflict,
+    iter_categories_from_json,
+    load_categories_from_json,
+    load_categories_from_shards,
+)
 
-__all__ = ["Product", "Category", "load_categories_from_json"]
+__all__ = [
+    "Product",
+    "Category",
+    "Catalog",
+    "load_categories_from_json",
+    "iter_categories_from_json",
+    "load_categories_from_shards",
+    "ShardConflict",
+]
@@ -0,0 +1,182 @@
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+from weakref import WeakMethod
+
+from src.categories import Category
+from src.indexes import Number, RangeIndex
+from src.products import Product
+from src.registry import ProductRegistry
+from src.search import SearchIndex
+
+T = TypeVar("T")
+
+
+class Catalog:
+    """
+    Каталог, владеющий категориями, реестром продуктов и счетчиками.
+
+    Категории, созданные через каталог, учитываются только в нем и не меняют
+    атрибуты класса Category, поэтому несколько каталогов могут независимо
+    существовать и наполняться параллельно в одном процессе.
+    """
+
+    def __init__(self, name: str = "") -> None:
+        """
+        Инициализация пустого каталога.
+
+        Args:
+            name: Название каталога (например, идентификатор арендатора)
+        """
+        self.name = name
+        self.category_count = 0
+        self.product_count = 0
+        self._categories: List[Category] = []
+        self._all_products = ProductRegistry()
+        # Индексы по всем продуктам каталога строятся при первом запросе,
+        # после чего каталог подписывается на изменения своих продуктов
+        self._indexes: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._observer = WeakMethod(self._on_product_changed)
+
+    def add_category(self, name: str, description: str, products: Iterable[Product] = ()) -> Category:
+        """
+        Создает категорию, принадлежащую каталогу.
+
+        Args:
+            name: Название категории
+            description: Описание категории
+            products: Товары категории
+
+        Returns:
+            Category: Новая категория
+        """
+        return Category(name, description, list(products), catalog=self)
+
+    def _register_category(self, category: Category) -> None:
+        """Учитывает новую категорию каталога."""
+        with self._lock:
+            self._categories.append(category)
+            self.category_count += 1
+
+    def _register_products(self, products: Iterable[Product], counted: bool = False) -> None:
+        """
+        Учитывает продукты в реестре каталога, каждый продукт - один раз.
+
+        Args:
+            products: Продукты для регистрации
+            counted: Продукты уже учтены в product_count (созданы из отложенных записей)
+        """
+        with self._lock:
+            added = [product for product in products if self._all_products.add(product)]
+            if not counted:
+                self.product_count += len(added)
+            if self._indexes:
+                for product in added:
+                    product.subscribe(self._observer)
+                for index in self._indexes.values():
+                    index.add_many(added)
+
+    def _count_products(self, count: int) -> None:
+        """Учитывает в product_count продукты, которые будут созданы из записей позже."""
+        with self._lock:
+            self.product_count += count
+
+    def _on_product_changed(self, product: Product, field: str, old, new) -> None:
+        """Перемещает измененный продукт в индексе диапазонов его поля или переиндексирует его текст."""
+        with self._lock:
+            range_index = self._indexes.get(field)
+            if range_index is not None:
+                range_index.update(product, old, new)
+            search_index = self._indexes.get("text")
+            if search_index is not None:
+                search_index.update(product, field, old, new)
+
+    def price_range(self, low: Optional[Number] = None, high: Optional[Number] = None) -> List[Product]:
+        """
+        Возвращает продукты каталога с ценой в диапазоне [low, high] по возрастанию цены за O(log n + k).
+
+        Учитываются продукты реестра каталога (отложенные записи категорий - после создания продуктов).
+
+        Args:
+            low: Нижняя граница цены (включительно); None - без ограничения
+            high: Верхняя граница цены (включительно); None - без ограничения
+
+        Returns:
+            List[Product]: Продукты диапазона
+        """
+        return self._range("price", low, high)
+
+    def quantity_range(self, low: Optional[Number] = None, high: Optional[Number] = None) -> List[Product]:
+        """
+        Возвращает продукты каталога с количеством в диапазоне [low, high] по возрастанию за O(log n + k).
+
+        Args:
+            low: Нижняя граница количества (включительно); None - без ограничения
+            high: Верхняя граница количества (включительно); None - без ограничения
+
+        Returns:
+            List[Product]: Продукты диапазона
+        """
+        return self._range("quantity", low, high)
+
+    def _range(self, field: str, low: Optional[Number], high: Optional[Number]) -> List[Product]:
+        """Выполняет запрос диапазона по индексу поля field."""
+        return self._query(field, lambda products: RangeIndex(field, products), lambda index: index.range(low, high))
+
+    def search(self, query: str, prefix: bool = False) -> List[Product]:
+        """
+        Ищет продукты каталога, в названии или описании которых есть все слова запроса.
+
+        Args:
+            query: Строка запроса
+            prefix: Считать слова запроса префиксами ("смарт" найдет "смартфон")
+
+        Returns:
+            List[Product]: Найденные продукты в порядке регистрации в каталоге
+        """
+        return self._query("text", SearchIndex, lambda index: index.search(query, prefix))
+
+    def _query(self, key: str, build: Callable[[ProductRegistry], Any], query: Callable[[Any], T]) -> T:
+        """Выполняет запрос к индексу key под блокировкой каталога, при первом обращении строя индекс."""
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                if not self._indexes:
+                    for product in self._all_products:
+                        product.subscribe(self._observer)
+                index = self._indexes[key] = build(self._all_products)
+            return query(index)
+
+    @property
+    def categories(self) -> List[Category]:
+        """Геттер для списка категорий каталога."""
+        return list(self._categories)
+
+    @property
+    def all_products(self) -> ProductRegistry:
+        """Геттер для реестра уникальных продуктов каталога."""
+        return self._all_products
+
+    def reset_counters(self) -> None:
+        """Сбрасывает категории, реестр и счетчики каталога."""
+        with self._lock:
+            if self._indexes:
+                for product in self._all_products:
+                    product.unsubscribe(self._observer)
+                self._indexes = {}
+            self._categories = []
+            self._all_products = ProductRegistry()
+            self.category_count = 0
+            self.product_count = 0
+
+    def __iter__(self) -> Iterator[Category]:
+        return iter(self.categories)
+
+    def __len__(self) -> int:
+        return len(self._categories)
+
+    def __repr__(self) -> str:
+        return (
+            f"Catalog(name={self.name!r}, categories_count={self.category_count}, "
+            f"products_count={self.product_count})"
+        )
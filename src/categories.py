@@ -1,7 +1,190 @@
-from typing import Iterator, List
-
+import logging
+import threading
+from operator import mul
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+from weakref import WeakMethod, ref
+
+from src.columnar import ProductColumns
 from src.exceptions import ZeroQuantityError
-from src.products import Product
+from src.facets import FacetIndex
+from src.indexes import Number, RangeIndex, check_sort_field
+from src.products import Product, resolve_observer
+from src.registry import ProductRegistry
+from src.reporting import reporter, silenced
+from src.search import SearchIndex
+
+if TYPE_CHECKING:
+    from src.catalog import Catalog
+
+T = TypeVar("T")
+
+# Отложенная запись категории: словарь в формате products.json или номер записи снимка (см. src.snapshot)
+_RECORD_TYPES = (dict, int)
+# Создает продукт из отложенной записи категории; его цена и количество совпадают с учтенными в агрегатах
+# при добавлении записи. Продукт, общий для нескольких категорий, загрузчик сам передает им всем (см. SharedRecordLoader)
+RecordLoader = Callable[[Any], Product]
+# Точные суммы записей для агрегатов категории: (количество, цены, стоимость), см. record_totals
+RecordTotals = Tuple[int, int, int]
+
+# Цены суммируются как целые числа в единицах 2**-1074 (наименьший шаг double):
+# любая цена-float переводится в такое число без потерь, поэтому суммы точны при любом числе изменений
+_SCALE_BITS = 1074
+
+
+def _to_exact(value: float) -> int:
+    """Переводит цену в точное целое число единиц 2**-1074."""
+    numerator, denominator = value.as_integer_ratio()
+    # Знаменатель float - степень двойки, поэтому деление сводится к сдвигу
+    return numerator << (_SCALE_BITS - denominator.bit_length() + 1)
+
+
+def _from_exact(value: int, divisor: int = 1) -> float:
+    """Переводит точную сумму (деленную на divisor) обратно в float с одним округлением."""
+    return value / (divisor << _SCALE_BITS)
+
+
+def record_totals(prices: Iterable[float], quantities: Iterable[int]) -> RecordTotals:
+    """
+    Считает точные суммы, на которые отложенные записи увеличивают агрегаты категории.
+
+    Args:
+        prices: Цены записей
+        quantities: Количества записей в том же порядке
+
+    Returns:
+        RecordTotals: Суммарное количество, сумма цен и стоимость запаса
+    """
+    exact = list(map(_to_exact, prices))
+    quantities = list(quantities)
+    return sum(quantities), sum(exact), sum(map(mul, exact, quantities))
+
+
+def _load_record(record: dict) -> Product:
+    """Создает продукт из словаря в формате products.json (запись уже проверена в _extend_records)."""
+    with silenced():
+        return Product.from_dict(record)
+
+
+def dispatch_changes(
+    categories: Iterable["Category"], field: str, changes: Collection[Tuple[Product, Any, Any]]
+) -> None:
+    """
+    Сообщает подписчикам о пакете изменений поля, записанных в товары напрямую (без сеттеров).
+
+    Переданные категории получают изменения одним пакетом на категорию,
+    остальные подписчики товаров (другие категории, каталоги) - поштучно, как при работе сеттера.
+
+    Args:
+        categories: Категории, агрегаты которых обновляются пакетно
+        field: Название поля ("price" или "quantity")
+        changes: Тройки (продукт, старое значение, новое значение)
+    """
+    batched = {category._on_product_changed: category for category in categories}
+    per_category: Dict[Category, List[Tuple[Product, Any, Any]]] = {}
+    for change in changes:
+        product, old, new = change
+        for observer in product._observers:
+            callback = resolve_observer(observer)
+            if callback is None:
+                continue
+            category = batched.get(callback)
+            if category is not None:
+                per_category.setdefault(category, []).append(change)
+            else:
+                callback(product, field, old, new)
+    for category, category_changes in per_category.items():
+        category._apply_changes(field, category_changes)
+
+
+class SharedRecordLoader:
+    """
+    Загрузчик отложенных записей-номеров, продукт которых может входить в несколько категорий.
+
+    Продукт записи создается один раз, при первом обращении из любой категории, и сразу подписывается на все
+    категории с этой записью (см. Category._adopt), поэтому их агрегаты учитывают изменения продукта еще до
+    обращения к нему через каждую из них. Наследники создают продукт записи в _create.
+    """
+
+    def __init__(self) -> None:
+        self._products: Dict[int, Product] = {}  # Номер записи -> продукт
+        # Номер записи, входящей в несколько категорий -> слабые ссылки на эти категории
+        self._owners: Dict[int, List["ref[Category]"]] = {}
+        # Создание продукта и его передача категориям выполняются под одной блокировкой,
+        # поэтому две категории не создадут два объекта и не подпишутся на продукт дважды
+        self._lock = threading.Lock()
+
+    def share(self, index: int, first: "Category", category: "Category") -> None:
+        """
+        Отмечает, что запись index, впервые добавленная в категорию first, входит и в category.
+
+        Вызывается при заполнении категорий, до первого обращения к продуктам.
+        """
+        owners = self._owners.get(index)
+        if owners is None:
+            owners = self._owners[index] = [ref(first)]
+        owners.append(ref(category))
+
+    def get(self, index: int, owner: "Category") -> Product:
+        """
+        Возвращает продукт записи index при обращении не через категорию (например, для отчета о загрузке).
+
+        Как и share, вызывается при заполнении категорий, до первого обращения к продуктам через них.
+
+        Args:
+            index: Номер записи
+            owner: Категория, в которую запись добавлена первой; созданный продукт подписывается на нее
+        """
+        with self._lock:
+            if index not in self._products:
+                self._owners.setdefault(index, [ref(owner)])
+        return self(index)
+
+    def __call__(self, index: int) -> Product:
+        """Возвращает продукт записи index, создавая его при первом обращении."""
+        product = self._products.get(index)
+        if product is not None:
+            return product
+        if index not in self._owners:
+            # Запись одной категории создается только ею под ее блокировкой, поэтому продукт не кешируется
+            return self._create(index)
+        with self._lock:
+            product = self._products.get(index)
+            if product is None:
+                product = self._create(index)
+                for owner in self._owners[index]:
+                    category = owner()
+                    if category is not None:
+                        category._adopt(product)
+                # Продукт публикуется после подписки категорий, чтобы ни одна из них не подписалась повторно,
+                # и до удаления владельцев, чтобы ни одна не создала его без блокировки
+                self._products[index] = product
+                del self._owners[index]
+        return product
+
+    def _create(self, index: int) -> Product:
+        """Создает продукт записи index."""
+        raise NotImplementedError
+
+
+class ProductPage(NamedTuple):
+    """Страница товаров категории."""
+
+    products: List[Product]
+    next_cursor: Optional[int]  # Курсор следующей страницы или None, если страница последняя
 
 
 class Category:
@@ -10,13 +193,25 @@ class Category:
     name: str
     description: str
     _products: list  # Приватный атрибут
+    _product_index: set  # Индекс продуктов категории
+    _total_quantity: int  # Агрегаты, поддерживаемые при каждом изменении
+    _price_sum: int
+    _stock_value: int
+    _pending: int  # Количество записей, продукты которых еще не созданы
+    _loader: Optional["RecordLoader"]  # Создает продукты отложенных записей
+    _rendered: Optional[str]  # Закешированная строка products
+    # Вторичные индексы (диапазоны цены и количества, полнотекстовый, фасетный), построенные при первом запросе
+    _indexes: Dict[str, Any]
 
     # Атрибуты класса
     category_count: int = 0
     product_count: int = 0
-    _all_products: List[Product] = []  # Список всех уникальных продуктов
+    _all_products: ProductRegistry = ProductRegistry()  # Реестр всех уникальных продуктов
+    # Защищает реестр и счетчики класса; данные экземпляра защищает собственная блокировка _lock,
+    # поэтому потоки, наполняющие разные категории, пересекаются только на короткой регистрации
+    _registry_lock = threading.Lock()
 
-    def __init__(self, name: str, description: str, products: list) -> None:
+    def __init__(self, name: str, description: str, products: list, catalog: Optional["Catalog"] = None) -> None:
         """
         Инициализация категории.
 
@@ -24,24 +219,178 @@ class Category:
             name: Название категории
             description: Описание категории
             products: Список товаров в категории
+            catalog: Каталог, в котором учитывается категория; по умолчанию используются
+                счетчики и реестр класса Category
         """
         self.name = name
         self.description = description
+        self._catalog = catalog
         self._products = []
+        self._product_index = set()  # Хеш-индекс для проверки вхождения за O(1)
+        # Суммы цен хранятся точно (см. _to_exact), чтобы инкрементальные изменения не накапливали ошибку округления
+        self._total_quantity = 0
+        self._price_sum = 0
+        self._stock_value = 0
+        self._pending = 0
+        self._loader = None
+        self._rendered = None
+        self._indexes = {}
+        self._lock = threading.Lock()
+        # Товары ссылаются на категорию слабо, поэтому ненужная категория удаляется вместе с подпиской
+        self._observer = WeakMethod(self._on_product_changed)
+
+        # Добавляем продукты без проверки типа и вывода сообщений
+        self._extend(products)
+
+        # Увеличиваем счетчик категорий
+        if catalog is not None:
+            catalog._register_category(self)
+        else:
+            with Category._registry_lock:
+                Category.category_count += 1
 
-        # Добавляем продукты через тот же метод add_product
-        for product in products:
-            # Временно отключаем проверку на существование в категории для конструктора
-            if product not in self._products:
-                self._products.append(product)
+    @classmethod
+    def from_records(
+        cls, name: str, description: str, records: Iterable[dict], catalog: Optional["Catalog"] = None
+    ) -> "Category":
+        """
+        Создает категорию из сырых записей продуктов (словарей в формате products.json).
 
-                # Проверяем, не был ли уже учтен этот продукт глобально
-                if product not in Category._all_products:
-                    Category._all_products.append(product)
-                    Category.product_count += 1
+        Продукты создаются при первом обращении к ним и кешируются в категории, поэтому
+        постраничный просмотр большой категории создает только возвращенные продукты.
+        Агрегаты и счетчики учитывают записи сразу.
 
-        # Увеличиваем счетчик категорий
-        Category.category_count += 1
+        Args:
+            name: Название категории
+            description: Описание категории
+            records: Словари с данными продуктов
+            catalog: Каталог, в котором учитывается категория
+
+        Returns:
+            Category: Новая категория
+
+        Raises:
+            ValueError: Если у записи неизвестный тип или нулевое количество
+        """
+        category = cls(name, description, [], catalog=catalog)
+        category._extend_records(records)
+        return category
+
+    def _extend_records(self, records: Iterable[dict]) -> None:
+        """
+        Добавляет в категорию записи продуктов без создания объектов.
+
+        Записи проверяются до вставки так же, как это сделал бы конструктор продукта,
+        чтобы ошибка не проявилась позже, при первом обращении.
+        """
+        pending = []
+        prices = []
+        quantities = []
+        for record in records:
+            product_type = record.get("type", Product.product_type)
+            if product_type not in Product._types:
+                raise ValueError(f"Неизвестный тип продукта: {product_type}")
+            quantity = record.get("quantity", 0)
+            if quantity == 0:
+                raise ValueError("Товар с нулевым количеством не может быть добавлен")
+            price = record.get("price", 0.0)
+            # Конструктор продукта заменяет неположительную цену нулем
+            prices.append(price if price > 0 else 0.0)
+            quantities.append(quantity)
+            pending.append(record)
+        self._defer(pending, _load_record, record_totals(prices, quantities), len(pending))
+
+    def _defer(self, records: List[Any], loader: RecordLoader, totals: RecordTotals, new_products: int) -> None:
+        """
+        Добавляет отложенные записи, продукты которых создаст loader при первом обращении.
+
+        Агрегаты увеличиваются сразу на суммы записей, без создания продуктов.
+
+        Args:
+            records: Записи в формате, понятном loader
+            loader: Функция, создающая продукт из записи
+            totals: Суммы цен и количеств записей (см. record_totals)
+            new_products: Сколько продуктов учесть в product_count
+
+        Raises:
+            ValueError: Если в категории остались записи другого источника
+        """
+        total_quantity, price_sum, stock_value = totals
+        with self._lock:
+            if self._pending and self._loader is not loader:
+                raise ValueError("Категория уже содержит отложенные записи другого источника")
+            self._products.extend(records)
+            self._pending += len(records)
+            if records:
+                self._loader = loader
+                self._rendered = None
+                # Индексы строятся по продуктам, поэтому после добавления записей строятся заново при запросе
+                self._indexes = {}
+            self._total_quantity += total_quantity
+            self._price_sum += price_sum
+            self._stock_value += stock_value
+
+        if self._catalog is not None:
+            self._catalog._count_products(new_products)
+        else:
+            with Category._registry_lock:
+                Category.product_count += new_products
+
+    def _product_at(self, index: int) -> Product:
+        """Возвращает продукт по индексу, создавая его из записи при первом обращении."""
+        product = self._products[index]
+        if isinstance(product, _RECORD_TYPES):
+            self._materialize((index,))
+            product = self._products[index]
+        return product
+
+    def _materialize(self, indices: Iterable[int]) -> None:
+        """Создает продукты из записей с номерами indices, заменяет ими записи и регистрирует продукты."""
+        created = []
+        observer = self._observer
+        with self._lock:
+            products = self._products
+            product_index = self._product_index
+            loader = self._loader
+            for index in indices:
+                record = products[index]
+                if not isinstance(record, _RECORD_TYPES):
+                    continue  # Продукт уже создан другим потоком
+                product = loader(record)
+                products[index] = product
+                created.append(product)
+                # Общий продукт уже подписан на категорию загрузчиком при создании (см. _adopt)
+                if product not in product_index:
+                    product_index.add(product)
+                    product.subscribe(observer)
+            self._pending -= len(created)
+            if not self._pending:
+                self._loader = None  # Источник (например, отображенный снимок) больше не нужен категории
+
+        # Продукты уже учтены в product_count при добавлении записей
+        if self._catalog is not None:
+            self._catalog._register_products(created, counted=True)
+        else:
+            with Category._registry_lock:
+                for product in created:
+                    Category._all_products.add(product)
+
+    def _adopt(self, product: Product) -> None:
+        """
+        Подписывает категорию на продукт ее отложенной записи, созданный при обращении через другую категорию.
+
+        Агрегаты категории учитывают значения записи, а продукт только что создан из нее, поэтому дальнейшие
+        изменения продукта учитываются обычным образом. Запись в списке заменяется продуктом при обращении
+        к ней, а добавление того же продукта до этого пропускается как дубликат. Блокировка категории не
+        захватывается: метод вызывается загрузчиком под блокировкой категории, создающей продукт.
+        """
+        self._product_index.add(product)
+        product.subscribe(self._observer)
+
+    def _materialize_all(self) -> None:
+        """Создает продукты для всех еще не обработанных записей."""
+        if self._pending:
+            self._materialize(range(len(self._products)))
 
     def add_product(self, product):
         try:
@@ -51,36 +400,155 @@ class Category:
             if product.quantity == 0:
                 raise ZeroQuantityError()
 
-            if product in self._products:
-                print(f"Продукт '{product.name}' уже есть в категории '{self.name}'")
+            if not self._extend((product,)):
+                reporter.report(logging.WARNING, "Продукт '%s' уже есть в категории '%s'", product.name, self.name)
                 return
 
-            self._products.append(product)
-            print(f"Товар {product.name} успешно добавлен")
-
-            if product not in Category._all_products:
-                Category._all_products.append(product)
-                Category.product_count += 1
+            reporter.report(logging.INFO, "Товар %s успешно добавлен", product.name)
 
         except ZeroQuantityError as e:
-            print(f"Ошибка: {e}")
+            reporter.report(logging.ERROR, "Ошибка: %s", e)
             raise  # Пробрасываем исключение дальше
         except TypeError as e:
-            print(f"Ошибка типа: {e}")
+            reporter.report(logging.ERROR, "Ошибка типа: %s", e)
             raise  # Пробрасываем исключение дальше
         finally:
-            print("Обработка добавления товара завершена")
+            reporter.report(logging.DEBUG, "Обработка добавления товара завершена")
+
+    def add_products(self, products: Iterable[Product]) -> int:
+        """
+        Пакетно добавляет продукты в категорию за один проход.
+
+        Все продукты проверяются до вставки, поэтому при ошибке категория не изменяется.
+        Дубликаты (в категории и внутри пакета) пропускаются.
+
+        Args:
+            products: Итерируемый набор продуктов
+
+        Returns:
+            int: Количество фактически добавленных продуктов
+
+        Raises:
+            TypeError: Если в наборе есть объект, не являющийся продуктом
+            ZeroQuantityError: Если в наборе есть продукт с нулевым количеством
+        """
+        batch = list(products)
+        for product in batch:
+            if not isinstance(product, Product):
+                raise TypeError(f"Можно добавить только продукт или его наследника, а не {type(product).__name__}")
+            if product.quantity == 0:
+                raise ZeroQuantityError()
+
+        return self._extend(batch)
+
+    def _extend(self, products: Iterable[Product]) -> int:
+        """
+        Добавляет продукты в категорию и в глобальный реестр без проверок типа.
+
+        Блокировка категории захватывается один раз на весь набор,
+        блокировка реестра - один раз на регистрацию добавленных продуктов.
+
+        Args:
+            products: Продукты для добавления
+
+        Returns:
+            int: Количество добавленных продуктов (уже имеющиеся в категории пропускаются)
+        """
+        added = []
+        index = self._product_index
+        observer = self._observer
+        total_quantity = price_sum = stock_value = 0
+        with self._lock:
+            for product in products:
+                if product in index:
+                    continue
+                index.add(product)
+                added.append(product)
+
+                price = _to_exact(product.price)
+                quantity = product.quantity
+                total_quantity += quantity
+                price_sum += price
+                stock_value += price * quantity
+                product.subscribe(observer)
+
+            self._products.extend(added)
+            if added:
+                self._rendered = None
+                for secondary in self._indexes.values():
+                    secondary.add_many(added)
+            self._total_quantity += total_quantity
+            self._price_sum += price_sum
+            self._stock_value += stock_value
+
+        # Проверяем, не были ли эти продукты уже учтены глобально
+        if self._catalog is not None:
+            self._catalog._register_products(added)
+        else:
+            with Category._registry_lock:
+                for product in added:
+                    if Category._all_products.add(product):
+                        Category.product_count += 1
+        return len(added)
+
+    def _on_product_changed(self, product: Product, field: str, old, new) -> None:
+        """
+        Обновляет агрегаты и индексы категории при изменении поля товара.
+
+        Args:
+            product: Измененный продукт
+            field: Название поля ("price", "quantity" или другое поле продукта)
+            old: Старое значение
+            new: Новое значение
+        """
+        self._apply_changes(field, ((product, old, new),))
+
+    def _apply_changes(self, field: str, changes: Collection[Tuple[Product, Any, Any]]) -> None:
+        """
+        Обновляет агрегаты и индексы категории по пакету изменений одного поля за один захват блокировки.
+
+        Args:
+            field: Название поля ("price", "quantity" или другое поле продукта)
+            changes: Тройки (продукт, старое значение, новое значение)
+        """
+        with self._lock:
+            self._rendered = None
+            range_index = self._indexes.get(field)
+            if range_index is not None:
+                range_index.update_many(changes)
+            if field == "price":
+                price_delta = stock_delta = 0
+                for product, old, new in changes:
+                    delta = _to_exact(new) - _to_exact(old)
+                    price_delta += delta
+                    stock_delta += delta * product.quantity
+                self._price_sum += price_delta
+                self._stock_value += stock_delta
+            elif field == "quantity":
+                quantity_delta = stock_delta = 0
+                for product, old, new in changes:
+                    quantity_delta += new - old
+                    stock_delta += _to_exact(product.price) * (new - old)
+                self._total_quantity += quantity_delta
+                self._stock_value += stock_delta
+            else:
+                # Название, описание и поля наследников входят в поисковый и фасетный индексы
+                for key in ("text", "facets"):
+                    index = self._indexes.get(key)
+                    if index is not None:
+                        for product, old, new in changes:
+                            index.update(product, field, old, new)
 
     def middle_price(self) -> float:
         """
-        Подсчитывает средний ценник всех товаров в категории.
+        Возвращает средний ценник всех товаров в категории за O(1).
 
         Returns:
             float: Средняя цена товаров или 0, если в категории нет товаров
         """
         try:
-            total = sum(product.price for product in self._products)
-            return total / len(self._products)
+            with self._lock:
+                return _from_exact(self._price_sum, len(self._products))
         except ZeroDivisionError:
             return 0.0
 
@@ -90,10 +558,22 @@ class Category:
         Геттер для получения строкового представления продуктов.
         Теперь использует __str__ каждого продукта.
 
+        Строка кешируется до изменения состава категории или цены/количества одного из ее товаров,
+        поэтому повторный вывод неизмененной категории не форматирует продукты заново.
+
         Returns:
             str: Строка со всеми продуктами
         """
-        return "\n".join(str(product) for product in self._products)
+        rendered = self._rendered
+        while rendered is None:
+            self._materialize_all()
+            # Строка собирается под блокировкой: изменение товара во время сборки
+            # дождется ее окончания и сбросит кеш, так что устаревшая строка не останется в кеше
+            with self._lock:
+                # Записи, добавленные после создания продуктов, обрабатываются на следующем проходе
+                if not self._pending:
+                    rendered = self._rendered = "\n".join(map(str, self._products))
+        return rendered
 
     @property
     def products_list(self):
@@ -103,26 +583,264 @@ class Category:
         Returns:
             list: Список объектов Product
         """
+        self._materialize_all()
         return self._products
 
+    def price_range(self, low: Optional[Number] = None, high: Optional[Number] = None) -> List[Product]:
+        """
+        Возвращает товары с ценой в диапазоне [low, high] по возрастанию цены за O(log n + k).
+
+        Args:
+            low: Нижняя граница цены (включительно); None - без ограничения
+            high: Верхняя граница цены (включительно); None - без ограничения
+
+        Returns:
+            List[Product]: Товары диапазона
+        """
+        return self._range("price", low, high)
+
+    def quantity_range(self, low: Optional[Number] = None, high: Optional[Number] = None) -> List[Product]:
+        """
+        Возвращает товары с количеством в диапазоне [low, high] по возрастанию количества за O(log n + k).
+
+        Args:
+            low: Нижняя граница количества (включительно); None - без ограничения
+            high: Верхняя граница количества (включительно); None - без ограничения
+
+        Returns:
+            List[Product]: Товары диапазона
+        """
+        return self._range("quantity", low, high)
+
+    def _range(self, field: str, low: Optional[Number], high: Optional[Number]) -> List[Product]:
+        """Выполняет запрос диапазона по индексу поля field."""
+        return self._query(field, lambda products: RangeIndex(field, products), lambda index: index.range(low, high))
+
+    def sorted_by(self, field: str, offset: int = 0, limit: int = 20, descending: bool = False) -> List[Product]:
+        """
+        Возвращает страницу товаров, отсортированных по числовому полю, за O(k).
+
+        Отсортированный индекс поля строится при первом запросе и дальше поддерживается при добавлении товаров
+        и изменении цены или количества, поэтому запрос не сортирует и не копирует весь список товаров.
+        Товары, у которых поля нет (например, efficiency у обычного Product), не возвращаются.
+
+        Args:
+            field: Поле из sort_fields класса продукта ("price", "quantity", "efficiency", "memory")
+            offset: Сколько товаров пропустить
+            limit: Максимальное количество товаров
+            descending: Сортировка по убыванию
+
+        Returns:
+            List[Product]: Товары страницы
+
+        Raises:
+            ValueError: Если по полю нельзя сортировать или аргументы страницы некорректны
+        """
+        check_sort_field(field)
+        if offset < 0:
+            raise ValueError("Смещение страницы не может быть отрицательным")
+        if limit <= 0:
+            raise ValueError("Размер страницы должен быть положительным")
+        return self._query(
+            field, lambda products: RangeIndex(field, products), lambda index: index.window(offset, limit, descending)
+        )
+
+    def top(self, field: str, k: int = 10, largest: bool = True) -> List[Product]:
+        """
+        Возвращает k товаров с наибольшим (или наименьшим) значением поля.
+
+        Например, top("price", 10, largest=False) - 10 самых дешевых товаров,
+        top("efficiency", 5) - 5 самых производительных смартфонов.
+
+        Args:
+            field: Поле из sort_fields класса продукта
+            k: Количество товаров
+            largest: Наибольшие значения (True) или наименьшие (False)
+
+        Returns:
+            List[Product]: Товары по убыванию (largest=True) или возрастанию значения поля (пустой список при k=0)
+
+        Raises:
+            ValueError: Если по полю нельзя сортировать или k отрицательное
+        """
+        if k < 0:
+            raise ValueError("Количество товаров не может быть отрицательным")
+        if k == 0:
+            check_sort_field(field)
+            return []
+        return self.sorted_by(field, 0, k, descending=largest)
+
+    def search(self, query: str, prefix: bool = False) -> List[Product]:
+        """
+        Ищет товары категории, в названии или описании которых есть все слова запроса.
+
+        Регистр и различие "е"/"ё" не учитываются (см. src.search.tokenize).
+
+        Args:
+            query: Строка запроса
+            prefix: Считать слова запроса префиксами ("смарт" найдет "смартфон")
+
+        Returns:
+            List[Product]: Найденные товары в порядке добавления в категорию
+        """
+        return self._query("text", SearchIndex, lambda index: index.search(query, prefix))
+
+    def facet_counts(self, product_type: str, field: str, **filters: Hashable) -> Dict[Hashable, int]:
+        """
+        Возвращает количество товаров категории по значениям фасета без перебора товаров.
+
+        Args:
+            product_type: Тип продукта (например, "smartphone")
+            field: Поле из facet_fields типа (например, "memory")
+            filters: Уже выбранные значения других фасетов (например, color="Черный")
+
+        Returns:
+            Dict[Hashable, int]: Значение поля -> количество товаров
+
+        Raises:
+            ValueError: Если тип продукта или поле фасета неизвестны
+        """
+        return self._query("facets", FacetIndex, lambda index: index.counts(product_type, field, **filters))
+
+    def facet_filter(self, product_type: str, **filters: Hashable) -> List[Product]:
+        """
+        Возвращает товары категории типа product_type с заданными значениями фасетов.
+
+        Args:
+            product_type: Тип продукта (например, "lawn_grass")
+            filters: Значения фасетов (например, country="Россия", color="Зеленый")
+
+        Returns:
+            List[Product]: Товары в порядке добавления в категорию
+
+        Raises:
+            ValueError: Если тип продукта или поле фасета неизвестны
+        """
+        return self._query("facets", FacetIndex, lambda index: index.filter(product_type, **filters))
+
+    def _query(self, key: str, build: Callable[[List[Product]], Any], query: Callable[[Any], T]) -> T:
+        """
+        Выполняет запрос к индексу key под блокировкой категории.
+
+        При первом обращении индекс строится по всем товарам (отложенные записи предварительно
+        превращаются в продукты), дальше он поддерживается в _extend и _on_product_changed.
+        """
+        while True:
+            with self._lock:
+                index = self._indexes.get(key)
+                if index is None and not self._pending:
+                    index = self._indexes[key] = build(self._products)
+                if index is not None:
+                    return query(index)
+            self._materialize_all()
+
+    def page(self, offset: int = 0, limit: int = 20) -> List[Product]:
+        """
+        Возвращает товары с offset по offset + limit за время, пропорциональное размеру страницы.
+
+        Из отложенных записей создаются только продукты, попавшие на страницу.
+
+        Args:
+            offset: Номер первого товара страницы
+            limit: Максимальное количество товаров на странице
+
+        Returns:
+            List[Product]: Товары страницы (пустой список за пределами категории)
+
+        Raises:
+            ValueError: Если offset отрицательный или limit не положительный
+        """
+        if offset < 0:
+            raise ValueError("Смещение страницы не может быть отрицательным")
+        if limit <= 0:
+            raise ValueError("Размер страницы должен быть положительным")
+        with self._lock:
+            window = self._products[offset : offset + limit]
+        if self._pending:
+            window = [
+                self._product_at(offset + i) if isinstance(item, _RECORD_TYPES) else item
+                for i, item in enumerate(window)
+            ]
+        return window
+
+    def render_page(self, offset: int = 0, limit: int = 20) -> str:
+        """
+        Возвращает строковое представление страницы товаров в формате products.
+
+        Args:
+            offset: Номер первого товара страницы
+            limit: Максимальное количество товаров на странице
+
+        Returns:
+            str: Строки товаров страницы, разделенные переводом строки
+        """
+        return "\n".join(map(str, self.page(offset, limit)))
+
+    def page_after(self, cursor: Optional[int] = None, limit: int = 20) -> ProductPage:
+        """
+        Возвращает страницу товаров, следующую за курсором.
+
+        Товары только добавляются в конец категории, поэтому курсор остается
+        действительным при пополнении категории между запросами страниц.
+
+        Args:
+            cursor: Курсор из предыдущей страницы (None - начало категории)
+            limit: Максимальное количество товаров на странице
+
+        Returns:
+            ProductPage: Товары страницы и курсор следующей страницы
+
+        Raises:
+            ValueError: Если курсор отрицательный или limit не положительный
+        """
+        offset = 0 if cursor is None else cursor
+        products = self.page(offset, limit)
+        next_offset = offset + len(products)
+        return ProductPage(products, next_offset if next_offset < len(self._products) else None)
+
     @property
     def total_quantity(self) -> int:
         """
-        Подсчитывает общее количество товаров в категории.
+        Возвращает общее количество товаров в категории за O(1).
 
         Returns:
             int: Суммарное количество всех товаров
         """
-        return sum(product.quantity for product in self._products)
+        return self._total_quantity
+
+    @property
+    def stock_value(self) -> float:
+        """
+        Возвращает общую стоимость товаров на складе (сумма цена * количество) за O(1).
+
+        Returns:
+            float: Стоимость всех товаров категории
+        """
+        return _from_exact(self._stock_value)
+
+    @property
+    def catalog(self) -> Optional["Catalog"]:
+        """Геттер для каталога категории (None для категорий без каталога)."""
+        return self._catalog
+
+    def to_columns(self) -> ProductColumns:
+        """
+        Экспортирует товары категории в колоночное хранилище для аналитики.
+
+        Returns:
+            ProductColumns: Колонки с ценами, количествами и строковыми полями товаров
+        """
+        return ProductColumns.from_products(self.products_list)
 
     @classmethod
     def reset_counters(cls):
         """
         Сбрасывает счетчики категорий и продуктов.
         """
-        cls.category_count = 0
-        cls.product_count = 0
-        cls._all_products = []
+        with cls._registry_lock:
+            cls.category_count = 0
+            cls.product_count = 0
+            cls._all_products = ProductRegistry()
 
     def __repr__(self) -> str:
         return f"Category(name={self.name!r}, description={self.description!r}, products_count={len(self._products)})"
@@ -130,10 +848,8 @@ class Category:
     def __str__(self) -> str:
         """
         Возвращает строковое представление категории с общим количеством товаров.
-        Суммирует quantity всех продуктов в категории.
         """
-        total = sum(product.quantity for product in self._products)
-        return f"{self.name}, количество продуктов: {total} шт."
+        return f"{self.name}, количество продуктов: {self._total_quantity} шт."
 
     def __iter__(self) -> Iterator[Product]:
         """
@@ -165,6 +881,6 @@ class CategoryIterator:
         """Возвращает следующий товар в категории."""
         if self._index >= len(self._category._products):
             raise StopIteration
-        product = self._category._products[self._index]
+        product = self._category._product_at(self._index)
         self._index += 1
         return product
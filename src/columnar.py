@@ -0,0 +1,186 @@
+import math
+import operator
+import sys
+from array import array
+from itertools import compress
+from typing import Callable, Dict, Iterable, List, Union
+
+from src.products import Product
+
+Number = Union[int, float]
+
+NUMERIC_COLUMNS = ("price", "quantity")
+STRING_COLUMNS = ("name", "description", "type")
+
+
+class ProductColumns:
+    """
+    Колоночное хранилище продуктов для аналитики.
+
+    Цены и количества лежат в непрерывных массивах array, строки интернируются,
+    а класс продукта хранится кодом в словаре типов. Агрегаты считаются
+    встроенными функциями по массивам, без обращения к атрибутам объектов.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация пустого хранилища."""
+        self.price = array("d")
+        self.quantity = array("q")
+        self.name: List[str] = []
+        self.description: List[str] = []
+        self._type_codes = array("B")
+        self._type_names: List[str] = []
+        self._type_index: Dict[str, int] = {}
+
+    @classmethod
+    def from_products(cls, products: Iterable[Product]) -> "ProductColumns":
+        """
+        Создает хранилище из набора продуктов.
+
+        Args:
+            products: Итерируемый набор продуктов
+
+        Returns:
+            ProductColumns: Заполненное хранилище
+        """
+        columns = cls()
+        for product in products:
+            columns.append(product)
+        return columns
+
+    def append(self, product: Product) -> None:
+        """
+        Добавляет строку с данными продукта.
+
+        Args:
+            product: Продукт для добавления
+        """
+        self.price.append(product.price)
+        self.quantity.append(product.quantity)
+        self.name.append(sys.intern(product.name))
+        self.description.append(sys.intern(product.description))
+        self._append_type(type(product).__name__)
+
+    def _append_type(self, type_name: str) -> None:
+        """Добавляет код класса продукта, расширяя словарь типов при необходимости."""
+        code = self._type_index.get(type_name)
+        if code is None:
+            code = self._type_index[type_name] = len(self._type_names)
+            self._type_names.append(type_name)
+        self._type_codes.append(code)
+
+    @property
+    def type(self) -> List[str]:
+        """Колонка с названиями классов продуктов."""
+        names = self._type_names
+        return [names[code] for code in self._type_codes]
+
+    def column(self, name: str) -> Union[array, List[str]]:
+        """
+        Возвращает колонку по имени.
+
+        Raises:
+            KeyError: Если колонки с таким именем нет
+        """
+        if name not in NUMERIC_COLUMNS and name not in STRING_COLUMNS:
+            raise KeyError(f"Нет колонки {name!r}")
+        return getattr(self, name)
+
+    def _numeric(self, name: str) -> array:
+        """Возвращает числовую колонку по имени."""
+        if name not in NUMERIC_COLUMNS:
+            raise KeyError(f"Нет числовой колонки {name!r}")
+        return getattr(self, name)
+
+    def sum(self, name: str) -> Number:
+        """Сумма числовой колонки (для цены - точно округленная через math.fsum)."""
+        values = self._numeric(name)
+        return math.fsum(values) if values.typecode == "d" else sum(values)
+
+    def mean(self, name: str) -> float:
+        """Среднее значение числовой колонки или 0, если хранилище пустое."""
+        if not len(self):
+            return 0.0
+        return self.sum(name) / len(self)
+
+    def min(self, name: str) -> Number:
+        """
+        Минимум числовой колонки.
+
+        Raises:
+            ValueError: Если хранилище пустое
+        """
+        return min(self._numeric(name))
+
+    def max(self, name: str) -> Number:
+        """
+        Максимум числовой колонки.
+
+        Raises:
+            ValueError: Если хранилище пустое
+        """
+        return max(self._numeric(name))
+
+    def stock_value(self) -> float:
+        """
+        Общая стоимость товаров на складе (сумма цена * количество) за один проход по массивам.
+
+        Returns:
+            float: Точно округленная сумма произведений
+        """
+        return math.fsum(map(operator.mul, self.price, self.quantity))
+
+    def stock_value_by_type(self) -> Dict[str, float]:
+        """
+        Стоимость товаров на складе отдельно по каждому классу продукта.
+
+        Returns:
+            Dict[str, float]: Название класса -> стоимость его товаров
+        """
+        totals = {}
+        for code, type_name in enumerate(self._type_names):
+            mask = list(map(code.__eq__, self._type_codes))
+            if not any(mask):
+                continue
+            totals[type_name] = math.fsum(map(operator.mul, compress(self.price, mask), compress(self.quantity, mask)))
+        return totals
+
+    def check_same_type(self) -> None:
+        """
+        Проверяет, что все строки относятся к одному классу, как того требует Product.__add__.
+
+        Raises:
+            TypeError: Если в хранилище товары разных классов
+        """
+        present = sorted(set(self._type_codes))
+        if len(present) > 1:
+            first, second = (self._type_names[code] for code in present[:2])
+            raise TypeError(f"Нельзя складывать товары разных классов: {first} и {second}")
+
+    def filter(self, name: str, predicate: Callable[[object], bool]) -> "ProductColumns":
+        """
+        Возвращает новое хранилище со строками, для которых predicate(значение колонки) истинно.
+
+        Args:
+            name: Имя колонки, к значениям которой применяется predicate
+            predicate: Условие отбора
+
+        Returns:
+            ProductColumns: Отфильтрованное хранилище
+        """
+        mask = list(map(predicate, self.column(name)))
+        result = ProductColumns()
+        result.price = array("d", compress(self.price, mask))
+        result.quantity = array("q", compress(self.quantity, mask))
+        result.name = list(compress(self.name, mask))
+        result.description = list(compress(self.description, mask))
+        result._type_names = list(self._type_names)
+        result._type_index = dict(self._type_index)
+        result._type_codes = array("B", compress(self._type_codes, mask))
+        return result
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    def __repr__(self) -> str:
+        return f"ProductColumns(rows={len(self)})"
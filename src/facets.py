@@ -0,0 +1,148 @@
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+from src.products import Product
+
+FacetKey = Tuple[str, str]  # (тип продукта, поле)
+
+
+def _facet_key(product_type: str, field: str) -> FacetKey:
+    """
+    Проверяет, что поле объявлено фасетом типа продукта.
+
+    Raises:
+        ValueError: Если тип продукта неизвестен или поле не входит в его facet_fields
+    """
+    product_class = Product._types.get(product_type)
+    if product_class is None:
+        raise ValueError(f"Неизвестный тип продукта: {product_type}")
+    if field not in product_class.facet_fields:
+        raise ValueError(f"Поле {field} не является фасетом типа {product_type}")
+    return product_type, field
+
+
+class FacetIndex:
+    """
+    Фасетный индекс по полям наследников Product (facet_fields класса).
+
+    Для каждой пары (тип продукта, поле) хранится словарь значение -> множество номеров продуктов,
+    поэтому количество товаров по значениям и пересечение фильтров вычисляются без перебора товаров.
+    Индекс обновляется при добавлении продуктов и при изменении их полей-фасетов (см. update).
+    """
+
+    def __init__(self, products: Iterable[Product] = ()) -> None:
+        """
+        Инициализация индекса.
+
+        Args:
+            products: Продукты для начального заполнения
+        """
+        self._products: List[Product] = []
+        self._ids: Dict[Product, int] = {}
+        self._postings: Dict[FacetKey, Dict[Hashable, Set[int]]] = {}
+        self._by_type: Dict[str, Set[int]] = {}  # Тип продукта -> номера его товаров
+        self.add_many(products)
+
+    def add_many(self, products: Iterable[Product]) -> int:
+        """
+        Добавляет продукты в индекс; уже проиндексированные продукты пропускаются.
+
+        Args:
+            products: Продукты для добавления
+
+        Returns:
+            int: Количество добавленных продуктов
+        """
+        added = 0
+        for product in products:
+            if product in self._ids:
+                continue
+            document = self._ids[product] = len(self._products)
+            self._products.append(product)
+            added += 1
+            product_type = product.product_type
+            self._by_type.setdefault(product_type, set()).add(document)
+            for field in product.facet_fields:
+                values = self._postings.setdefault((product_type, field), {})
+                values.setdefault(getattr(product, field), set()).add(document)
+        return added
+
+    def update(self, product: Product, field: str, old: Hashable, new: Hashable) -> None:
+        """
+        Переносит продукт к новому значению фасета; изменения полей, не являющихся фасетами, пропускаются.
+
+        Args:
+            product: Измененный продукт
+            field: Название поля
+            old: Старое значение
+            new: Новое значение
+        """
+        document = self._ids.get(product)
+        if document is None or field not in product.facet_fields:
+            return
+        values = self._postings[(product.product_type, field)]
+        documents = values[old]
+        documents.discard(document)
+        if not documents:
+            del values[old]
+        values.setdefault(new, set()).add(document)
+
+    def counts(self, product_type: str, field: str, **filters: Hashable) -> Dict[Hashable, int]:
+        """
+        Возвращает количество товаров по значениям фасета.
+
+        Args:
+            product_type: Тип продукта (например, "smartphone")
+            field: Поле фасета (например, "memory")
+            filters: Уже выбранные значения других фасетов того же типа (например, color="Черный")
+
+        Returns:
+            Dict[Hashable, int]: Значение поля -> количество товаров (значения без товаров не включаются)
+
+        Raises:
+            ValueError: Если тип продукта или поле фасета неизвестны
+        """
+        values = self._postings.get(_facet_key(product_type, field), {})
+        if not filters:
+            return {value: len(documents) for value, documents in values.items()}
+        selected = self._select(product_type, filters)
+        counts = {value: len(documents & selected) for value, documents in values.items()}
+        return {value: count for value, count in counts.items() if count}
+
+    def filter(self, product_type: str, **filters: Hashable) -> List[Product]:
+        """
+        Возвращает товары типа product_type со всеми заданными значениями фасетов.
+
+        Args:
+            product_type: Тип продукта
+            filters: Значения фасетов (например, memory=256, color="Черный"); без фильтров - все товары типа
+
+        Returns:
+            List[Product]: Товары в порядке добавления в индекс
+
+        Raises:
+            ValueError: Если тип продукта или поле фасета неизвестны
+        """
+        documents = self._select(product_type, filters)
+        products = self._products
+        return [products[document] for document in sorted(documents)]
+
+    def _select(self, product_type: str, filters: Dict[str, Hashable]) -> Set[int]:
+        """Пересекает множества товаров выбранных значений, начиная с самого короткого."""
+        if product_type not in Product._types:
+            raise ValueError(f"Неизвестный тип продукта: {product_type}")
+        if not filters:
+            return self._by_type.get(product_type, set())
+        matches = []
+        for field, value in filters.items():
+            documents = self._postings.get(_facet_key(product_type, field), {}).get(value)
+            if not documents:
+                return set()
+            matches.append(documents)
+        matches.sort(key=len)
+        return matches[0].intersection(*matches[1:])
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def __repr__(self) -> str:
+        return f"FacetIndex(products={len(self)}, facets={len(self._postings)})"
@@ -0,0 +1,164 @@
+from bisect import bisect_left, bisect_right
+from math import inf
+from operator import attrgetter
+from typing import Collection, Iterable, List, Optional, Tuple, Union
+
+from src.products import Product
+
+Number = Union[int, float]
+
+_MISSING = object()
+# Пакет добавлений или изменений больше 1/_REBUILD_RATIO индекса применяется пересортировкой, а не поштучно
+_REBUILD_RATIO = 16
+
+
+def check_sort_field(field: str) -> None:
+    """
+    Проверяет, что по полю можно сортировать товары хотя бы одного класса (см. Product.sort_fields).
+
+    Raises:
+        ValueError: Если поле не объявлено числовым ни в одном классе продуктов
+    """
+    if not any(field in product_class.sort_fields for product_class in Product._types.values()):
+        raise ValueError(f"Нельзя сортировать товары по полю {field}")
+
+
+class RangeIndex:
+    """
+    Отсортированный индекс продуктов по числовому полю.
+
+    Продукты, у которых поля нет (например, efficiency у обычного Product), в индекс не попадают.
+
+    Ключи хранятся в виде (значение, id(продукт)) в отсортированном списке, продукты - в параллельном списке,
+    поэтому поиск диапазона - это два бинарных поиска и срез: O(log n + k).
+    id продукта разделяет одинаковые значения и позволяет найти запись конкретного продукта при ее изменении.
+    """
+
+    def __init__(self, field: str, products: Iterable[Product] = ()) -> None:
+        """
+        Инициализация индекса.
+
+        Args:
+            field: Имя числового поля продукта (например, "price")
+            products: Продукты для начального заполнения
+        """
+        self.field = field
+        self._get = attrgetter(field)
+        self._keys: List[Tuple[Number, int]] = []
+        self._products: List[Product] = []
+        self.add_many(products)
+
+    def add(self, product: Product) -> None:
+        """Добавляет продукт в индекс за O(log n) сравнений."""
+        value = getattr(product, self.field, _MISSING)
+        if value is not _MISSING:
+            self._insert((value, id(product)), product)
+
+    def _insert(self, key: Tuple[Number, int], product: Product) -> None:
+        """Вставляет запись, сохраняя порядок ключей."""
+        position = bisect_right(self._keys, key)
+        self._keys.insert(position, key)
+        self._products.insert(position, product)
+
+    def add_many(self, products: Iterable[Product]) -> None:
+        """
+        Добавляет набор продуктов.
+
+        Небольшой пакет вставляется бинарным поиском по одному продукту (O(log n) сравнений и сдвиг хвоста),
+        большой - одной сортировкой: существующие записи уже упорядочены и сортировка проходит их
+        как один отрезок, поэтому добавление m продуктов к индексу из n записей стоит O(n + m log m).
+        """
+        field = self.field
+        batch = [product for product in products if hasattr(product, field)]
+        if not batch:
+            return
+        if len(batch) * _REBUILD_RATIO < len(self._keys):
+            for value, product in zip(map(self._get, batch), batch):
+                self._insert((value, id(product)), product)
+            return
+        keys = [*self._keys, *((value, id(product)) for value, product in zip(map(self._get, batch), batch))]
+        products = [*self._products, *batch]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._keys = [keys[i] for i in order]
+        self._products = [products[i] for i in order]
+
+    def update(self, product: Product, old: Number, new: Number) -> None:
+        """
+        Перемещает продукт после изменения значения поля.
+
+        Если записи со старым значением нет, индекс был построен уже после изменения
+        (уведомление ожидало блокировку владельца индекса) и продукт уже стоит на своем месте.
+
+        Args:
+            product: Измененный продукт
+            old: Значение поля до изменения
+            new: Новое значение поля
+        """
+        position = bisect_left(self._keys, (old, id(product)))
+        if position == len(self._keys) or self._products[position] is not product:
+            return
+        del self._keys[position]
+        del self._products[position]
+        self._insert((new, id(product)), product)
+
+    def update_many(self, changes: Collection[Tuple[Product, Number, Number]]) -> None:
+        """
+        Перемещает пакет измененных продуктов.
+
+        Каждое перемещение сдвигает хвост списка, поэтому при большом пакете индекс
+        дешевле пересортировать по текущим значениям полей целиком.
+
+        Args:
+            changes: Тройки (продукт, старое значение, новое значение)
+        """
+        if len(changes) * _REBUILD_RATIO < len(self._keys):
+            for product, old, new in changes:
+                self.update(product, old, new)
+            return
+        products = self._products
+        self._keys = []
+        self._products = []
+        self.add_many(products)
+
+    def range(self, low: Optional[Number] = None, high: Optional[Number] = None) -> List[Product]:
+        """
+        Возвращает продукты со значением поля в диапазоне [low, high] по возрастанию.
+
+        Args:
+            low: Нижняя граница (включительно); None - без ограничения
+            high: Верхняя граница (включительно); None - без ограничения
+
+        Returns:
+            List[Product]: Продукты диапазона
+        """
+        start = 0 if low is None else bisect_left(self._keys, (low,))
+        end = len(self._keys) if high is None else bisect_right(self._keys, (high, inf))
+        return self._products[start:end]
+
+    def window(self, offset: int = 0, limit: Optional[int] = None, descending: bool = False) -> List[Product]:
+        """
+        Возвращает часть отсортированного списка продуктов за O(k), не копируя индекс целиком.
+
+        Args:
+            offset: Сколько продуктов пропустить от начала порядка
+            limit: Максимальное количество продуктов (None - до конца)
+            descending: Порядок по убыванию значения поля
+
+        Returns:
+            List[Product]: Продукты окна в заданном порядке
+        """
+        size = len(self._products)
+        if limit is None:
+            limit = size
+        if not descending:
+            return self._products[offset : offset + limit]
+        end = size - offset
+        if end <= 0:
+            return []
+        return self._products[max(end - limit, 0) : end][::-1]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return f"RangeIndex(field={self.field!r}, size={len(self)})"
@@ -0,0 +1,267 @@
+import json
+import os
+import threading
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+from weakref import WeakMethod
+
+from src.categories import Category, dispatch_changes
+from src.exceptions import ZeroQuantityError
+from src.order import reservation_lock
+from src.products import Product
+
+_TAIL_CHUNK = 64 * 1024
+
+
+def _truncate_torn_tail(file: BinaryIO) -> None:
+    """
+    Отрезает недописанную последнюю строку журнала (сбой во время записи пакета).
+
+    Такой пакет не был применен, поэтому он отбрасывается, а новый пакет начинается с новой строки.
+    """
+    end = file.seek(0, os.SEEK_END)
+    position = end
+    while position > 0:
+        start = max(position - _TAIL_CHUNK, 0)
+        file.seek(start)
+        newline = file.read(position - start).rfind(b"\n")
+        if newline != -1:
+            position = start + newline + 1
+            break
+        position = start
+    if position != end:
+        file.truncate(position)
+        file.seek(position)
+
+
+def _ends_with_newline(file: BinaryIO) -> bool:
+    """Проверяет, что файл пуст или заканчивается переводом строки (последний пакет дописан)."""
+    end = file.seek(0, os.SEEK_END)
+    if not end:
+        return True
+    file.seek(end - 1)
+    return file.read(1) == b"\n"
+
+
+class InventoryLedger:
+    """
+    Журнал движения остатков товаров.
+
+    Изменения остатков копятся в пакете (по одному суммарному изменению на товар) и применяются
+    commit целиком или не применяются вовсе. Примененные пакеты дописываются в файл журнала
+    строками JSON {"Название товара": изменение, ...}, поэтому после перезапуска остатки
+    восстанавливаются повторным применением журнала к исходным данным (replay).
+    """
+
+    def __init__(self, categories: Iterable[Category], file_path: Optional[str] = None) -> None:
+        """
+        Инициализация журнала.
+
+        Args:
+            categories: Категории (или каталог), остатки товаров которых ведет журнал
+            file_path: Файл журнала; None - журнал только в памяти
+        """
+        self._categories = list(categories)
+        self.file_path = file_path
+        self._pending: Dict[str, int] = {}
+        self._by_name: Dict[str, List[Product]] = {}
+        # Сколько товаров каждой категории уже в _by_name: категории только пополняются,
+        # поэтому переиндексация обходит лишь товары, добавленные после прошлого прохода
+        self._indexed = [0] * len(self._categories)
+        # Журнал подписан на товары, чтобы переименование товара обновляло _by_name
+        self._observer = WeakMethod(self._on_product_changed)
+        self._index_lock = threading.Lock()
+        # Недописанный хвост файла отрезается один раз, при первой записи; дальше хвост
+        # может оборваться только при сбое нашей же записи, что видно по последнему байту
+        self._tail_checked = False
+        self._file_lock = threading.Lock()  # Пакеты дописываются в файл по одному
+
+    def _index_products(self) -> None:
+        """Добавляет в словарь название -> товары товары, появившиеся в категориях после прошлого прохода."""
+        with self._index_lock:
+            by_name = self._by_name
+            for position, category in enumerate(self._categories):
+                start = self._indexed[position]
+                end = len(category._products)
+                for index in range(start, end):
+                    product = category._product_at(index)
+                    products = by_name.setdefault(product.name, [])
+                    # Товар из нескольких категорий учитывается один раз
+                    if product not in products:
+                        products.append(product)
+                        product.subscribe(self._observer)
+                self._indexed[position] = end
+
+    def _on_product_changed(self, product: Product, field: str, old, new) -> None:
+        """Переносит переименованный товар в словаре название -> товары."""
+        if field != "name":
+            return
+        with self._index_lock:
+            products = self._by_name.get(old)
+            if products is None or product not in products:
+                return
+            products.remove(product)
+            if not products:
+                del self._by_name[old]
+            self._by_name.setdefault(new, []).append(product)
+
+    def _product(self, name: str) -> Product:
+        """
+        Находит товар по названию; товары, добавленные в категории позже, находятся после переиндексации.
+
+        Переиндексация обходит только новые товары категорий, поэтому поток неизвестных названий
+        не создает заново продукты отложенных категорий на каждом вызове.
+
+        Raises:
+            KeyError: Если товара с таким названием нет
+            ValueError: Если название не однозначно
+        """
+        products = self._by_name.get(name)
+        if products is None:
+            self._index_products()
+            products = self._by_name.get(name)
+            if products is None:
+                raise KeyError(f"Товар {name} не найден")
+        if len(products) > 1:
+            raise ValueError(f"Название {name} соответствует нескольким товарам")
+        return products[0]
+
+    def record(self, name: str, delta: int) -> None:
+        """
+        Добавляет изменение остатка в текущий пакет.
+
+        Args:
+            name: Название товара
+            delta: Изменение количества (поступление - положительное, списание - отрицательное)
+
+        Raises:
+            TypeError: Если изменение не целое число
+            ValueError: Если изменение равно 0 или название соответствует нескольким товарам
+            KeyError: Если товара с таким названием нет
+        """
+        if isinstance(delta, bool) or not isinstance(delta, int):
+            raise TypeError(f"Изменение остатка должно быть целым числом, а не {type(delta).__name__}")
+        if delta == 0:
+            raise ValueError("Изменение остатка не может быть нулевым")
+        self._product(name)
+        self._pending[name] = self._pending.get(name, 0) + delta
+
+    @property
+    def pending(self) -> Dict[str, int]:
+        """Суммарные изменения текущего пакета по товарам."""
+        return dict(self._pending)
+
+    def rollback(self) -> None:
+        """Отменяет текущий пакет."""
+        self._pending = {}
+
+    def commit(self) -> int:
+        """
+        Применяет текущий пакет атомарно и дописывает его в файл журнала.
+
+        Если хотя бы один остаток стал бы отрицательным или нулевым (товар с нулевым количеством
+        не может находиться в категории), не меняется ни один остаток, а пакет отменяется.
+        Проверка и изменение остатков выполняются под общей блокировкой резервирования заказов,
+        поэтому не пересекаются с MultiItemOrder; запись в файл идет вне этой блокировки.
+
+        Returns:
+            int: Количество товаров, остаток которых изменился
+
+        Raises:
+            ValueError: Если остатка товара недостаточно для списания
+            ZeroQuantityError: Если после списания остаток товара стал бы нулевым
+            OSError: Если пакет не удалось записать в журнал (остатки при этом не меняются)
+        """
+        batch = {name: delta for name, delta in self._pending.items() if delta}
+        self._pending = {}
+        return self._apply(batch, write=bool(batch) and self.file_path is not None)
+
+    def _apply(self, batch: Dict[str, int], write: bool) -> int:
+        """
+        Проверяет и применяет суммарные изменения остатков, при write=True записывая пакет в журнал.
+
+        Запись в файл не держит блокировку резервирования: списания пакета применяются под ней
+        сразу после проверки (остаток резервируется, как заказом), пакет записывается в журнал,
+        и только затем применяются поступления. Если запись не удалась, списания возвращаются.
+        """
+        movements = [(self._product(name), delta) for name, delta in batch.items()]
+        with reservation_lock:
+            for product, delta in movements:
+                if product.quantity + delta < 0:
+                    raise ValueError(
+                        f"Недостаточно товара {product.name}: в наличии {product.quantity} шт., требуется {-delta} шт."
+                    )
+                if product.quantity + delta == 0:
+                    raise ZeroQuantityError(f"Остаток товара {product.name} стал бы нулевым")
+            if not write:
+                self._move(movements)
+                return len(movements)
+            taken = [(product, delta) for product, delta in movements if delta < 0]
+            self._move(taken)
+
+        try:
+            self._write(batch)
+        except BaseException:
+            with reservation_lock:
+                self._move([(product, -delta) for product, delta in taken])
+            raise
+
+        with reservation_lock:
+            self._move([(product, delta) for product, delta in movements if delta > 0])
+        return len(movements)
+
+    def _move(self, movements: List[Tuple[Product, int]]) -> None:
+        """Меняет остатки без проверки и сообщает категориям об изменениях одним пакетом (под reservation_lock)."""
+        changes = []
+        for product, delta in movements:
+            old = product._quantity
+            product._quantity = old + delta
+            product._rendered = None
+            changes.append((product, old, old + delta))
+        if changes:
+            dispatch_changes(self._categories, "quantity", changes)
+
+    def _write(self, batch: Dict[str, int]) -> None:
+        """Дописывает пакет строкой в файл журнала."""
+        line = json.dumps(batch, ensure_ascii=False).encode("utf-8") + b"\n"
+        with self._file_lock, open(self.file_path, "a+b") as file:
+            if not self._tail_checked or not _ends_with_newline(file):
+                _truncate_torn_tail(file)
+                self._tail_checked = True
+            file.write(line)
+
+    def replay(self) -> int:
+        """
+        Применяет весь файл журнала к текущим остаткам (например, загруженным из products.json).
+
+        Изменения всех пакетов суммируются по товарам и применяются одним пакетом.
+        Недописанная последняя строка (сбой во время записи) пропускается.
+
+        Returns:
+            int: Количество товаров, остаток которых изменился
+
+        Raises:
+            ValueError: Если файл поврежден не в последней строке или остатков недостаточно
+            ZeroQuantityError: Если остаток товара стал бы нулевым
+        """
+        if self.file_path is None:
+            return 0
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as file:
+                lines = file.read().splitlines()
+        except FileNotFoundError:
+            return 0
+
+        totals: Dict[str, int] = {}
+        for number, line in enumerate(lines, 1):
+            try:
+                batch = json.loads(line)
+            except json.JSONDecodeError:
+                if number == len(lines):
+                    break
+                raise ValueError(f"Журнал {self.file_path} поврежден в строке {number}")
+            for name, delta in batch.items():
+                totals[name] = totals.get(name, 0) + delta
+        return self._apply({name: delta for name, delta in totals.items() if delta}, write=False)
+
+    def __repr__(self) -> str:
+        return f"InventoryLedger(file_path={self.file_path!r}, pending={len(self._pending)})"
@@ -0,0 +1,245 @@
+import math
+import mmap
+import struct
+from typing import Iterator, List, Optional
+
+from src.products import Product
+from src.snapshot import (
+    CATEGORY_RECORD,
+    INT_FLOAT_FIELD,
+    INT_PRICE,
+    LAYOUTS,
+    PRODUCT_RECORD,
+    TYPE_NAMES,
+    read_sections,
+    read_string,
+)
+
+_INDEX = struct.Struct("<I")
+
+
+class MappedProduct:
+    """
+    Продукт только для чтения, поля которого читаются из отображенного в память снимка.
+
+    Объект хранит лишь ссылку на каталог и номер записи; строки декодируются при обращении.
+    """
+
+    __slots__ = ("_catalog", "_index")
+
+    def __init__(self, catalog: "MappedCatalog", index: int) -> None:
+        """
+        Инициализация представления продукта.
+
+        Args:
+            catalog: Каталог, в снимке которого находится запись
+            index: Номер записи продукта
+        """
+        self._catalog = catalog
+        self._index = index
+
+    def _record(self) -> tuple:
+        """Читает запись продукта из снимка."""
+        catalog = self._catalog
+        return PRODUCT_RECORD.unpack_from(
+            catalog._buffer, catalog._sections.products_offset + self._index * PRODUCT_RECORD.size
+        )
+
+    @property
+    def product_type(self) -> str:
+        """Тип продукта (как поле "type" в JSON)."""
+        return TYPE_NAMES[self._record()[0]]
+
+    @property
+    def product_class(self) -> type:
+        """Класс продукта, которому соответствует запись."""
+        return Product._types[self.product_type]
+
+    @property
+    def name(self) -> str:
+        """Название продукта."""
+        return self._catalog._string(self._record()[2])
+
+    @property
+    def description(self) -> str:
+        """Описание продукта."""
+        return self._catalog._string(self._record()[3])
+
+    @property
+    def price(self) -> float:
+        """Цена продукта."""
+        record = self._record()
+        return int(record[4]) if record[1] & INT_PRICE else record[4]
+
+    # Методы классов продуктов обращаются к цене через _price
+    _price = price
+
+    @property
+    def quantity(self) -> int:
+        """Количество в наличии."""
+        return self._record()[5]
+
+    def __getattr__(self, field: str) -> object:
+        """Возвращает поле наследника (например, model или country) согласно размещению типа в снимке."""
+        record = self._record()
+        float_field, int_field, string_fields = LAYOUTS[TYPE_NAMES[record[0]]]
+        if field == float_field:
+            return int(record[6]) if record[1] & INT_FLOAT_FIELD else record[6]
+        if field == int_field:
+            return record[7]
+        if field in string_fields:
+            return self._catalog._string(record[8 + string_fields.index(field)])
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {field!r}")
+
+    def materialize(self) -> Product:
+        """Создает обычный изменяемый Product с данными записи."""
+        record = self._record()
+        product_type = TYPE_NAMES[record[0]]
+        float_field, int_field, string_fields = LAYOUTS[product_type]
+        extra = {field: getattr(self, field) for field in (float_field, int_field, *string_fields) if field}
+        return Product._types[product_type]._restore(self.name, self.description, self.price, record[5], **extra)
+
+    def __str__(self) -> str:
+        # Используем форматирование соответствующего класса продукта, чтобы вывод совпадал с обычным
+        return self.product_class._render(self)
+
+    def __repr__(self) -> str:
+        return self.product_class.__repr__(self)
+
+
+class MappedCategory:
+    """Категория только для чтения поверх отображенного в память снимка."""
+
+    def __init__(self, catalog: "MappedCatalog", index: int) -> None:
+        """
+        Инициализация представления категории.
+
+        Args:
+            catalog: Каталог, в снимке которого находится запись
+            index: Номер записи категории
+        """
+        self._catalog = catalog
+        name_id, description_id, self._first, self._count = CATEGORY_RECORD.unpack_from(
+            catalog._buffer, catalog._sections.categories_offset + index * CATEGORY_RECORD.size
+        )
+        self.name = catalog._string(name_id)
+        self.description = catalog._string(description_id)
+        # Снимок не меняется, поэтому агрегаты вычисляются один раз при первом обращении
+        self._total_quantity: Optional[int] = None
+        self._middle_price: Optional[float] = None
+
+    def _product_indices(self) -> Iterator[int]:
+        """Номера записей продуктов категории."""
+        start = self._catalog._sections.members_offset + self._first * _INDEX.size
+        data = self._catalog._buffer[start : start + self._count * _INDEX.size]
+        return (index for (index,) in _INDEX.iter_unpack(data))
+
+    def _records(self) -> Iterator[tuple]:
+        """Записи продуктов категории."""
+        buffer = self._catalog._buffer
+        offset = self._catalog._sections.products_offset
+        for index in self._product_indices():
+            yield PRODUCT_RECORD.unpack_from(buffer, offset + index * PRODUCT_RECORD.size)
+
+    def __iter__(self) -> Iterator[MappedProduct]:
+        catalog = self._catalog
+        return (MappedProduct(catalog, index) for index in self._product_indices())
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def products_list(self) -> List[MappedProduct]:
+        """Список представлений продуктов категории."""
+        return list(self)
+
+    @property
+    def products(self) -> str:
+        """Строка со всеми продуктами категории."""
+        return "\n".join(str(product) for product in self)
+
+    @property
+    def total_quantity(self) -> int:
+        """Общее количество товаров в категории."""
+        if self._total_quantity is None:
+            self._total_quantity = sum(record[5] for record in self._records())
+        return self._total_quantity
+
+    def middle_price(self) -> float:
+        """Средняя цена товаров или 0, если в категории нет товаров."""
+        if self._middle_price is None:
+            total = math.fsum(record[4] for record in self._records())
+            self._middle_price = total / self._count if self._count else 0.0
+        return self._middle_price
+
+    def __str__(self) -> str:
+        return f"{self.name}, количество продуктов: {self.total_quantity} шт."
+
+    def __repr__(self) -> str:
+        return f"MappedCategory(name={self.name!r}, description={self.description!r}, products_count={self._count})"
+
+
+class MappedCatalog:
+    """
+    Каталог только для чтения, отображающий файл снимка в память.
+
+    Данные читаются из страниц файла по мере обращения, поэтому процессы,
+    открывшие один и тот же снимок, используют одну физическую копию через страничный кеш.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        """
+        Открывает снимок.
+
+        Args:
+            file_path: Путь к файлу, созданному save_snapshot
+
+        Raises:
+            ValueError: Если файл не является снимком каталога
+        """
+        with open(file_path, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._sections = read_sections(self._buffer)
+        except ValueError:
+            self._buffer.close()
+            raise
+        self._categories = [MappedCategory(self, index) for index in range(self._sections.categories_count)]
+
+    def _string(self, string_id: int) -> str:
+        """Декодирует строку из таблицы строк снимка."""
+        return read_string(self._buffer, self._sections, string_id)
+
+    @property
+    def categories(self) -> List[MappedCategory]:
+        """Категории снимка."""
+        return list(self._categories)
+
+    @property
+    def category_count(self) -> int:
+        """Количество категорий."""
+        return self._sections.categories_count
+
+    @property
+    def product_count(self) -> int:
+        """Количество уникальных продуктов."""
+        return self._sections.products_count
+
+    def close(self) -> None:
+        """Закрывает отображение файла."""
+        self._buffer.close()
+
+    def __enter__(self) -> "MappedCatalog":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[MappedCategory]:
+        return iter(self._categories)
+
+    def __len__(self) -> int:
+        return len(self._categories)
+
+    def __repr__(self) -> str:
+        return f"MappedCatalog(categories_count={self.category_count}, products_count={self.product_count})"
@@ -1,7 +1,14 @@
+import math
+import threading
 from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Tuple
 
 from src.products import Product
 
+# Общая блокировка резервирования, чтобы проверка и списание остатков шли атомарно;
+# ее же берет журнал остатков (src.ledger), меняя остатки пакетом
+reservation_lock = threading.Lock()
+
 
 class AbstractBase(ABC):
     """Абстрактный базовый класс для сущностей с именем и описанием."""
@@ -75,3 +82,96 @@ class Order(AbstractBase):
 
     def __repr__(self) -> str:
         return f"Order({self._product!r}, {self._quantity})"
+
+
+class MultiItemOrder(AbstractBase):
+    """Класс для представления заказа из нескольких позиций с резервированием остатков."""
+
+    def __init__(self, items: Iterable[Tuple[Product, int]], reserve: bool = True):
+        """
+        Инициализация заказа.
+
+        Повторяющиеся товары объединяются в одну позицию. Стоимость всех позиций
+        считается за один проход. При reserve=True остатки всех товаров списываются
+        атомарно: если хотя бы одного товара не хватает, ни один остаток не меняется.
+
+        Args:
+            items: Пары (товар, количество)
+            reserve: Резервировать ли товар, уменьшая Product.quantity
+
+        Raises:
+            ValueError: Если заказ пуст, количество меньше или равно 0 или товара недостаточно
+        """
+        lines: Dict[Product, int] = {}
+        for product, quantity in items:
+            if quantity <= 0:
+                raise ValueError("Количество товара должно быть больше 0")
+            lines[product] = lines.get(product, 0) + quantity
+        if not lines:
+            raise ValueError("Заказ должен содержать хотя бы один товар")
+
+        self._lines = lines
+        self._reserved = False
+        if reserve:
+            self._reserve()
+        self._total_price = math.fsum(product.price * quantity for product, quantity in lines.items())
+
+    def _reserve(self) -> None:
+        """Списывает остатки всех позиций или не меняет ни одной."""
+        with reservation_lock:
+            for product, quantity in self._lines.items():
+                if product.quantity < quantity:
+                    raise ValueError(
+                        f"Недостаточно товара {product.name}: в наличии {product.quantity} шт., требуется {quantity} шт."
+                    )
+            for product, quantity in self._lines.items():
+                product.quantity -= quantity
+            self._reserved = True
+
+    def release(self) -> None:
+        """
+        Возвращает зарезервированные остатки (например, при отмене заказа).
+
+        Проверка и сброс резерва выполняются под блокировкой, поэтому при одновременных вызовах
+        остатки возвращаются ровно один раз.
+        """
+        with reservation_lock:
+            if not self._reserved:
+                return
+            for product, quantity in self._lines.items():
+                product.quantity += quantity
+            self._reserved = False
+
+    @property
+    def name(self) -> str:
+        """Название заказа."""
+        return f"Заказ из {len(self._lines)} поз."
+
+    @property
+    def description(self) -> str:
+        """Описание заказа."""
+        return ", ".join(f"{product.name} - {quantity} шт." for product, quantity in self._lines.items())
+
+    @property
+    def lines(self) -> List[Tuple[Product, int]]:
+        """Геттер для позиций заказа."""
+        return list(self._lines.items())
+
+    @property
+    def reserved(self) -> bool:
+        """Зарезервированы ли остатки под заказ."""
+        return self._reserved
+
+    @property
+    def total_price(self) -> float:
+        """Геттер для общей стоимости."""
+        return self._total_price
+
+    def __str__(self) -> str:
+        lines = "\n".join(
+            f"Товар: {product.name}, количество: {quantity} шт." for product, quantity in self._lines.items()
+        )
+        return f"{self.name}\n{lines}\nОбщая стоимость: {self._total_price} руб."
+
+    def __repr__(self) -> str:
+        return f"MultiItemOrder({self.lines!r})"
@@ -0,0 +1,135 @@
+import json
+import math
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from src.categories import Category, dispatch_changes
+from src.products import Product
+
+
+class PriceRejection(NamedTuple):
+    """Отклоненная строка прайс-листа (или весь файл прайс-листа, если он не прочитан)."""
+
+    name: str  # Название товара или путь к непрочитанному файлу
+    price: object  # None для непрочитанного файла
+    reason: str
+
+
+class RepricingReport(NamedTuple):
+    """Результат пакетного изменения цен."""
+
+    updated: int  # Количество товаров, цена которых изменилась
+    rejected: List[PriceRejection]
+    applied: bool  # False, если пакет отклонен целиком из-за ошибок (atomic=True)
+
+
+def _price_error(price: object) -> Optional[str]:
+    """Возвращает причину отклонения цены или None, если цена допустима."""
+    if isinstance(price, bool) or not isinstance(price, (int, float)):
+        return "Цена должна быть числом"
+    if not math.isfinite(price):
+        return "Цена должна быть конечным числом"
+    if price <= 0:
+        return "Цена не должна быть нулевая или отрицательная"
+    return None
+
+
+def reprice(categories: Iterable[Category], prices: Mapping[str, object], atomic: bool = True) -> RepricingReport:
+    """
+    Применяет прайс-лист к товарам категорий за один проход.
+
+    Все строки проверяются до изменения цен; ошибки собираются в отчет, а не выводятся.
+    Цена записывается всем товарам с указанным названием. Агрегаты и индексы переданных категорий
+    обновляются одним пакетом на категорию, остальные подписчики товара уведомляются как при
+    обычном изменении цены.
+
+    Args:
+        categories: Категории (или каталог), товары которых переоцениваются
+        prices: Название товара -> новая цена
+        atomic: Не менять ни одной цены, если хотя бы одна строка отклонена
+
+    Returns:
+        RepricingReport: Количество измененных товаров и отклоненные строки
+    """
+    categories = list(categories)
+    by_name: Dict[str, List[Product]] = {}
+    for category in categories:
+        for product in category.products_list:
+            by_name.setdefault(product.name, []).append(product)
+
+    rejected = []
+    accepted: Dict[Product, float] = {}
+    for name, price in prices.items():
+        reason = _price_error(price)
+        if reason is None and name not in by_name:
+            reason = "Товар не найден"
+        if reason is not None:
+            rejected.append(PriceRejection(name, price, reason))
+            continue
+        for product in by_name[name]:
+            accepted[product] = price
+
+    if rejected and atomic:
+        return RepricingReport(0, rejected, False)
+
+    changes: List[Tuple[Product, float, float]] = []
+    for product, price in accepted.items():
+        old = product._price
+        if old != price:
+            # Цена уже проверена, поэтому сеттер с выводом сообщений и поштучными уведомлениями не нужен
+            product._price = price
+            product._rendered = None
+            changes.append((product, old, price))
+
+    dispatch_changes(categories, "price", changes)
+    return RepricingReport(len(changes), rejected, True)
+
+
+def load_price_list(file_path: str) -> Dict[str, object]:
+    """
+    Загружает прайс-лист из JSON файла вида {"Название товара": цена, ...}.
+
+    Значения не проверяются: проверка выполняется в reprice, чтобы все ошибки попали в отчет.
+
+    Args:
+        file_path: Путь к JSON файлу
+
+    Returns:
+        Dict[str, object]: Название товара -> цена
+
+    Raises:
+        OSError: Если файл не прочитан (например, FileNotFoundError)
+        ValueError: Если файл не является JSON объектом
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+    if not isinstance(data, dict):
+        raise ValueError(f"Прайс-лист {file_path} должен быть JSON объектом")
+    return data
+
+
+def reprice_from_file(categories: Iterable[Category], file_path: str, atomic: bool = True) -> RepricingReport:
+    """
+    Применяет прайс-лист из JSON файла (см. load_price_list и reprice).
+
+    Непрочитанный или поврежденный файл не меняет ни одной цены: отчет содержит одну
+    отклоненную строку с путем к файлу и applied=False.
+
+    Args:
+        categories: Категории (или каталог), товары которых переоцениваются
+        file_path: Путь к JSON файлу с ценами
+        atomic: Не менять ни одной цены, если хотя бы одна строка отклонена
+
+    Returns:
+        RepricingReport: Количество измененных товаров и отклоненные строки
+    """
+    try:
+        prices = load_price_list(file_path)
+    except FileNotFoundError:
+        reason = "Файл не найден"
+    except OSError:
+        reason = "Файл не прочитан"
+    except ValueError:
+        reason = "Файл не является прайс-листом в формате JSON"
+    else:
+        return reprice(categories, prices, atomic)
+    return RepricingReport(0, [PriceRejection(file_path, None, reason)], False)
@@ -1,9 +1,55 @@
+import logging
+import threading
 from abc import ABC, abstractmethod
+from operator import attrgetter
+from typing import Callable, Dict, Optional, Tuple, Type, Union
+from weakref import WeakMethod
+
+from src.reporting import reporter
+
+# Обработчик изменения: (продукт, поле, старое значение, новое значение) или слабая ссылка на метод-обработчик
+Observer = Union[Callable[["Product", str, object, object], None], WeakMethod]
+
+# Подписка редкая, поэтому одна общая блокировка дешевле блокировки в каждом продукте
+_subscription_lock = threading.Lock()
+
+
+def resolve_observer(observer: Observer) -> Optional[Callable[["Product", str, object, object], None]]:
+    """Возвращает вызываемый обработчик подписки или None, если владелец слабо подписанного метода удален."""
+    if type(observer) is WeakMethod:
+        return observer()
+    return observer
+
+
+def _field(field: str, doc: str) -> property:
+    """
+    Создает свойство поверх слота _field.
+
+    Запись сбрасывает закешированную строку продукта и уведомляет подписчиков,
+    чтобы категории сбросили свою строку и обновили поисковый и фасетный индексы.
+    """
+    slot = f"_{field}"
+
+    def setter(product: "Product", value: object) -> None:
+        old = getattr(product, slot)
+        setattr(product, slot, value)
+        product._rendered = None
+        if product._observers:
+            product._notify(field, old, value)
+
+    return property(attrgetter(slot), setter, doc=doc)
+
+
+def _live(observers: Tuple[Observer, ...]) -> Tuple[Observer, ...]:
+    """Отбрасывает слабые подписки удаленных объектов."""
+    return tuple(observer for observer in observers if resolve_observer(observer) is not None)
 
 
 class BaseProduct(ABC):
     """Абстрактный базовый класс для всех продуктов."""
 
+    __slots__ = ()
+
     @abstractmethod
     def __init__(self, name: str, description: str, price: float, quantity: int):
         """Абстрактный метод инициализации продукта."""
@@ -33,20 +79,60 @@ class BaseProduct(ABC):
 
 
 class PrintMixin:
-    """Миксин для печати информации о создании объекта."""
+    """Миксин для вывода информации о создании объекта через приемник сообщений."""
+
+    __slots__ = ()
 
     def __init__(self, *args: object, **kwargs: object) -> None:
-        """Инициализация миксина с печатью информации."""
-        print(repr(self))
+        """Инициализация миксина; repr вычисляется только при включенном уровне INFO."""
+        reporter.report(logging.INFO, "%r", self)
 
 
 class Product(BaseProduct, PrintMixin):
     """Класс для представления продукта."""
 
-    name: str
-    description: str
+    # Слоты вместо __dict__ заметно уменьшают размер экземпляра при миллионах товаров
+    __slots__ = ("_name", "_description", "_price", "_quantity", "_observers", "_rendered")
+
+    _name: str
+    _description: str
     _price: float  # Приватный атрибут
-    quantity: int
+    _quantity: int  # Приватный атрибут
+
+    # Подписчики на изменения цены и количества. Кортеж заменяется целиком при подписке,
+    # поэтому без подписчиков слот ссылается на общий пустой кортеж, а уведомление не копирует список
+    _observers: Tuple[Observer, ...]
+    # Закешированный результат __str__; сбрасывается сеттерами всех полей
+    _rendered: Optional[str]
+
+    # Название и описание входят в кеш строки и в поисковый индекс категорий, поэтому изменяются через сеттеры
+    name = _field("name", "Название продукта.")
+    description = _field("description", "Описание продукта.")
+
+    # Значение поля "type" в JSON, по которому выбирается класс при загрузке
+    product_type: str = "product"
+    # Поля наследника, по которым категории строят фасеты для фильтров (см. src.facets)
+    facet_fields: Tuple[str, ...] = ()
+    # Числовые поля, по которым категории строят отсортированные представления (см. src.indexes)
+    sort_fields: Tuple[str, ...] = ("price", "quantity")
+    _types: Dict[str, Type["Product"]] = {}
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        """
+        Регистрирует наследника, объявившего собственный product_type.
+
+        Наследники без своего product_type не регистрируются, поэтому не подменяют класс родителя при загрузке.
+
+        Raises:
+            ValueError: Если product_type уже зарегистрирован другим классом
+        """
+        super().__init_subclass__(**kwargs)
+        if "product_type" not in cls.__dict__:
+            return
+        registered = Product._types.get(cls.product_type)
+        if registered is not None:
+            raise ValueError(f"Тип продукта {cls.product_type} уже зарегистрирован классом {registered.__name__}")
+        Product._types[cls.product_type] = cls
 
     def __init__(self, name: str, description: str, price: float, quantity: int) -> None:
         """
@@ -63,10 +149,12 @@ class Product(BaseProduct, PrintMixin):
         if quantity == 0:
             raise ValueError("Товар с нулевым количеством не может быть добавлен")
 
-        self.name = name
-        self.description = description
+        self._name = name
+        self._description = description
         self._price = price if price > 0 else 0  # Защита от отрицательной цены
-        self.quantity = quantity
+        self._quantity = quantity
+        self._observers = ()
+        self._rendered = None
         PrintMixin.__init__(self)
 
     @classmethod
@@ -87,6 +175,54 @@ class Product(BaseProduct, PrintMixin):
             quantity=product_data.get("quantity", 0),
         )
 
+    @classmethod
+    def _restore(cls, name: str, description: str, price: float, quantity: int, **extra: object) -> "Product":
+        """
+        Восстанавливает ранее проверенный продукт (например, из снимка) без вызова __init__ и вывода сообщений.
+
+        Args:
+            name: Название продукта
+            description: Описание продукта
+            price: Цена продукта
+            quantity: Количество в наличии
+            extra: Поля наследника
+
+        Returns:
+            Product: Восстановленный объект
+        """
+        product = cls.__new__(cls)
+        product._name = name
+        product._description = description
+        product._price = price
+        product._quantity = quantity
+        product._observers = ()
+        product._rendered = None
+        for field, value in extra.items():
+            setattr(product, f"_{field}", value)
+        return product
+
+    @classmethod
+    def from_dict(cls, product_data: dict) -> "Product":
+        """
+        Создает продукт нужного класса по полю "type" за один проход.
+
+        Записи без поля "type" создаются как Product.
+
+        Args:
+            product_data: Словарь с данными продукта
+
+        Returns:
+            Product: Объект класса, зарегистрированного для данного типа
+
+        Raises:
+            ValueError: Если тип продукта неизвестен
+        """
+        product_type = product_data.get("type", Product.product_type)
+        product_class = Product._types.get(product_type)
+        if product_class is None:
+            raise ValueError(f"Неизвестный тип продукта: {product_type}")
+        return product_class.new_product(product_data)
+
     @property
     def price(self):
         """
@@ -108,12 +244,91 @@ class Product(BaseProduct, PrintMixin):
         if value <= 0:
             print("Цена не должна быть нулевая или отрицательная")
         else:
+            old = self._price
             self._price = value
+            self._rendered = None
+            if self._observers:
+                self._notify("price", old, value)
+
+    @property
+    def quantity(self) -> int:
+        """
+        Геттер для количества.
+
+        Returns:
+            int: Количество в наличии
+        """
+        return self._quantity
+
+    @quantity.setter
+    def quantity(self, value: int) -> None:
+        """
+        Сеттер для количества с уведомлением подписчиков.
+
+        Args:
+            value: Новое количество
+        """
+        old = self._quantity
+        self._quantity = value
+        self._rendered = None
+        if self._observers:
+            self._notify("quantity", old, value)
+
+    def subscribe(self, observer: Observer) -> None:
+        """
+        Подписывает обработчик на изменения полей продукта.
+
+        Обработчик вызывается как observer(product, field, old, new), где field - "price", "quantity"
+        или другое поле продукта ("name", "description", поля наследника). Обработчик, переданный
+        как weakref.WeakMethod, не удерживает объект-владелец метода: после удаления владельца
+        подписка отбрасывается.
+
+        Args:
+            observer: Функция-обработчик или слабая ссылка на метод
+        """
+        with _subscription_lock:
+            observers = self._observers
+            self._observers = (_live(observers) if observers else ()) + (observer,)
+
+    def unsubscribe(self, observer: Observer) -> None:
+        """
+        Отписывает обработчик от изменений.
+
+        Args:
+            observer: Ранее подписанный обработчик
+
+        Raises:
+            ValueError: Если обработчик не был подписан
+        """
+        with _subscription_lock:
+            observers = list(self._observers)
+            observers.remove(observer)
+            self._observers = tuple(observers)
+
+    def _notify(self, field: str, old: object, new: object) -> None:
+        """Вызывает подписчиков при изменении поля field."""
+        stale = False
+        for observer in self._observers:
+            callback = resolve_observer(observer)
+            if callback is None:
+                stale = True
+            else:
+                callback(self, field, old, new)
+        if stale:
+            with _subscription_lock:
+                self._observers = _live(self._observers)
 
     def __repr__(self) -> str:
         return f"Product('{self.name}', '{self.description}', {self._price}, {self.quantity})"
 
     def __str__(self) -> str:
+        rendered = self._rendered
+        if rendered is None:
+            rendered = self._rendered = self._render()
+        return rendered
+
+    def _render(self) -> str:
+        """Форматирует строковое представление продукта (результат кешируется в __str__)."""
         return f"{self.name}, {self._price} руб. Остаток: {self.quantity} шт."
 
     def __add__(self, other):
@@ -137,9 +352,23 @@ class Product(BaseProduct, PrintMixin):
         return self.price * self.quantity + other.price * other.quantity
 
 
+Product._types[Product.product_type] = Product
+
+
 class Smartphone(Product, BaseProduct):
     """Класс для представления смартфона."""
 
+    __slots__ = ("_efficiency", "_model", "_memory", "_color")
+
+    product_type = "smartphone"
+    facet_fields = ("memory", "color")
+    sort_fields = Product.sort_fields + ("efficiency", "memory")
+
+    efficiency = _field("efficiency", "Производительность.")
+    model = _field("model", "Модель.")
+    memory = _field("memory", "Объем встроенной памяти (ГБ).")
+    color = _field("color", "Цвет.")
+
     def __init__(
         self,
         name: str,
@@ -165,25 +394,56 @@ class Smartphone(Product, BaseProduct):
             color: Цвет
         """
 
-        self.efficiency = efficiency
-        self.model = model
-        self.memory = memory
-        self.color = color
+        self._efficiency = efficiency
+        self._model = model
+        self._memory = memory
+        self._color = color
         super().__init__(name, description, price, quantity)
 
+    @classmethod
+    def new_product(cls, product_data: dict):
+        """
+        Класс-метод для создания нового смартфона из словаря.
+
+        Args:
+            product_data: Словарь с данными смартфона
+
+        Returns:
+            Smartphone: Новый объект смартфона
+        """
+        return cls(
+            name=product_data.get("name", ""),
+            description=product_data.get("description", ""),
+            price=product_data.get("price", 0.0),
+            quantity=product_data.get("quantity", 0),
+            efficiency=product_data.get("efficiency", 0.0),
+            model=product_data.get("model", ""),
+            memory=product_data.get("memory", 0),
+            color=product_data.get("color", ""),
+        )
+
     def __repr__(self) -> str:
         return (
             f"Smartphone('{self.name}', '{self.description}', {self._price}, {self.quantity}, "
             f"{self.efficiency}, '{self.model}', {self.memory}, '{self.color}')"
         )
 
-    def __str__(self) -> str:
+    def _render(self) -> str:
         return f"{self.name}, {self._price} руб. Остаток: {self.quantity} шт. Модель: {self.model}, {self.memory}ГБ, {self.color}"
 
 
 class LawnGrass(Product, BaseProduct):
     """Класс для представления газонной травы."""
 
+    __slots__ = ("_country", "_germination_period", "_color")
+
+    product_type = "lawn_grass"
+    facet_fields = ("country", "color")
+
+    country = _field("country", "Страна-производитель.")
+    germination_period = _field("germination_period", "Срок прорастания.")
+    color = _field("color", "Цвет.")
+
     def __init__(
         self,
         name: str,
@@ -207,16 +467,37 @@ class LawnGrass(Product, BaseProduct):
             color: Цвет
         """
 
-        self.country = country
-        self.germination_period = germination_period
-        self.color = color
+        self._country = country
+        self._germination_period = germination_period
+        self._color = color
         super().__init__(name, description, price, quantity)
 
+    @classmethod
+    def new_product(cls, product_data: dict):
+        """
+        Класс-метод для создания новой газонной травы из словаря.
+
+        Args:
+            product_data: Словарь с данными газонной травы
+
+        Returns:
+            LawnGrass: Новый объект газонной травы
+        """
+        return cls(
+            name=product_data.get("name", ""),
+            description=product_data.get("description", ""),
+            price=product_data.get("price", 0.0),
+            quantity=product_data.get("quantity", 0),
+            country=product_data.get("country", ""),
+            germination_period=product_data.get("germination_period", ""),
+            color=product_data.get("color", ""),
+        )
+
     def __repr__(self) -> str:
         return (
             f"LawnGrass('{self.name}', '{self.description}', {self._price}, {self.quantity}, "
             f"'{self.country}', '{self.germination_period}', '{self.color}')"
         )
 
-    def __str__(self) -> str:
+    def _render(self) -> str:
         return f"{self.name}, {self._price} руб. Остаток: {self.quantity} шт. Производитель: {self.country}, срок прорастания: {self.germination_period}, цвет: {self.color}"
@@ -0,0 +1,43 @@
+from typing import Dict, Iterator
+
+from src.products import Product
+
+
+class ProductRegistry:
+    """Реестр уникальных продуктов с хеш-индексом и сохранением порядка добавления."""
+
+    def __init__(self) -> None:
+        """Инициализация пустого реестра."""
+        # dict сохраняет порядок вставки и дает проверку вхождения за O(1)
+        self._index: Dict[Product, None] = {}
+
+    def add(self, product: Product) -> bool:
+        """
+        Регистрирует продукт, если он еще не учтен.
+
+        Args:
+            product: Продукт для регистрации
+
+        Returns:
+            bool: True, если продукт добавлен впервые
+        """
+        if product in self._index:
+            return False
+        self._index[product] = None
+        return True
+
+    def clear(self) -> None:
+        """Очищает реестр."""
+        self._index.clear()
+
+    def __contains__(self, product: object) -> bool:
+        return product in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[Product]:
+        return iter(self._index)
+
+    def __repr__(self) -> str:
+        return f"ProductRegistry(products_count={len(self._index)})"
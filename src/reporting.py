@@ -0,0 +1,83 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+# Приемник получает уровень и готовую строку; сигнатура совместима с logging.Logger.log
+Sink = Callable[[int, str], None]
+
+SILENT = logging.CRITICAL + 1  # Уровень, при котором не выводится ничего
+
+# Признак режима silenced; у каждого потока свой контекст, поэтому режим не влияет на другие потоки
+_silenced: ContextVar[bool] = ContextVar("silenced", default=False)
+
+
+def print_sink(level: int, message: str) -> None:
+    """Приемник по умолчанию: печатает сообщение в stdout."""
+    print(message)
+
+
+class Reporter:
+    """Приемник сообщений о создании и добавлении товаров с фильтрацией по уровню."""
+
+    def __init__(self, sink: Sink = print_sink, level: int = logging.DEBUG) -> None:
+        """
+        Инициализация приемника.
+
+        Args:
+            sink: Функция, принимающая уровень и текст сообщения
+            level: Минимальный уровень сообщений, которые передаются в sink
+        """
+        self.sink = sink
+        self.level = level
+
+    def is_enabled_for(self, level: int) -> bool:
+        """Проверяет, будут ли переданы сообщения указанного уровня."""
+        return level >= self.level and not _silenced.get()
+
+    def report(self, level: int, message: str, *args: object) -> None:
+        """
+        Передает сообщение в приемник.
+
+        Строка форматируется (message % args) только если уровень включен,
+        поэтому в отключенном режиме вызов не выполняет форматирования и ввода-вывода.
+
+        Args:
+            level: Уровень сообщения (константы модуля logging)
+            message: Шаблон сообщения
+            args: Аргументы шаблона
+        """
+        if level >= self.level and not _silenced.get():
+            self.sink(level, message % args if args else message)
+
+
+reporter = Reporter()
+
+
+def configure(sink: Optional[Sink] = None, level: Optional[int] = None) -> None:
+    """
+    Настраивает глобальный приемник сообщений.
+
+    Args:
+        sink: Новый приемник, например logging.getLogger("catalog").log
+        level: Новый минимальный уровень, SILENT отключает вывод
+    """
+    if sink is not None:
+        reporter.sink = sink
+    if level is not None:
+        reporter.level = level
+
+
+@contextmanager
+def silenced() -> Iterator[None]:
+    """
+    Контекстный менеджер, временно отключающий все сообщения в текущем потоке.
+
+    Глобальные настройки приемника не меняются, поэтому одновременные вызовы из разных потоков
+    не влияют друг на друга.
+    """
+    token = _silenced.set(True)
+    try:
+        yield
+    finally:
+        _silenced.reset(token)
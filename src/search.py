@@ -0,0 +1,154 @@
+import re
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Set
+
+from src.products import Product
+
+_WORD = re.compile(r"\w+")
+_NO_DOCUMENTS: Set[int] = frozenset()
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Разбивает текст на слова без учета регистра.
+
+    Регистр приводится через casefold, "ё" заменяется на "е", поэтому "Ёлка" и "елка" - одно слово.
+    Словами считаются последовательности букв и цифр любого алфавита.
+
+    Args:
+        text: Исходный текст
+
+    Returns:
+        List[str]: Нормализованные слова в порядке появления
+    """
+    return _WORD.findall(text.casefold().replace("ё", "е"))
+
+
+class SearchIndex:
+    """
+    Инвертированный индекс для поиска продуктов по словам названия и описания.
+
+    Каждому продукту присваивается номер, для каждого слова хранится множество номеров продуктов,
+    а отсортированный словарь слов позволяет искать по префиксу бинарным поиском.
+    """
+
+    def __init__(self, products: Iterable[Product] = ()) -> None:
+        """
+        Инициализация индекса.
+
+        Args:
+            products: Продукты для начального заполнения
+        """
+        self._products: List[Product] = []
+        self._ids: Dict[Product, int] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._terms: List[str] = []  # Отсортированный словарь для поиска по префиксу
+        self.add_many(products)
+
+    def add_many(self, products: Iterable[Product]) -> int:
+        """
+        Добавляет продукты в индекс; уже проиндексированные продукты пропускаются.
+
+        Args:
+            products: Продукты для добавления
+
+        Returns:
+            int: Количество добавленных продуктов
+        """
+        postings = self._postings
+        new_terms = []
+        added = 0
+        for product in products:
+            if product in self._ids:
+                continue
+            document = self._ids[product] = len(self._products)
+            self._products.append(product)
+            added += 1
+            for term in set(tokenize(f"{product.name} {product.description}")):
+                documents = postings.get(term)
+                if documents is None:
+                    documents = postings[term] = set()
+                    new_terms.append(term)
+                documents.add(document)
+
+        if len(new_terms) == 1:
+            insort(self._terms, new_terms[0])
+        elif new_terms:
+            self._terms.extend(new_terms)
+            self._terms.sort()
+        return added
+
+    def update(self, product: Product, field: str, old: object, new: object) -> None:
+        """
+        Переиндексирует продукт после изменения названия или описания; изменения других полей пропускаются.
+
+        Args:
+            product: Измененный продукт (уже с новым значением поля)
+            field: Название поля
+            old: Старое значение
+            new: Новое значение
+        """
+        document = self._ids.get(product)
+        if document is None or field not in ("name", "description"):
+            return
+        old_text = f"{old} {product.description}" if field == "name" else f"{product.name} {old}"
+        old_terms = set(tokenize(old_text))
+        new_terms = set(tokenize(f"{product.name} {product.description}"))
+        postings = self._postings
+        terms = self._terms
+        for term in old_terms - new_terms:
+            documents = postings[term]
+            documents.discard(document)
+            if not documents:
+                del postings[term]
+                del terms[bisect_left(terms, term)]
+        for term in new_terms - old_terms:
+            documents = postings.get(term)
+            if documents is None:
+                documents = postings[term] = set()
+                insort(terms, term)
+            documents.add(document)
+
+    def search(self, query: str, prefix: bool = False) -> List[Product]:
+        """
+        Ищет продукты, содержащие все слова запроса.
+
+        Args:
+            query: Строка запроса (например, "красный смартфон")
+            prefix: Считать слова запроса префиксами ("смарт" найдет "смартфон")
+
+        Returns:
+            List[Product]: Найденные продукты в порядке добавления в индекс
+        """
+        matches = []
+        for term in dict.fromkeys(tokenize(query)):
+            documents = self._prefix_documents(term) if prefix else self._postings.get(term, _NO_DOCUMENTS)
+            if not documents:
+                return []
+            matches.append(documents)
+        if not matches:
+            return []
+
+        # Пересечение начинается с самого короткого списка, чтобы сократить число проверок
+        matches.sort(key=len)
+        found = matches[0].intersection(*matches[1:])
+        products = self._products
+        return [products[document] for document in sorted(found)]
+
+    def _prefix_documents(self, prefix: str) -> Set[int]:
+        """Объединяет множества продуктов всех слов, начинающихся с prefix."""
+        terms = self._terms
+        position = bisect_left(terms, prefix)
+        matched = []
+        while position < len(terms) and terms[position].startswith(prefix):
+            matched.append(self._postings[terms[position]])
+            position += 1
+        if len(matched) == 1:
+            return matched[0]
+        return set().union(*matched)
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def __repr__(self) -> str:
+        return f"SearchIndex(products={len(self)}, terms={len(self._terms)})"
@@ -0,0 +1,300 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from src.catalog import Catalog
+from src.categories import Category, SharedRecordLoader, record_totals
+from src.products import Product
+
+# Формат снимка (little-endian):
+#   заголовок | таблица продуктов | таблица категорий | индексы продуктов категорий | смещения строк | строки UTF-8
+# Записи фиксированного размера, поэтому к любому продукту можно обратиться по индексу без разбора файла.
+MAGIC = b"CATSNAP1"
+HEADER = struct.Struct("<8sIIII")  # магия, продукты, категории, индексы, строки
+# тип, флаги, название, описание, цена, количество, дробное поле, целое поле, три строковых поля
+PRODUCT_RECORD = struct.Struct("<BB2xIIdqdqIII")
+# Флаги записи: цена или дробное поле заданы целым числом и восстанавливаются как int, чтобы str продукта не менялся
+INT_PRICE = 1
+INT_FLOAT_FIELD = 2
+CATEGORY_RECORD = struct.Struct("<IIII")  # название, описание, первый индекс, количество
+NO_STRING = 0xFFFFFFFF
+# Только цена и количество из записи продукта - для расчета агрегатов без разбора остальных полей
+_PRICE_QUANTITY = struct.Struct("<12xdq28x")
+_STRING_RANGE = struct.Struct("<II")
+
+# Размещение полей наследников в общей записи: (дробное поле, целое поле, строковые поля)
+LAYOUTS: Dict[str, Tuple[Optional[str], Optional[str], Tuple[Optional[str], ...]]] = {
+    "product": (None, None, (None, None, None)),
+    "smartphone": ("efficiency", "memory", ("model", None, "color")),
+    "lawn_grass": (None, None, ("country", "germination_period", "color")),
+}
+TYPE_NAMES = list(LAYOUTS)
+TYPE_CODES = {name: code for code, name in enumerate(TYPE_NAMES)}
+
+
+def unpack_indices(data: bytes) -> array:
+    """Читает массив беззнаковых 32-битных little-endian чисел."""
+    values = array("I")
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _pack_indices(values: array) -> bytes:
+    """Записывает массив беззнаковых 32-битных чисел в little-endian."""
+    if sys.byteorder == "big":
+        values = array("I", values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class Sections(NamedTuple):
+    """Смещения и размеры секций снимка."""
+
+    products_count: int
+    categories_count: int
+    members_count: int
+    strings_count: int
+    products_offset: int
+    categories_offset: int
+    members_offset: int
+    string_offsets_offset: int
+    strings_offset: int
+
+
+def read_sections(buffer) -> Sections:
+    """
+    Читает заголовок снимка и вычисляет смещения секций.
+
+    Args:
+        buffer: Байты снимка (bytes, mmap или memoryview)
+
+    Raises:
+        ValueError: Если данные не являются снимком каталога
+    """
+    if len(buffer) < HEADER.size:
+        raise ValueError("Файл не является снимком каталога")
+    magic, products_count, categories_count, members_count, strings_count = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Файл не является снимком каталога")
+    products_offset = HEADER.size
+    categories_offset = products_offset + products_count * PRODUCT_RECORD.size
+    members_offset = categories_offset + categories_count * CATEGORY_RECORD.size
+    string_offsets_offset = members_offset + members_count * 4
+    strings_offset = string_offsets_offset + (strings_count + 1) * 4
+    return Sections(
+        products_count,
+        categories_count,
+        members_count,
+        strings_count,
+        products_offset,
+        categories_offset,
+        members_offset,
+        string_offsets_offset,
+        strings_offset,
+    )
+
+
+def read_string(buffer, sections: Sections, string_id: int) -> str:
+    """Декодирует строку string_id из таблицы строк снимка."""
+    start, end = _STRING_RANGE.unpack_from(buffer, sections.string_offsets_offset + string_id * 4)
+    return buffer[sections.strings_offset + start : sections.strings_offset + end].decode("utf-8")
+
+
+class _StringTable:
+    """Таблица уникальных строк, заполняемая при записи снимка."""
+
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.encoded: List[bytes] = []
+
+    def add(self, value: Optional[str]) -> int:
+        """Возвращает номер строки, добавляя ее при первом появлении."""
+        if value is None:
+            return NO_STRING
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.encoded)
+            self.encoded.append(value.encode("utf-8"))
+        return string_id
+
+
+def save_snapshot(categories: Iterable[Category], file_path: str) -> None:
+    """
+    Сохраняет категории и их продукты в компактный бинарный снимок.
+
+    Продукт, входящий в несколько категорий, записывается один раз;
+    одинаковые строки (цвета, страны, описания) хранятся в одном экземпляре.
+    Снимок записывается во временный файл рядом с file_path и заменяет его целиком, поэтому
+    процессы, отобразившие прежний снимок в память (load_snapshot, MappedCatalog), продолжают читать его.
+
+    Args:
+        categories: Категории для сохранения
+        file_path: Путь к файлу снимка
+
+    Raises:
+        ValueError: Если тип продукта не поддерживается форматом снимка
+    """
+    strings = _StringTable()
+    product_ids: Dict[Product, int] = {}
+    product_records = bytearray()
+    category_records = bytearray()
+    members = array("I")
+
+    for category in categories:
+        first = len(members)
+        for product in category.products_list:
+            product_id = product_ids.get(product)
+            if product_id is None:
+                product_id = product_ids[product] = len(product_ids)
+                product_records += _pack_product(product, strings)
+            members.append(product_id)
+        category_records += CATEGORY_RECORD.pack(
+            strings.add(category.name), strings.add(category.description), first, len(members) - first
+        )
+
+    string_offsets = array("I", [0])
+    for encoded in strings.encoded:
+        string_offsets.append(string_offsets[-1] + len(encoded))
+
+    descriptor, temp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(file_path)))
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            categories_count = len(category_records) // CATEGORY_RECORD.size
+            file.write(HEADER.pack(MAGIC, len(product_ids), categories_count, len(members), len(strings.encoded)))
+            file.write(product_records)
+            file.write(category_records)
+            file.write(_pack_indices(members))
+            file.write(_pack_indices(string_offsets))
+            file.write(b"".join(strings.encoded))
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _pack_product(product: Product, strings: _StringTable) -> bytes:
+    """Упаковывает продукт в запись фиксированного размера."""
+    layout = LAYOUTS.get(product.product_type)
+    if layout is None:
+        raise ValueError(f"Тип продукта не поддерживается снимком: {product.product_type}")
+    float_field, int_field, string_fields = layout
+    float_value = getattr(product, float_field) if float_field else 0.0
+    flags = INT_PRICE if isinstance(product.price, int) else 0
+    if isinstance(float_value, int):
+        flags |= INT_FLOAT_FIELD
+    return PRODUCT_RECORD.pack(
+        TYPE_CODES[product.product_type],
+        flags,
+        strings.add(product.name),
+        strings.add(product.description),
+        product.price,
+        product.quantity,
+        float_value,
+        getattr(product, int_field) if int_field else 0,
+        *(strings.add(getattr(product, field)) if field else NO_STRING for field in string_fields),
+    )
+
+
+class _SnapshotProducts(SharedRecordLoader):
+    """
+    Создает продукты снимка при первом обращении из любой категории.
+
+    Отображение файла остается открытым, пока на загрузчик ссылаются категории с несозданными продуктами.
+    """
+
+    def __init__(self, buffer: mmap.mmap, sections: Sections) -> None:
+        super().__init__()
+        self._buffer = buffer
+        self._sections = sections
+        self._string_offsets = unpack_indices(buffer[sections.string_offsets_offset : sections.strings_offset])
+        # Строка декодируется один раз, и продукты с одинаковыми цветами или описаниями делят один объект str
+        self._strings: List[Optional[str]] = [None] * sections.strings_count
+
+    def _string(self, string_id: int) -> str:
+        """Возвращает строку из таблицы строк снимка, декодируя ее при первом обращении."""
+        value = self._strings[string_id]
+        if value is None:
+            offsets, start = self._string_offsets, self._sections.strings_offset
+            value = self._strings[string_id] = self._buffer[
+                start + offsets[string_id] : start + offsets[string_id + 1]
+            ].decode("utf-8")
+        return value
+
+    def _create(self, index: int) -> Product:
+        """Создает продукт из записи index (без __init__ и вывода сообщений)."""
+        record = PRODUCT_RECORD.unpack_from(self._buffer, self._sections.products_offset + index * PRODUCT_RECORD.size)
+        type_code, flags, name, description, price, quantity, float_value, int_value, *string_ids = record
+        product_type = TYPE_NAMES[type_code]
+        float_field, int_field, string_fields = LAYOUTS[product_type]
+        # Неиспользуемые строковые поля типа хранятся как NO_STRING и пропускаются
+        extra = {field: self._string(string_id) for field, string_id in zip(string_fields, string_ids) if field}
+        if float_field:
+            extra[float_field] = int(float_value) if flags & INT_FLOAT_FIELD else float_value
+        if int_field:
+            extra[int_field] = int_value
+        if flags & INT_PRICE:
+            price = int(price)
+        return Product._types[product_type]._restore(
+            self._string(name), self._string(description), price, quantity, **extra
+        )
+
+
+def load_snapshot(file_path: str, catalog: Optional[Catalog] = None) -> List[Category]:
+    """
+    Восстанавливает категории из бинарного снимка.
+
+    Файл отображается в память, а категории получают отложенные записи: продукт создается
+    (без __init__ и вывода сообщений) при первом обращении к нему. Агрегаты категорий
+    вычисляются сразу по ценам и количествам записей, поэтому загрузка не создает объекты продуктов.
+
+    Args:
+        file_path: Путь к файлу снимка
+        catalog: Каталог, в который загружаются категории (по умолчанию - общие счетчики Category)
+
+    Returns:
+        List[Category]: Восстановленные категории
+
+    Raises:
+        ValueError: Если файл не является снимком каталога
+    """
+    with open(file_path, "rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        sections = read_sections(buffer)
+    except ValueError:
+        buffer.close()
+        raise
+    loader = _SnapshotProducts(buffer, sections)
+    values = list(_PRICE_QUANTITY.iter_unpack(buffer[sections.products_offset : sections.categories_offset]))
+    members = unpack_indices(buffer[sections.members_offset : sections.string_offsets_offset])
+
+    categories = []
+    seen = 0  # Номера продуктов присваиваются по первому появлению, поэтому новые продукты категории - номера >= seen
+    # Первые номера новых продуктов и категории, в которых они впервые встретились
+    starts: List[int] = []
+    introduced_by: List[Category] = []
+    for name, description, first, count in CATEGORY_RECORD.iter_unpack(
+        buffer[sections.categories_offset : sections.members_offset]
+    ):
+        indices = members[first : first + count].tolist()
+        category_values = [values[index] for index in indices]
+        category = Category(loader._string(name), loader._string(description), [], catalog)
+        for index in indices:
+            if index < seen:
+                loader.share(index, introduced_by[bisect_right(starts, index) - 1], category)
+        new_products = max(max(indices, default=-1) + 1 - seen, 0)
+        if new_products:
+            starts.append(seen)
+            introduced_by.append(category)
+        seen += new_products
+        totals = record_totals([price for price, _ in category_values], [quantity for _, quantity in category_values])
+        category._defer(indices, loader, totals, new_products)
+        categories.append(category)
+    return categories
@@ -1,16 +1,81 @@
 import json
-from typing import List
+import sys
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
 
-from src.categories import Category
+from src.catalog import Catalog
+from src.categories import Category, RecordTotals, SharedRecordLoader, record_totals
 from src.products import Product
+from src.reporting import silenced
 
+_WHITESPACE = " \t\n\r"
 
-def load_categories_from_json(file_path: str = "products.json") -> List[Category]:
+# Класс продукта -> поля наследника (слоты классов-наследников Product без подчеркивания)
+_EXTRA_FIELDS: Dict[Type[Product], Tuple[str, ...]] = {}
+
+
+class ShardConflict(NamedTuple):
+    """Запись файла, цена или количество которой расходятся с уже загруженным продуктом."""
+
+    file_path: str
+    category: str  # Название категории записи
+    product: Product  # Продукт, оставленный в категориях
+    price: float  # Цена из отброшенной записи
+    quantity: int  # Количество из отброшенной записи
+
+
+def _build_category(category_data: dict, catalog: Optional[Catalog] = None, lazy: bool = False) -> Category:
+    """
+    Создает категорию с продуктами из словаря.
+
+    Args:
+        category_data: Словарь с данными категории
+        catalog: Каталог, в котором учитывается категория
+        lazy: Создавать продукты при первом обращении, а не сразу
+
+    Returns:
+        Category: Новый объект категории
+    """
+    if lazy:
+        return Category.from_records(
+            category_data["name"], category_data["description"], category_data["products"], catalog=catalog
+        )
+
+    # Создаем продукты для категории; класс выбирается по полю "type"
+    products = []
+    for product_data in category_data["products"]:
+        product = Product.from_dict(product_data)
+        products.append(product)
+
+    # Создаем категорию
+    return Category(
+        name=category_data["name"], description=category_data["description"], products=products, catalog=catalog
+    )
+
+
+def load_categories_from_json(
+    file_path: str = "products.json", verbose: bool = False, catalog: Optional[Catalog] = None, lazy: bool = False
+) -> List[Category]:
     """
     Загружает категории и продукты из JSON файла.
 
     Args:
         file_path: Путь к JSON файлу с данными
+        verbose: Выводить ли сообщения о создании продуктов (по умолчанию отключено)
+        catalog: Каталог, в который загружаются категории (по умолчанию - общие счетчики Category)
+        lazy: Хранить записи продуктов и создавать продукты при первом обращении (см. Category.from_records)
 
     Returns:
         List[Category]: Список объектов Category
@@ -27,15 +92,331 @@ def load_categories_from_json(file_path: str = "products.json") -> List[Category
 
     categories = []
 
-    for category_data in data:
-        # Создаем продукты для категории
-        products = []
-        for product_data in category_data["products"]:
-            product = Product.new_product(product_data)
-            products.append(product)
-
-        # Создаем категории
-        category = Category(name=category_data["name"], description=category_data["description"], products=products)
-        categories.append(category)
+    with nullcontext() if verbose else silenced():
+        for category_data in data:
+            categories.append(_build_category(category_data, catalog, lazy))
 
     return categories
+
+
+def iter_categories_from_json(
+    file_path: str = "products.json",
+    chunk_size: int = 64 * 1024,
+    verbose: bool = False,
+    catalog: Optional[Catalog] = None,
+    lazy: bool = False,
+) -> Iterator[Category]:
+    """
+    Потоково загружает категории из JSON файла, возвращая их по одной.
+
+    Файл читается блоками по chunk_size символов, и в памяти одновременно
+    находится только текущая категория и непрочитанный остаток блока,
+    поэтому потребление памяти не зависит от размера файла.
+
+    Args:
+        file_path: Путь к JSON файлу с массивом категорий
+        chunk_size: Размер блока чтения в символах
+        verbose: Выводить ли сообщения о создании продуктов (по умолчанию отключено)
+        catalog: Каталог, в который загружаются категории (по умолчанию - общие счетчики Category)
+        lazy: Хранить записи продуктов и создавать продукты при первом обращении (см. Category.from_records)
+
+    Yields:
+        Category: Очередная загруженная категория
+    """
+    try:
+        file = open(file_path, "r", encoding="utf-8")
+    except FileNotFoundError:
+        print(f"Файл {file_path} не найден.")
+        return
+
+    decoder = json.JSONDecoder()
+    with file:
+        buffer = ""
+        position = 0
+        state = "start"  # start -> value_or_end -> separator <-> value -> end
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position == len(buffer):
+                buffer, position = file.read(chunk_size), 0
+                if not buffer:
+                    break  # Файл закончился раньше закрывающей скобки
+                continue
+
+            char = buffer[position]
+            if state == "start":
+                if char != "[":
+                    break
+                state = "value_or_end"
+                position += 1
+                continue
+            if char == "]" and state in ("value_or_end", "separator"):
+                return
+            if state == "separator":
+                if char != ",":
+                    break
+                state = "value"
+                position += 1
+                continue
+
+            try:
+                category_data, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # Объект не поместился в буфер: дочитываем с геометрическим ростом,
+                # чтобы повторный разбор крупной категории оставался линейным
+                more = file.read(max(chunk_size, len(buffer)))
+                if not more:
+                    break
+                buffer, position = buffer[position:] + more, 0
+                continue
+
+            state = "separator"
+            with nullcontext() if verbose else silenced():
+                category = _build_category(category_data, catalog, lazy)
+            yield category
+
+    print(f"Ошибка при чтении JSON файла {file_path}.")
+
+
+def _extra_fields(product_class: Type[Product]) -> Tuple[str, ...]:
+    """Возвращает поля наследника, которые _restore принимает как именованные аргументы."""
+    fields = _EXTRA_FIELDS.get(product_class)
+    if fields is None:
+        fields = _EXTRA_FIELDS[product_class] = tuple(
+            slot[1:]
+            for cls in reversed(product_class.__mro__)
+            if issubclass(cls, Product) and cls is not Product
+            for slot in cls.__dict__.get("__slots__", ())
+        )
+    return fields
+
+
+def _intern(value: object) -> object:
+    """Интернирует строку, чтобы повторяющиеся значения передавались из воркера одним объектом."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class _CategoryBatch(NamedTuple):
+    """Проверенные продукты одной категории файла по колонкам (результат воркера)."""
+
+    name: str
+    description: str
+    types: List[str]
+    names: List[str]
+    descriptions: List[str]
+    prices: List[float]
+    quantities: List[int]
+    extras: List[Tuple[object, ...]]  # Значения полей наследника в порядке _extra_fields
+    totals: RecordTotals  # Суммы для агрегатов категории, если в нее попадут все продукты пакета
+
+
+def _parse_shard(file_path: str) -> Optional[List[_CategoryBatch]]:
+    """
+    Разбирает и проверяет один JSON файл (выполняется в процессе-воркере).
+
+    Продукты создаются в воркере обычным конструктором, поэтому проверка и приведение значений
+    (тип, нулевое количество, неположительная цена, поля наследников по умолчанию) выполняются
+    параллельно, а основной процесс восстанавливает продукты по колонкам без __init__.
+
+    Args:
+        file_path: Путь к JSON файлу в формате products.json
+
+    Returns:
+        Optional[List[_CategoryBatch]]: Пакеты категорий или None, если файл не прочитан
+
+    Raises:
+        ValueError: Если у записи неизвестный тип или нулевое количество
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        print(f"Файл {file_path} не найден.")
+        return None
+    except json.JSONDecodeError:
+        print(f"Ошибка при чтении JSON файла {file_path}.")
+        return None
+
+    batches = []
+    with silenced():
+        for category_data in data:
+            types, names, descriptions, prices, quantities, extras = [], [], [], [], [], []
+            for product_data in category_data["products"]:
+                product = Product.from_dict(product_data)
+                types.append(product.product_type)
+                names.append(product.name)
+                descriptions.append(_intern(product.description))
+                prices.append(product._price)
+                quantities.append(product._quantity)
+                extras.append(tuple(_intern(getattr(product, f"_{field}")) for field in _extra_fields(type(product))))
+            batches.append(
+                _CategoryBatch(
+                    category_data["name"],
+                    category_data["description"],
+                    types,
+                    names,
+                    descriptions,
+                    prices,
+                    quantities,
+                    extras,
+                    record_totals(prices, quantities),
+                )
+            )
+    return batches
+
+
+class _ShardProducts(SharedRecordLoader):
+    """
+    Создает продукты пакетов воркеров при первом обращении (без __init__ и вывода сообщений).
+
+    Записи пакета нумеруются подряд, начиная с номера, возвращенного add_batch.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._batches: List[_CategoryBatch] = []
+        self._starts: List[int] = []  # Номер первой записи каждого пакета
+        self._size = 0
+
+    def add_batch(self, batch: _CategoryBatch) -> int:
+        """Добавляет пакет и возвращает номер его первой записи."""
+        start = self._size
+        self._batches.append(batch)
+        self._starts.append(start)
+        self._size += len(batch.names)
+        return start
+
+    def add_product(self, product: Product) -> int:
+        """Добавляет уже существующий продукт (например, из реестра) и возвращает номер его записи."""
+        index = self._size
+        self._size += 1
+        self._products[index] = product
+        return index
+
+    def locate(self, index: int) -> Tuple[int, int]:
+        """Возвращает номер пакета записи index и ее позицию в пакете."""
+        position = bisect_right(self._starts, index) - 1
+        return position, index - self._starts[position]
+
+    def values(self, index: int) -> Tuple[float, int]:
+        """Возвращает цену и количество записи index (для существующего продукта - текущие)."""
+        product = self._products.get(index)
+        if product is not None:
+            return product.price, product.quantity
+        position, offset = self.locate(index)
+        batch = self._batches[position]
+        return batch.prices[offset], batch.quantities[offset]
+
+    def _create(self, index: int) -> Product:
+        """Восстанавливает продукт записи index из колонок ее пакета."""
+        position, offset = self.locate(index)
+        batch = self._batches[position]
+        product_class = Product._types[batch.types[offset]]
+        extra = dict(zip(_extra_fields(product_class), batch.extras[offset]))
+        return product_class._restore(
+            batch.names[offset], batch.descriptions[offset], batch.prices[offset], batch.quantities[offset], **extra
+        )
+
+
+def load_categories_from_shards(
+    file_paths: Iterable[str],
+    max_workers: Optional[int] = None,
+    catalog: Optional[Catalog] = None,
+    conflicts: Optional[List[ShardConflict]] = None,
+) -> List[Category]:
+    """
+    Параллельно загружает категории из нескольких JSON файлов.
+
+    Файлы разбираются и проверяются в пуле процессов, воркеры возвращают компактные кортежи,
+    а основной процесс только объединяет категории с одинаковым названием и добавляет в них
+    отложенные записи (см. Category.from_records): продукты создаются без __init__ при первом
+    обращении, а агрегаты категорий учитывают записи сразу. Продукт с тем же типом и названием,
+    что уже есть в реестре (Category или catalog) или в более раннем файле, повторно не создается:
+    сохраняется первый продукт вместе с его ценой и количеством. Записи, цена или количество
+    которых отличаются от сохраненного продукта, добавляются в conflicts.
+
+    Args:
+        file_paths: Пути к JSON файлам в формате products.json
+        max_workers: Количество процессов (по умолчанию - число ядер)
+        catalog: Каталог, в который загружаются категории (по умолчанию - общие счетчики Category)
+        conflicts: Список, в который добавляются расходящиеся записи (None - не собирать)
+
+    Returns:
+        List[Category]: Категории в порядке первого появления
+
+    Raises:
+        ValueError: Если у записи неизвестный тип или нулевое количество
+    """
+    registry = catalog.all_products if catalog is not None else Category._all_products
+    known: Dict[Tuple[str, str], Product] = {(product.product_type, product.name): product for product in registry}
+    loader = _ShardProducts()
+    batch_categories: List[Category] = []  # Категория каждого пакета загрузчика
+    kept: Dict[Tuple[str, str], int] = {}  # (тип, название) -> номер оставленной записи
+    reused: Dict[int, Product] = {}  # Номер записи -> продукт из реестра
+    categories: Dict[str, Category] = {}
+    members: Dict[str, Set[int]] = {}  # Номера записей, уже добавленных в категорию
+    # Расходящиеся записи; продукт для отчета создается после загрузки
+    conflicting: List[Tuple[str, str, int, float, int]] = []
+    file_paths = list(file_paths)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for file_path, batches in zip(file_paths, executor.map(_parse_shard, file_paths)):
+            for batch in batches or ():
+                category = categories.get(batch.name)
+                if category is None:
+                    category = categories[batch.name] = Category(batch.name, batch.description, [], catalog=catalog)
+                    members[batch.name] = set()
+                category_members = members[batch.name]
+                start = loader.add_batch(batch)
+                batch_categories.append(category)
+                keys = list(zip(batch.types, batch.names))
+                unique = set(keys)
+
+                if len(unique) == len(keys) and kept.keys().isdisjoint(unique) and known.keys().isdisjoint(unique):
+                    # Все продукты пакета новые: записи и суммы агрегатов берутся из пакета целиком
+                    indices = range(start, start + len(keys))
+                    kept.update(zip(keys, indices))
+                    category_members.update(indices)
+                    category._defer(list(indices), loader, batch.totals, len(keys))
+                    continue
+
+                records: List[int] = []
+                prices: List[float] = []
+                quantities: List[int] = []
+                new_products = 0
+                for offset, (key, price, quantity) in enumerate(zip(keys, batch.prices, batch.quantities)):
+                    index = kept.get(key)
+                    if index is None:
+                        product = known.get(key)
+                        if product is None:
+                            index = start + offset
+                            new_products += 1
+                        else:
+                            index = loader.add_product(product)
+                            reused[index] = product
+                            category._adopt(product)
+                        kept[key] = index
+                    elif index not in category_members:
+                        # Продукт другой категории: эта категория подписывается на него при создании
+                        product = reused.get(index)
+                        if product is not None:
+                            category._adopt(product)
+                        else:
+                            loader.share(index, batch_categories[loader.locate(index)[0]], category)
+
+                    kept_price, kept_quantity = loader.values(index)
+                    if conflicts is not None and (price, quantity) != (kept_price, kept_quantity):
+                        conflicting.append((file_path, batch.name, index, price, quantity))
+                    if index in category_members:
+                        continue  # Продукт уже есть в категории
+                    category_members.add(index)
+                    records.append(index)
+                    prices.append(kept_price)
+                    quantities.append(kept_quantity)
+                category._defer(records, loader, record_totals(prices, quantities), new_products)
+
+    if conflicts is not None:
+        for file_path, name, index, price, quantity in conflicting:
+            product = loader.get(index, batch_categories[loader.locate(index)[0]])
+            conflicts.append(ShardConflict(file_path, name, product, price, quantity))
+    return list(categories.values())
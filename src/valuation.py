@@ -0,0 +1,45 @@
+from typing import Dict, Iterable
+
+from src.categories import Category
+from src.columnar import ProductColumns
+
+
+def _unique_columns(categories: Iterable[Category]) -> ProductColumns:
+    """Собирает колонки по уникальным товарам всех категорий (товар из нескольких категорий учитывается один раз)."""
+    products = {}
+    for category in categories:
+        products.update(dict.fromkeys(category.products_list))
+    return ProductColumns.from_products(products)
+
+
+def stock_value(categories: Iterable[Category], same_class: bool = False) -> float:
+    """
+    Считает общую стоимость товаров на складе по нескольким категориям за один проход.
+
+    Args:
+        categories: Категории для оценки
+        same_class: Требовать, чтобы все товары были одного класса, как при сложении через Product.__add__
+
+    Returns:
+        float: Сумма цена * количество по уникальным товарам
+
+    Raises:
+        TypeError: Если same_class=True и товары относятся к разным классам
+    """
+    columns = _unique_columns(categories)
+    if same_class:
+        columns.check_same_type()
+    return columns.stock_value()
+
+
+def stock_value_by_class(categories: Iterable[Category]) -> Dict[str, float]:
+    """
+    Считает стоимость товаров на складе по каждому классу продукта.
+
+    Args:
+        categories: Категории для оценки
+
+    Returns:
+        Dict[str, float]: Название класса -> стоимость его уникальных товаров
+    """
+    return _unique_columns(categories).stock_value_by_type()
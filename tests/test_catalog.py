@@ -0,0 +1,150 @@
+import json
+import os
+import tempfile
+import threading
+
+from src.catalog import Catalog
+from src.categories import Category
+from src.products import Product
+from src.utils import iter_categories_from_json, load_categories_from_json
+
+
+class TestCatalog:
+    """Тесты для каталога с собственными счетчиками и реестром."""
+
+    def setup_method(self):
+        """Сбрасываем глобальные счетчики перед каждым тестом."""
+        Category.reset_counters()
+
+    def test_catalogs_are_independent(self):
+        """Тест, что каталоги не делят счетчики и реестр."""
+        product = Product("Телефон", "Смартфон", 50000.0, 10)
+        catalog1 = Catalog("Арендатор 1")
+        catalog2 = Catalog("Арендатор 2")
+
+        category1 = catalog1.add_category("Смартфоны", "Описание", [product])
+        catalog1.add_category("Еще смартфоны", "Описание", [product])
+        category2 = catalog2.add_category("Смартфоны", "Описание", [product])
+        category2.add_product(Product("Ноутбук", "Игровой ноутбук", 100000.0, 5))
+
+        assert (catalog1.category_count, catalog1.product_count) == (2, 1)
+        assert (catalog2.category_count, catalog2.product_count) == (1, 2)
+        assert category1.catalog is catalog1
+        assert catalog1.categories[0] is category1
+        assert len(catalog2) == 1
+        # Глобальные счетчики Category не меняются
+        assert Category.category_count == 0
+        assert Category.product_count == 0
+        assert product not in Category._all_products
+
+    def test_category_without_catalog_uses_class_state(self):
+        """Тест, что категории без каталога по-прежнему учитываются в Category."""
+        category = Category("Категория", "Описание", [Product("Товар", "Описание", 1.0, 1)])
+
+        assert category.catalog is None
+        assert Category.category_count == 1
+        assert Category.product_count == 1
+
+    def test_reset_counters(self):
+        """Тест сброса каталога."""
+        catalog = Catalog()
+        catalog.add_category("Категория", "Описание", [Product("Товар", "Описание", 1.0, 1)])
+
+        catalog.reset_counters()
+
+        assert (catalog.category_count, catalog.product_count, len(catalog.all_products)) == (0, 0, 0)
+        assert list(catalog) == []
+
+    def test_parallel_catalogs(self):
+        """Тест параллельного наполнения нескольких каталогов."""
+        catalogs = [Catalog(f"Арендатор {i}") for i in range(4)]
+
+        def build(catalog):
+            for i in range(50):
+                catalog.add_category(f"Категория {i}", "Описание", [Product(f"Товар {i}", "Описание", 1.0, 1)])
+
+        threads = [threading.Thread(target=build, args=(catalog,)) for catalog in catalogs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [(catalog.category_count, catalog.product_count) for catalog in catalogs] == [(50, 50)] * 4
+
+    def test_load_into_catalog(self):
+        """Тест загрузки JSON в каталог."""
+        data = [
+            {
+                "name": "Категория",
+                "description": "Описание",
+                "products": [{"name": "Товар", "price": 1.0, "quantity": 1}],
+            }
+        ]
+        temp_file = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8")
+        json.dump(data, temp_file, ensure_ascii=False)
+        temp_file.close()
+
+        try:
+            catalog = Catalog()
+            load_categories_from_json(temp_file.name, catalog=catalog)
+            list(iter_categories_from_json(temp_file.name, catalog=catalog))
+
+            assert catalog.category_count == 2
+            assert catalog.product_count == 2
+            assert Category.category_count == 0
+        finally:
+            os.unlink(temp_file.name)
+
+    def test_catalog_range_queries(self):
+        """Тест запросов диапазонов по всем продуктам каталога."""
+        catalog = Catalog()
+        cheap = Product("Дешевый", "Описание", 100.0, 50)
+        expensive = Product("Дорогой", "Описание", 1000.0, 1)
+        catalog.add_category("Категория 1", "Описание", [cheap])
+        category = catalog.add_category("Категория 2", "Описание", [expensive, cheap])
+
+        assert catalog.price_range(50.0, 500.0) == [cheap]
+
+        cheap.price = 700.0
+        new = Product("Новый", "Описание", 200.0, 3)
+        category.add_product(new)
+
+        assert catalog.price_range(50.0, 800.0) == [new, cheap]
+        assert catalog.quantity_range(high=3) == [expensive, new]
+
+    def test_reset_unsubscribes_catalog_index(self):
+        """Тест, что сброс каталога отписывает его от продуктов."""
+        catalog = Catalog()
+        product = Product("Товар", "Описание", 1.0, 1)
+        catalog.add_category("Категория", "Описание", [product])
+        catalog.price_range()
+
+        catalog.reset_counters()
+
+        assert len(product._observers) == 1  # Осталась только подписка категории
+
+    def test_catalog_search(self):
+        """Тест поиска по всем продуктам каталога."""
+        catalog = Catalog()
+        phone = Product("Смартфон", "Описание", 1.0, 1)
+        catalog.add_category("Категория 1", "Описание", [phone])
+        category = catalog.add_category("Категория 2", "Описание", [])
+
+        assert catalog.search("смартфон") == [phone]
+
+        case = Product("Чехол для смартфона", "Описание", 1.0, 1)
+        category.add_product(case)
+
+        assert catalog.search("смартф", prefix=True) == [phone, case]
+
+    def test_catalog_search_follows_rename(self):
+        """Тест, что поиск каталога учитывает переименование товара."""
+        catalog = Catalog()
+        phone = Product("Смартфон", "Описание", 1.0, 1)
+        catalog.add_category("Категория", "Описание", [phone])
+        assert catalog.search("смартфон") == [phone]
+
+        phone.name = "Планшет"
+
+        assert catalog.search("смартфон") == []
+        assert catalog.search("планшет") == [phone]
@@ -1,9 +1,13 @@
+import gc
 import io
 import sys
+import threading
+import weakref
 
 import pytest
 
 from src.categories import Category, CategoryIterator
+from src.exceptions import ZeroQuantityError
 from src.products import LawnGrass, Product, Smartphone
 
 
@@ -358,3 +362,458 @@ class TestCategory:
         # При отрицательной цене в __init__ она становится 0
         # -50 превращается в 0, поэтому средняя: (0 + 100 + 150) / 3 = 83.33...
         assert category.middle_price() == pytest.approx(83.33333)
+
+    def test_add_products_bulk(self):
+        """Тест пакетного добавления продуктов."""
+        existing = Product("Товар 1", "Описание", 100.0, 5)
+        category = Category("Категория", "Описание", [existing])
+        new_products = [Product("Товар 2", "Описание", 200.0, 3), Product("Товар 3", "Описание", 300.0, 7)]
+
+        # Дубликаты внутри пакета и уже добавленные товары пропускаются
+        added = category.add_products([existing, *new_products, new_products[0]])
+
+        assert added == 2
+        assert [product.name for product in category] == ["Товар 1", "Товар 2", "Товар 3"]
+        assert Category.product_count == 3
+
+    def test_add_products_bulk_validation_is_atomic(self):
+        """Тест, что при ошибке в пакете категория не изменяется."""
+        category = Category("Категория", "Описание", [])
+        product = Product("Товар", "Описание", 100.0, 5)
+
+        with pytest.raises(TypeError, match="а не str"):
+            category.add_products([product, "не продукт"])
+
+        product_zero = Product("Товар 2", "Описание", 100.0, 1)
+        product_zero.quantity = 0
+        with pytest.raises(ZeroQuantityError):
+            category.add_products([product, product_zero])
+
+        assert category.products_list == []
+        assert Category.product_count == 0
+
+    def test_duplicate_in_constructor_list(self):
+        """Тест, что дубликаты в списке конструктора учитываются один раз."""
+        product = Product("Товар", "Описание", 100.0, 5)
+        category = Category("Категория", "Описание", [product, product])
+
+        assert category.products_list == [product]
+
+    def test_aggregates_follow_product_changes(self):
+        """Тест, что агрегаты категории обновляются при изменении цены и количества."""
+        product1 = Product("Товар 1", "Описание", 100.0, 5)
+        product2 = Product("Товар 2", "Описание", 200.0, 3)
+        category = Category("Категория", "Описание", [product1, product2])
+
+        assert category.stock_value == 1100.0
+
+        product1.price = 300.0
+        product2.quantity = 10
+
+        assert category.middle_price() == 250.0
+        assert category.total_quantity == 15
+        assert category.stock_value == 3500.0
+        assert str(category) == "Категория, количество продуктов: 15 шт."
+
+    def test_aggregates_match_full_recount(self):
+        """Тест, что инкрементальные агрегаты совпадают с полным пересчетом."""
+        products = [Product(f"Товар {i}", "Описание", 0.1 * (i + 1), i + 1) for i in range(50)]
+        category = Category("Категория", "Описание", products[:25])
+        category.add_products(products[25:])
+
+        for i, product in enumerate(products):
+            product.price = 0.7 * (i + 3)
+            product.quantity += i
+
+        assert category.total_quantity == sum(product.quantity for product in products)
+        assert category.middle_price() == pytest.approx(sum(product.price for product in products) / 50, rel=1e-15)
+        assert category.stock_value == pytest.approx(sum(p.price * p.quantity for p in products), rel=1e-15)
+
+    def test_product_in_two_categories_updates_both(self):
+        """Тест, что изменение товара обновляет все категории, где он есть."""
+        product = Product("Товар", "Описание", 100.0, 5)
+        category1 = Category("Категория 1", "Описание", [product])
+        category2 = Category("Категория 2", "Описание", [])
+        category2.add_products([product])
+
+        product.quantity = 7
+
+        assert category1.total_quantity == 7
+        assert category2.total_quantity == 7
+
+    def test_discarded_category_is_not_kept_by_products(self):
+        """Тест, что товар не удерживает удаленные категории и не уведомляет их."""
+        product = Product("Тест", "Описание", 100.0, 5)
+        categories = [weakref.ref(Category("Временная", "Описание", [product])) for _ in range(100)]
+        gc.collect()
+        product.price = 150.0
+
+        assert all(category() is None for category in categories)
+        assert product._observers == ()
+
+
+class TestCategoryRenderCache:
+    """Тесты кеширования строки Category.products."""
+
+    def setup_method(self):
+        """Сбрасываем счетчики перед каждым тестом."""
+        Category.reset_counters()
+
+    def test_unchanged_category_is_cache_hit(self):
+        """Тест, что повторный вывод неизмененной категории возвращает ту же строку."""
+        category = Category("Категория", "Описание", [Product("Товар", "Описание", 100.0, 5)])
+
+        assert category.products is category.products
+
+    def test_membership_change_resets_cache(self):
+        """Тест, что добавление товара сбрасывает кеш."""
+        category = Category("Категория", "Описание", [Product("Товар 1", "Описание", 100.0, 5)])
+        category.products
+
+        category.add_product(Product("Товар 2", "Описание", 200.0, 3))
+
+        assert category.products.splitlines()[1] == "Товар 2, 200.0 руб. Остаток: 3 шт."
+
+    def test_product_change_resets_cache_of_every_category(self):
+        """Тест, что изменение товара сбрасывает кеш всех категорий, где он есть."""
+        product = Product("Товар", "Описание", 100.0, 5)
+        category1 = Category("Категория 1", "Описание", [product])
+        category2 = Category("Категория 2", "Описание", [product])
+        category1.products
+        category2.products
+
+        product.quantity = 8
+
+        assert category1.products == "Товар, 100.0 руб. Остаток: 8 шт."
+        assert category2.products == "Товар, 100.0 руб. Остаток: 8 шт."
+
+    def test_lazy_records_rendered(self):
+        """Тест вывода категории, созданной из записей."""
+        category = Category.from_records(
+            "Категория", "Описание", [{"name": "Товар", "description": "Описание", "price": 10.0, "quantity": 1}]
+        )
+
+        assert category.products == "Товар, 10.0 руб. Остаток: 1 шт."
+
+
+class TestCategoryRangeQueries:
+    """Тесты запросов диапазонов цены и количества."""
+
+    def setup_method(self):
+        """Сбрасываем счетчики перед каждым тестом."""
+        Category.reset_counters()
+        self.cheap = Product("Дешевый", "Описание", 100.0, 50)
+        self.middle = Product("Средний", "Описание", 500.0, 5)
+        self.expensive = Product("Дорогой", "Описание", 1000.0, 1)
+        self.category = Category("Категория", "Описание", [self.expensive, self.cheap, self.middle])
+
+    def test_price_range(self):
+        """Тест выборки товаров по диапазону цены."""
+        assert self.category.price_range(100.0, 500.0) == [self.cheap, self.middle]
+        assert self.category.price_range(low=600.0) == [self.expensive]
+
+    def test_quantity_range(self):
+        """Тест выборки товаров с остатком ниже порога."""
+        assert self.category.quantity_range(high=5) == [self.expensive, self.middle]
+
+    def test_index_follows_changes_and_additions(self):
+        """Тест, что индекс обновляется при изменении цены и добавлении товара."""
+        self.category.price_range()
+
+        self.cheap.price = 2000.0
+        new = Product("Новый", "Описание", 300.0, 1)
+        self.category.add_product(new)
+
+        assert self.category.price_range(200.0, 1500.0) == [new, self.middle, self.expensive]
+        assert self.category.price_range(low=1500.0) == [self.cheap]
+
+    def test_range_over_lazy_records(self):
+        """Тест запроса диапазона по категории из записей."""
+        records = [{"name": f"Товар {i}", "description": "", "price": float(i + 1), "quantity": 1} for i in range(5)]
+        category = Category.from_records("Категория", "Описание", records)
+
+        assert [product.name for product in category.price_range(2.0, 3.0)] == ["Товар 1", "Товар 2"]
+
+
+class TestCategorySortedViews:
+    """Тесты отсортированных представлений и top-K."""
+
+    def setup_method(self):
+        """Сбрасываем счетчики перед каждым тестом."""
+        Category.reset_counters()
+        self.fast = Smartphone("Быстрый", "Описание", 90000.0, 2, 99.0, "A", 512, "Черный")
+        self.slow = Smartphone("Медленный", "Описание", 10000.0, 30, 60.0, "B", 64, "Белый")
+        self.middle = Smartphone("Средний", "Описание", 40000.0, 7, 80.0, "C", 128, "Синий")
+        self.grass = LawnGrass("Трава", "Описание", 500.0, 100, "Россия", "7 дней", "Зеленый")
+        self.category = Category("Категория", "Описание", [self.fast, self.slow, self.middle, self.grass])
+
+    def test_top_by_price_and_quantity(self):
+        """Тест самых дешевых товаров и товаров с наибольшим остатком."""
+        assert self.category.top("price", 2, largest=False) == [self.grass, self.slow]
+        assert self.category.top("quantity", 1) == [self.grass]
+
+    def test_top_by_subclass_field(self):
+        """Тест top-K по полю наследника: учитываются только смартфоны."""
+        assert self.category.top("efficiency", 10) == [self.fast, self.middle, self.slow]
+
+    def test_sorted_by_pages(self):
+        """Тест постраничного вывода в порядке поля."""
+        assert self.category.sorted_by("price", offset=1, limit=2) == [self.slow, self.middle]
+        assert self.category.sorted_by("memory", limit=2, descending=True) == [self.fast, self.middle]
+
+    def test_views_follow_changes(self):
+        """Тест, что представления учитывают изменения и новые товары."""
+        self.category.top("price")
+
+        self.slow.price = 95000.0
+        new = Product("Новый", "Описание", 100.0, 1)
+        self.category.add_product(new)
+
+        assert self.category.top("price", 2) == [self.slow, self.fast]
+        assert self.category.top("price", 1, largest=False) == [new]
+
+    def test_top_zero_and_negative(self):
+        """Тест, что top при k=0 возвращает пустой список, а при отрицательном k - ошибку."""
+        assert self.category.top("price", 0) == []
+        with pytest.raises(ValueError, match="не может быть отрицательным"):
+            self.category.top("price", -1)
+
+    def test_unknown_field(self):
+        """Тест ошибки для поля, по которому нельзя сортировать."""
+        with pytest.raises(ValueError, match="Нельзя сортировать товары по полю color"):
+            self.category.top("color")
+
+
+class TestCategorySearch:
+    """Тесты полнотекстового поиска по категории."""
+
+    def setup_method(self):
+        """Сбрасываем счетчики перед каждым тестом."""
+        Category.reset_counters()
+
+    def test_search_follows_add_product(self):
+        """Тест, что добавленный товар находится поиском."""
+        category = Category("Категория", "Описание", [Product("Телевизор", "Большой экран", 1.0, 1)])
+        assert category.search("экран") == category.products_list
+
+        laptop = Product("Ноутбук", "Маленький экран", 1.0, 1)
+        category.add_product(laptop)
+
+        assert category.search("маленький экран") == [laptop]
+        assert len(category.search("экран")) == 2
+
+    def test_search_follows_rename(self):
+        """Тест, что поиск находит товар по новому имени и не находит по старому."""
+        product = Product("Телевизор", "Описание", 1.0, 1)
+        category = Category("Категория", "Описание", [product])
+        category.search("телевизор")
+
+        product.name = "Монитор"
+
+        assert category.search("телевизор") == []
+        assert category.search("монитор") == [product]
+        assert category.products == "Монитор, 1.0 руб. Остаток: 1 шт."
+
+    def test_search_lazy_records(self):
+        """Тест поиска по категории из записей."""
+        records = [
+            {"name": f"Товар {i}", "description": "Ёлочная игрушка", "price": 1.0, "quantity": 1} for i in range(3)
+        ]
+        category = Category.from_records("Категория", "Описание", records)
+
+        assert [product.name for product in category.search("елоч", prefix=True)] == ["Товар 0", "Товар 1", "Товар 2"]
+
+
+class TestCategoryPagination:
+    """Тесты постраничного вывода товаров категории."""
+
+    def setup_method(self):
+        """Сбрасываем счетчики перед каждым тестом."""
+        Category.reset_counters()
+        self.products = [Product(f"Товар {i}", "Описание", 10.0 * (i + 1), 1) for i in range(5)]
+        self.category = Category("Категория", "Описание", self.products)
+
+    def test_page_offset_limit(self):
+        """Тест выборки страницы по смещению и размеру."""
+        assert self.category.page(0, 2) == self.products[:2]
+        assert self.category.page(4, 2) == self.products[4:]
+        assert self.category.page(10, 2) == []
+
+    def test_render_page(self):
+        """Тест строкового представления страницы."""
+        assert self.category.render_page(1, 2) == "Товар 1, 20.0 руб. Остаток: 1 шт.\nТовар 2, 30.0 руб. Остаток: 1 шт."
+
+    def test_page_after_walks_category(self):
+        """Тест обхода категории по курсорам."""
+        pages = []
+        cursor = None
+        while True:
+            page = self.category.page_after(cursor, limit=2)
+            pages.append(page.products)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert pages == [self.products[:2], self.products[2:4], self.products[4:]]
+
+    def test_cursor_survives_appends(self):
+        """Тест, что курсор продолжает обход после пополнения категории."""
+        page = self.category.page_after(None, limit=5)
+        assert page.next_cursor is None
+
+        extra = Product("Новый", "Описание", 1.0, 1)
+        self.category.add_product(extra)
+
+        assert self.category.page_after(5, limit=5).products == [extra]
+
+    def test_invalid_arguments(self):
+        """Тест проверки аргументов страницы."""
+        with pytest.raises(ValueError):
+            self.category.page(-1, 2)
+        with pytest.raises(ValueError):
+            self.category.page(0, 0)
+
+    def test_page_materializes_only_page_records(self):
+        """Тест, что страница создает продукты только для своих записей."""
+        records = [{"name": f"Товар {i}", "description": "", "price": 1.0, "quantity": 1} for i in range(50)]
+        category = Category.from_records("Категория", "Описание", records)
+
+        page = category.page(10, 5)
+
+        assert [product.name for product in page] == [f"Товар {i}" for i in range(10, 15)]
+        assert category._pending == 45
+
+
+class TestLazyCategory:
+    """Тесты категорий с отложенным созданием продуктов."""
+
+    def setup_method(self):
+        """Сбрасываем счетчики перед каждым тестом."""
+        Category.reset_counters()
+
+    @staticmethod
+    def _records(count):
+        return [
+            {"name": f"Товар {i}", "description": "Описание", "price": 10.0 * (i + 1), "quantity": i + 1}
+            for i in range(count)
+        ]
+
+    def test_aggregates_without_materialization(self):
+        """Тест, что агрегаты и счетчики учитывают записи до создания продуктов."""
+        category = Category.from_records("Категория", "Описание", self._records(4))
+
+        assert category.total_quantity == 10
+        assert category.middle_price() == 25.0
+        assert category.stock_value == 300.0
+        assert Category.product_count == 4
+        assert len(Category._all_products) == 0
+        assert all(type(item) is dict for item in category._products)
+
+    def test_iteration_materializes_only_visited_products(self):
+        """Тест, что итерация создает только просмотренные продукты и кеширует их."""
+        category = Category.from_records("Категория", "Описание", self._records(100))
+
+        iterator = iter(category)
+        first = [next(iterator) for _ in range(3)]
+
+        assert [product.name for product in first] == ["Товар 0", "Товар 1", "Товар 2"]
+        assert category._pending == 97
+        assert len(Category._all_products) == 3
+        assert next(iter(category)) is first[0]
+        assert Category.product_count == 100
+
+    def test_materialized_product_updates_aggregates(self):
+        """Тест, что созданный из записи продукт обновляет агрегаты категории."""
+        category = Category.from_records("Категория", "Описание", self._records(2))
+
+        product = next(iter(category))
+        product.quantity = 11
+
+        assert category.total_quantity == 13
+
+    def test_typed_records_and_products_list(self):
+        """Тест создания наследников по полю type и полного списка продуктов."""
+        records = [
+            {
+                "type": "lawn_grass",
+                "name": "Газон",
+                "description": "Трава",
+                "price": 500.0,
+                "quantity": 20,
+                "country": "Россия",
+                "germination_period": "7 дней",
+                "color": "Зеленый",
+            },
+            {"name": "Товар", "description": "Описание", "price": -5.0, "quantity": 1},
+        ]
+        category = Category.from_records("Категория", "Описание", records)
+
+        assert category.middle_price() == 250.0
+        grass, product = category.products_list
+        assert isinstance(grass, LawnGrass)
+        assert product.price == 0
+        assert category._pending == 0
+        assert len(Category._all_products) == 2
+        assert Category.product_count == 2
+
+    def test_invalid_records_rejected_upfront(self):
+        """Тест, что некорректные записи отклоняются при создании категории."""
+        with pytest.raises(ValueError, match="нулевым количеством"):
+            Category.from_records("Категория", "Описание", [{"name": "Товар", "price": 1.0, "quantity": 0}])
+        with pytest.raises(ValueError, match="Неизвестный тип продукта: tablet"):
+            Category.from_records("Категория", "Описание", [{"type": "tablet", "quantity": 1}])
+
+
+class TestCategoryConcurrency:
+    """Стресс-тест параллельного наполнения категорий."""
+
+    def setup_method(self):
+        """Сбрасываем счетчики и реестр перед тестом."""
+        Category.reset_counters()
+
+    def teardown_method(self):
+        """Сбрасываем счетчики и реестр после теста."""
+        Category.reset_counters()
+
+    def test_parallel_add_product(self):
+        """Тест, что счетчики и реестр корректны при добавлении из многих потоков."""
+        threads_count = 8
+        per_thread = 300
+        # Общие продукты попадают во все категории, уникальные - только в свою
+        shared = [Product(f"Общий {i}", "Описание", 10.0, 1) for i in range(per_thread)]
+        unique = [
+            [Product(f"Товар {t}-{i}", "Описание", 1.0, 2) for i in range(per_thread)] for t in range(threads_count)
+        ]
+        categories = [Category(f"Категория {t}", "Описание", []) for t in range(threads_count)]
+        barrier = threading.Barrier(threads_count)
+
+        def worker(index):
+            barrier.wait()
+            category = categories[index]
+            for shared_product, own_product in zip(shared, unique[index]):
+                category.add_products([shared_product])
+                category.add_product(own_product)
+                # Другая категория тоже получает этот продукт параллельно с владельцем
+                categories[(index + 1) % threads_count].add_products([own_product])
+
+        old_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        old_stdout = sys.stdout
+        sys.stdout = io.StringIO()
+        try:
+            threads = [threading.Thread(target=worker, args=(t,)) for t in range(threads_count)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.stdout = old_stdout
+            sys.setswitchinterval(old_interval)
+
+        assert Category.category_count == threads_count
+        assert Category.product_count == per_thread * (threads_count + 1)
+        assert len(Category._all_products) == Category.product_count
+        for category in categories:
+            assert len(category.products_list) == per_thread * 3
+            assert len(set(category.products_list)) == per_thread * 3
+            assert category.total_quantity == per_thread * (1 + 2 + 2)
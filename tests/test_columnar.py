@@ -0,0 +1,76 @@
+import pytest
+
+from src.categories import Category
+from src.columnar import ProductColumns
+from src.products import LawnGrass, Product, Smartphone
+
+
+class TestProductColumns:
+    """Тесты для колоночного хранилища продуктов."""
+
+    def setup_method(self):
+        """Создаем категорию с товарами разных классов."""
+        Category.reset_counters()
+        self.category = Category(
+            "Категория",
+            "Описание",
+            [
+                Product("Товар", "Описание", 100.0, 5),
+                Smartphone("Смартфон", "Описание", 50000.0, 2, 90.0, "X", 128, "Черный"),
+                LawnGrass("Трава", "Описание", 500.0, 20, "Россия", "7 дней", "Зеленый"),
+            ],
+        )
+
+    def test_export_from_category(self):
+        """Тест экспорта категории в колонки."""
+        columns = self.category.to_columns()
+
+        assert len(columns) == 3
+        assert list(columns.price) == [100.0, 50000.0, 500.0]
+        assert list(columns.quantity) == [5, 2, 20]
+        assert columns.name == ["Товар", "Смартфон", "Трава"]
+        assert columns.type == ["Product", "Smartphone", "LawnGrass"]
+
+    def test_aggregates_match_category(self):
+        """Тест, что агрегаты колонок совпадают с агрегатами категории."""
+        columns = self.category.to_columns()
+
+        assert columns.sum("quantity") == self.category.total_quantity
+        assert columns.mean("price") == pytest.approx(self.category.middle_price())
+        assert columns.min("price") == 100.0
+        assert columns.max("quantity") == 20
+
+    def test_filter(self):
+        """Тест фильтрации строк по условию на колонку."""
+        columns = self.category.to_columns()
+
+        cheap = columns.filter("price", lambda price: price < 1000)
+
+        assert cheap.name == ["Товар", "Трава"]
+        assert cheap.type == ["Product", "LawnGrass"]
+        assert cheap.sum("quantity") == 25
+
+    def test_empty_columns(self):
+        """Тест агрегатов пустого хранилища."""
+        columns = ProductColumns()
+
+        assert columns.mean("price") == 0.0
+        assert columns.sum("quantity") == 0
+        with pytest.raises(ValueError):
+            columns.min("price")
+
+    def test_unknown_column(self):
+        """Тест обращения к несуществующей колонке."""
+        columns = ProductColumns()
+
+        with pytest.raises(KeyError):
+            columns.sum("name")
+        with pytest.raises(KeyError):
+            columns.column("color")
+
+    def test_strings_are_interned(self):
+        """Тест, что одинаковые строки хранятся одним объектом."""
+        products = [Product("Товар", "".join(["Общее ", "описание"]), 1.0, 1) for _ in range(2)]
+        columns = ProductColumns.from_products(products)
+
+        assert columns.description[0] is columns.description[1]
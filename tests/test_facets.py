@@ -0,0 +1,82 @@
+import pytest
+
+from src.categories import Category
+from src.facets import FacetIndex
+from src.products import LawnGrass, Product, Smartphone
+
+
+class TestFacetIndex:
+    """Тесты фасетного индекса."""
+
+    def setup_method(self):
+        """Создаем индекс со смартфонами и травой."""
+        Category.reset_counters()
+        self.black_256 = Smartphone("Samsung", "Описание", 1.0, 1, 95.5, "S23", 256, "Черный")
+        self.black_128 = Smartphone("Xiaomi", "Описание", 1.0, 1, 80.0, "Note", 128, "Черный")
+        self.white_256 = Smartphone("Iphone", "Описание", 1.0, 1, 98.2, "15", 256, "Белый")
+        self.grass = LawnGrass("Трава", "Описание", 1.0, 1, "Россия", "7 дней", "Зеленый")
+        self.product = Product("Товар", "Описание", 1.0, 1)
+        self.index = FacetIndex([self.black_256, self.black_128, self.white_256, self.grass, self.product])
+
+    def test_counts(self):
+        """Тест количества товаров по значениям фасета."""
+        assert self.index.counts("smartphone", "memory") == {256: 2, 128: 1}
+        assert self.index.counts("smartphone", "color") == {"Черный": 2, "Белый": 1}
+        assert self.index.counts("lawn_grass", "color") == {"Зеленый": 1}
+
+    def test_counts_with_filters(self):
+        """Тест количества с учетом выбранных фасетов."""
+        assert self.index.counts("smartphone", "color", memory=256) == {"Черный": 1, "Белый": 1}
+        assert self.index.counts("smartphone", "memory", color="Белый") == {256: 1}
+
+    def test_filter(self):
+        """Тест пересечения фильтров."""
+        assert self.index.filter("smartphone", memory=256, color="Черный") == [self.black_256]
+        assert self.index.filter("smartphone", color="Зеленый") == []
+        assert self.index.filter("lawn_grass") == [self.grass]
+
+    def test_unknown_facet(self):
+        """Тест ошибки для неизвестного типа или поля."""
+        with pytest.raises(ValueError, match="Неизвестный тип продукта: tablet"):
+            self.index.counts("tablet", "color")
+        with pytest.raises(ValueError, match="Поле model не является фасетом типа smartphone"):
+            self.index.filter("smartphone", model="S23")
+
+    def test_add_many_updates_postings(self):
+        """Тест, что добавленные товары учитываются, а повторные пропускаются."""
+        new = Smartphone("Pixel", "Описание", 1.0, 1, 90.0, "8", 128, "Белый")
+
+        assert self.index.add_many([new, self.black_256]) == 1
+        assert self.index.counts("smartphone", "memory") == {256: 2, 128: 2}
+
+
+class TestCategoryFacets:
+    """Тесты фасетов категории."""
+
+    def setup_method(self):
+        """Сбрасываем счетчики перед каждым тестом."""
+        Category.reset_counters()
+
+    def test_facets_follow_add_product(self):
+        """Тест, что добавленный товар попадает в фасеты категории."""
+        phone = Smartphone("Samsung", "Описание", 1.0, 1, 95.5, "S23", 256, "Черный")
+        category = Category("Смартфоны", "Описание", [phone])
+        assert category.facet_counts("smartphone", "memory") == {256: 1}
+
+        new = Smartphone("Iphone", "Описание", 1.0, 1, 98.2, "15", 512, "Черный")
+        category.add_product(new)
+
+        assert category.facet_counts("smartphone", "memory") == {256: 1, 512: 1}
+        assert category.facet_filter("smartphone", color="Черный", memory=512) == [new]
+
+    def test_facets_follow_field_change(self):
+        """Тест, что изменение поля товара переносит его в другое значение фасета."""
+        phone = Smartphone("Samsung", "Описание", 1.0, 1, 95.5, "S23", 256, "Черный")
+        category = Category("Смартфоны", "Описание", [phone])
+        assert category.facet_filter("smartphone", color="Черный") == [phone]
+
+        phone.color = "Белый"
+
+        assert category.facet_counts("smartphone", "color") == {"Белый": 1}
+        assert category.facet_filter("smartphone", color="Черный") == []
+        assert category.facet_filter("smartphone", color="Белый") == [phone]
@@ -0,0 +1,79 @@
+import random
+
+from src.categories import Category
+from src.indexes import RangeIndex
+from src.products import Product, Smartphone
+
+
+class TestRangeIndex:
+    """Тесты для отсортированного индекса диапазонов."""
+
+    def setup_method(self):
+        """Сбрасываем счетчики перед каждым тестом."""
+        Category.reset_counters()
+
+    def test_range_bounds_are_inclusive(self):
+        """Тест, что границы диапазона включаются."""
+        products = [Product(f"Товар {i}", "Описание", float(price), 1) for i, price in enumerate([30, 10, 20, 20])]
+        index = RangeIndex("price", products)
+
+        assert [product.price for product in index.range(10.0, 20.0)] == [10.0, 20.0, 20.0]
+        assert [product.price for product in index.range(low=20.0)] == [20.0, 20.0, 30.0]
+        assert [product.price for product in index.range(high=15.0)] == [10.0]
+        assert index.range(31.0, 40.0) == []
+        assert len(index) == 4
+
+    def test_add_and_update_keep_order(self):
+        """Тест, что добавление и перемещение продуктов сохраняют порядок."""
+        products = [Product(f"Товар {i}", "Описание", 1.0, random.randint(1, 20)) for i in range(30)]
+        index = RangeIndex("quantity", products[:20])
+        index.add_many(products[20:25])
+        for product in products[25:]:
+            index.add(product)
+
+        for product in products:
+            old = product.quantity
+            product.quantity = random.randint(1, 20)
+            index.update(product, old, product.quantity)
+
+        assert index.range() == sorted(products, key=lambda product: (product.quantity, id(product)))
+
+    def test_small_batches_are_inserted(self):
+        """Тест, что небольшие пакеты добавляются в большой индекс вставкой и сохраняют порядок."""
+        products = [Product(f"Товар {i}", "Описание", float(random.randint(1, 50)), 1) for i in range(200)]
+        index = RangeIndex("price", products[:190])
+        keys = index._keys
+        index.add_many(products[190:193])
+        for product in products[193:]:
+            index.add_many([product])
+
+        assert index._keys is keys  # Индекс не пересобирался
+        assert index.range() == sorted(products, key=lambda product: (product.price, id(product)))
+
+    def test_update_after_late_build(self):
+        """Тест, что уведомление об изменении, уже учтенном при построении, игнорируется."""
+        product = Product("Товар", "Описание", 10.0, 1)
+        product.price = 20.0
+        index = RangeIndex("price", [product])
+
+        index.update(product, 10.0, 20.0)
+
+        assert index.range() == [product]
+
+    def test_window(self):
+        """Тест окна отсортированного индекса в обоих направлениях."""
+        products = [Product(f"Товар {i}", "Описание", float(i), 1) for i in range(1, 6)]
+        index = RangeIndex("price", reversed(products))
+
+        assert index.window(0, 2) == products[:2]
+        assert index.window(1, 2, descending=True) == [products[3], products[2]]
+        assert index.window(4, 10, descending=True) == [products[0]]
+        assert index.window(5, 10, descending=True) == []
+
+    def test_products_without_field_are_skipped(self):
+        """Тест, что продукты без поля не попадают в индекс."""
+        phone = Smartphone("Samsung", "Описание", 1.0, 1, 95.5, "S23", 256, "Черный")
+        index = RangeIndex("efficiency", [Product("Товар", "Описание", 1.0, 1), phone])
+        index.add(Product("Еще товар", "Описание", 1.0, 1))
+
+        assert index.range() == [phone]
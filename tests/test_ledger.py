@@ -0,0 +1,170 @@
+import os
+import tempfile
+
+import pytest
+
+from src.categories import Category
+from src.exceptions import ZeroQuantityError
+from src.ledger import InventoryLedger
+from src.products import Product
+
+
+class TestInventoryLedger:
+    """Тесты журнала движения остатков."""
+
+    def setup_method(self):
+        """Создаем категории с общим товаром."""
+        Category.reset_counters()
+        self.phone = Product("Телефон", "Описание", 1000.0, 5)
+        self.laptop = Product("Ноутбук", "Описание", 5000.0, 2)
+        self.category1 = Category("Категория 1", "Описание", [self.phone, self.laptop])
+        self.category2 = Category("Категория 2", "Описание", [self.phone])
+
+    def test_batch_is_summed_per_product(self):
+        """Тест суммирования изменений по товару и применения пакета."""
+        ledger = InventoryLedger([self.category1, self.category2])
+        ledger.record("Телефон", 3)
+        ledger.record("Телефон", -1)
+        ledger.record("Ноутбук", -1)
+
+        assert ledger.pending == {"Телефон": 2, "Ноутбук": -1}
+        assert ledger.commit() == 2
+        assert (self.phone.quantity, self.laptop.quantity) == (7, 1)
+        assert self.category1.total_quantity == 8
+        assert self.category2.total_quantity == 7
+        assert self.category1.stock_value == 12000.0
+        assert ledger.pending == {}
+
+    def test_commit_is_atomic(self):
+        """Тест, что при нехватке остатка пакет не применяется."""
+        ledger = InventoryLedger([self.category1])
+        ledger.record("Телефон", -1)
+        ledger.record("Ноутбук", -3)
+
+        with pytest.raises(ValueError, match="Недостаточно товара Ноутбук: в наличии 2 шт., требуется 3 шт."):
+            ledger.commit()
+
+        assert (self.phone.quantity, self.laptop.quantity) == (5, 2)
+        assert ledger.pending == {}
+
+    def test_commit_rejects_empty_stock(self):
+        """Тест, что пакет, после которого остаток товара стал бы нулевым, не применяется."""
+        ledger = InventoryLedger([self.category1, self.category2])
+        ledger.record("Телефон", 1)
+        ledger.record("Ноутбук", -2)
+
+        with pytest.raises(ZeroQuantityError, match="Остаток товара Ноутбук стал бы нулевым"):
+            ledger.commit()
+
+        assert (self.phone.quantity, self.laptop.quantity) == (5, 2)
+        assert self.category1.total_quantity == 7
+        assert ledger.pending == {}
+
+    def test_invalid_movements(self):
+        """Тест проверки отдельных изменений."""
+        ledger = InventoryLedger([self.category1])
+
+        with pytest.raises(ValueError, match="Изменение остатка не может быть нулевым"):
+            ledger.record("Телефон", 0)
+        with pytest.raises(TypeError):
+            ledger.record("Телефон", 1.5)
+        with pytest.raises(KeyError):
+            ledger.record("Планшет", 1)
+
+    def test_products_added_later_are_found(self):
+        """Тест, что журнал находит товары, добавленные в категорию после его создания."""
+        ledger = InventoryLedger([self.category1])
+        tv = Product("Телевизор", "Описание", 3000.0, 1)
+        self.category1.add_product(tv)
+
+        ledger.record("Телевизор", 4)
+        ledger.commit()
+
+        assert tv.quantity == 5
+
+    def test_renamed_product_is_found(self):
+        """Тест, что журнал находит переименованный товар по новому названию."""
+        ledger = InventoryLedger([self.category1])
+        ledger.record("Телефон", 1)
+        ledger.commit()
+
+        self.phone.name = "Смартфон"
+        ledger.record("Смартфон", 2)
+        ledger.commit()
+
+        assert self.phone.quantity == 8
+        with pytest.raises(KeyError):
+            ledger.record("Телефон", 1)
+
+    def test_unknown_names_index_only_new_products(self, monkeypatch):
+        """Тест, что неизвестные названия не обходят заново все товары категорий."""
+        records = [{"name": f"Товар {i}", "description": "Описание", "price": 1.0, "quantity": 1} for i in range(5)]
+        category = Category.from_records("Категория", "Описание", records)
+        ledger = InventoryLedger([category])
+        calls = []
+        product_at = Category._product_at
+        monkeypatch.setattr(Category, "_product_at", lambda self, index: calls.append(index) or product_at(self, index))
+
+        for _ in range(3):
+            with pytest.raises(KeyError):
+                ledger.record("Планшет", 1)
+        category.add_product(Product("Планшет", "Описание", 1.0, 1))
+        ledger.record("Планшет", 1)
+
+        assert calls == [0, 1, 2, 3, 4, 5]
+
+    def test_failed_write_keeps_quantities(self):
+        """Тест, что пакет, который не удалось записать в журнал, не меняет остатки."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            ledger = InventoryLedger([self.category1], temp_dir)  # Каталог вместо файла
+            ledger.record("Телефон", -1)
+            ledger.record("Ноутбук", 1)
+
+            with pytest.raises(OSError):
+                ledger.commit()
+
+            assert (self.phone.quantity, self.laptop.quantity) == (5, 2)
+            assert self.category1.total_quantity == 7
+        finally:
+            os.rmdir(temp_dir)
+
+    def test_replay_restores_quantities(self):
+        """Тест восстановления остатков по файлу журнала после перезапуска."""
+        temp_dir = tempfile.mkdtemp()
+        path = os.path.join(temp_dir, "ledger.jsonl")
+        try:
+            ledger = InventoryLedger([self.category1], path)
+            ledger.record("Телефон", -2)
+            ledger.commit()
+            ledger.record("Телефон", 10)
+            ledger.record("Ноутбук", -1)
+            ledger.commit()
+            with open(path, "a", encoding="utf-8") as file:
+                file.write('{"Телефон": ')  # Недописанная строка
+
+            # "Перезапуск": те же исходные остатки, что и до журнала
+            Category.reset_counters()
+            phone = Product("Телефон", "Описание", 1000.0, 5)
+            laptop = Product("Ноутбук", "Описание", 5000.0, 2)
+            category = Category("Категория 1", "Описание", [phone, laptop])
+
+            ledger = InventoryLedger([category], path)
+            assert ledger.replay() == 2
+            assert (phone.quantity, laptop.quantity) == (13, 1)
+            assert category.total_quantity == 14
+
+            # Новый пакет не склеивается с недописанной строкой
+            ledger.record("Ноутбук", 1)
+            ledger.commit()
+            phone.quantity, laptop.quantity = 5, 2
+            ledger.replay()
+            assert (phone.quantity, laptop.quantity) == (13, 2)
+        finally:
+            os.remove(path)
+            os.rmdir(temp_dir)
+
+    def test_replay_without_file(self):
+        """Тест replay при отсутствии журнала."""
+        assert InventoryLedger([self.category1]).replay() == 0
+        assert InventoryLedger([self.category1], "нет_такого_журнала.jsonl").replay() == 0
@@ -0,0 +1,114 @@
+import os
+import tempfile
+
+import pytest
+
+from src.categories import Category
+from src.mapped import MappedCatalog
+from src.products import LawnGrass, Product, Smartphone
+from src.snapshot import save_snapshot
+
+
+class TestMappedCatalog:
+    """Тесты для каталога только для чтения поверх снимка."""
+
+    def setup_method(self):
+        """Создаем снимок с товарами разных классов."""
+        Category.reset_counters()
+        self.phone = Smartphone("Iphone 15", "512GB, Gray space", 210000.0, 8, 98.2, "15", 512, "Gray space")
+        self.grass = LawnGrass("Газонная трава", "Элитная трава", 500.0, 20, "Россия", "7 дней", "Зеленый")
+        self.product = Product('55" QLED 4K', "Фоновая подсветка", 123000.0, 7)
+        self.categories = [
+            Category("Смартфоны", "Описание смартфонов", [self.phone, self.product]),
+            Category("Сад", "Описание сада", [self.grass]),
+            Category("Пустая", "Без товаров", []),
+        ]
+        temp_file = tempfile.NamedTemporaryFile(suffix=".snap", delete=False)
+        temp_file.close()
+        self.path = temp_file.name
+        save_snapshot(self.categories, self.path)
+
+    def teardown_method(self):
+        """Удаляем файл снимка."""
+        os.unlink(self.path)
+
+    def test_read_api_matches_categories(self):
+        """Тест, что представления выдают те же данные, что и исходные категории."""
+        with MappedCatalog(self.path) as catalog:
+            assert (catalog.category_count, catalog.product_count, len(catalog)) == (3, 3, 3)
+
+            for mapped, original in zip(catalog, self.categories):
+                assert mapped.name == original.name
+                assert mapped.description == original.description
+                assert len(mapped) == len(original.products_list)
+                assert mapped.products == original.products
+                assert str(mapped) == str(original)
+                assert mapped.total_quantity == original.total_quantity
+                assert mapped.middle_price() == pytest.approx(original.middle_price())
+
+    def test_product_fields(self):
+        """Тест чтения полей продуктов и наследников."""
+        with MappedCatalog(self.path) as catalog:
+            phone, product = catalog.categories[0].products_list
+            (grass,) = catalog.categories[1]
+
+            assert (phone.name, phone.price, phone.quantity) == ("Iphone 15", 210000.0, 8)
+            assert (phone.model, phone.memory, phone.efficiency, phone.color) == ("15", 512, 98.2, "Gray space")
+            assert grass.country == "Россия"
+            assert grass.germination_period == "7 дней"
+            assert repr(product) == repr(self.product)
+            assert phone.product_class is Smartphone
+            with pytest.raises(AttributeError):
+                _ = product.model
+
+    def test_int_numbers(self):
+        """Тест, что целые цена и дробное поле читаются целыми, как в исходном продукте."""
+        phone = Smartphone("Samsung", "Описание", 100, 1, 95, "S23", 256, "Черный")
+        save_snapshot([Category("Смартфоны", "Описание", [phone])], self.path)
+
+        with MappedCatalog(self.path) as catalog:
+            (mapped,) = catalog.categories[0]
+
+            assert type(mapped.price) is int and type(mapped.efficiency) is int
+            assert (str(mapped), repr(mapped)) == (str(phone), repr(phone))
+            assert repr(mapped.materialize()) == repr(phone)
+
+    def test_read_only(self):
+        """Тест, что представления нельзя изменить."""
+        with MappedCatalog(self.path) as catalog:
+            product = catalog.categories[0].products_list[1]
+
+            with pytest.raises(AttributeError):
+                product.price = 1.0
+            with pytest.raises(AttributeError):
+                product.quantity = 1
+
+    def test_materialize(self, capsys):
+        """Тест создания обычного продукта из представления."""
+        with MappedCatalog(self.path) as catalog:
+            capsys.readouterr()
+            grass = catalog.categories[1].products_list[0].materialize()
+
+        assert isinstance(grass, LawnGrass)
+        assert repr(grass) == repr(self.grass)
+        assert capsys.readouterr().out == ""
+
+    def test_save_over_open_snapshot(self):
+        """Тест, что новый снимок в том же файле не меняет данные уже открытого каталога."""
+        with MappedCatalog(self.path) as catalog:
+            save_snapshot([Category("Новая", "Описание", [Product("Товар", "Описание", 1.0, 1)])], self.path)
+
+            assert catalog.category_count == 3
+            assert catalog.categories[0].total_quantity == 15
+            assert catalog.categories[1].products_list[0].name == "Газонная трава"
+
+        with MappedCatalog(self.path) as catalog:
+            assert [category.name for category in catalog] == ["Новая"]
+
+    def test_invalid_file(self):
+        """Тест открытия файла, который не является снимком."""
+        with open(self.path, "wb") as file:
+            file.write(b"x" * 64)
+
+        with pytest.raises(ValueError, match="не является снимком"):
+            MappedCatalog(self.path)
@@ -1,6 +1,8 @@
+import threading
+
 import pytest
 
-from src.order import AbstractBase, Order
+from src.order import AbstractBase, MultiItemOrder, Order
 from src.products import Product
 
 
@@ -77,3 +79,82 @@ class TestOrder:
         # Создаем новый заказ с новой ценой
         order2 = Order(self.product, 2)
         assert order2.total_price == 120000.0
+
+
+class TestMultiItemOrder:
+    """Тесты для заказа из нескольких позиций."""
+
+    def setup_method(self):
+        """Создаем продукты для тестов."""
+        self.phone = Product("Телефон", "Смартфон", 50000.0, 10)
+        self.laptop = Product("Ноутбук", "Игровой ноутбук", 100000.0, 2)
+
+    def test_multi_item_order_initialization(self):
+        """Тест инициализации и резервирования."""
+        order = MultiItemOrder([(self.phone, 2), (self.laptop, 1), (self.phone, 1)])
+
+        assert issubclass(MultiItemOrder, AbstractBase)
+        assert order.lines == [(self.phone, 3), (self.laptop, 1)]
+        assert order.total_price == 250000.0
+        assert order.name == "Заказ из 2 поз."
+        assert order.description == "Телефон - 3 шт., Ноутбук - 1 шт."
+        assert order.reserved is True
+        assert self.phone.quantity == 7
+        assert self.laptop.quantity == 1
+
+    def test_reservation_is_atomic(self):
+        """Тест, что при нехватке одного товара остатки не меняются."""
+        with pytest.raises(ValueError, match="Недостаточно товара Ноутбук"):
+            MultiItemOrder([(self.phone, 2), (self.laptop, 3)])
+
+        assert self.phone.quantity == 10
+        assert self.laptop.quantity == 2
+
+    def test_release(self):
+        """Тест возврата зарезервированных остатков."""
+        order = MultiItemOrder([(self.phone, 4)])
+        order.release()
+        order.release()
+
+        assert self.phone.quantity == 10
+        assert order.reserved is False
+
+    def test_concurrent_release_returns_stock_once(self):
+        """Тест, что одновременные вызовы release возвращают остатки один раз."""
+        order = MultiItemOrder([(self.phone, 4)])
+        barrier = threading.Barrier(8)
+
+        def release():
+            barrier.wait()
+            order.release()
+
+        threads = [threading.Thread(target=release) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert self.phone.quantity == 10
+        assert order.reserved is False
+
+    def test_without_reservation(self):
+        """Тест заказа без резервирования."""
+        order = MultiItemOrder([(self.laptop, 5)], reserve=False)
+
+        assert order.total_price == 500000.0
+        assert self.laptop.quantity == 2
+
+    def test_invalid_lines(self):
+        """Тест некорректных позиций заказа."""
+        with pytest.raises(ValueError, match="Количество товара должно быть больше 0"):
+            MultiItemOrder([(self.phone, 0)])
+
+        with pytest.raises(ValueError, match="хотя бы один товар"):
+            MultiItemOrder([])
+
+    def test_multi_item_order_str_and_repr(self):
+        """Тест строковых представлений заказа."""
+        order = MultiItemOrder([(self.phone, 1)], reserve=False)
+
+        assert str(order) == "Заказ из 1 поз.\nТовар: Телефон, количество: 1 шт.\nОбщая стоимость: 50000.0 руб."
+        assert repr(order).startswith("MultiItemOrder([(Product('Телефон'")
@@ -0,0 +1,119 @@
+import json
+import os
+import tempfile
+
+import pytest
+
+from src.catalog import Catalog
+from src.categories import Category
+from src.pricing import PriceRejection, load_price_list, reprice, reprice_from_file
+from src.products import Product
+
+
+class TestReprice:
+    """Тесты пакетного изменения цен."""
+
+    def setup_method(self):
+        """Создаем категории с общим товаром."""
+        Category.reset_counters()
+        self.phone = Product("Телефон", "Описание", 1000.0, 2)
+        self.laptop = Product("Ноутбук", "Описание", 5000.0, 1)
+        self.tv = Product("Телевизор", "Описание", 3000.0, 4)
+        self.category1 = Category("Категория 1", "Описание", [self.phone, self.laptop])
+        self.category2 = Category("Категория 2", "Описание", [self.phone, self.tv])
+
+    def test_prices_and_aggregates_updated(self, capsys):
+        """Тест применения цен и обновления агрегатов без вывода сообщений."""
+        self.category1.price_range()
+        str(self.phone)
+
+        report = reprice([self.category1, self.category2], {"Телефон": 1500.0, "Телевизор": 2500.0})
+
+        assert report == (2, [], True)
+        assert (self.phone.price, self.tv.price) == (1500.0, 2500.0)
+        assert self.category1.middle_price() == 3250.0
+        assert self.category2.stock_value == 1500.0 * 2 + 2500.0 * 4
+        assert self.category1.price_range(high=2000.0) == [self.phone]
+        assert str(self.phone) == "Телефон, 1500.0 руб. Остаток: 2 шт."
+        assert capsys.readouterr().out == ""
+
+    def test_atomic_rejects_whole_batch(self):
+        """Тест, что при ошибке в пакете цены не меняются, а ошибки собраны в отчет."""
+        report = reprice(
+            [self.category1, self.category2], {"Телефон": 1500.0, "Ноутбук": -1, "Планшет": 10.0, "Телевизор": "дорого"}
+        )
+
+        assert report.applied is False
+        assert report.updated == 0
+        assert report.rejected == [
+            PriceRejection("Ноутбук", -1, "Цена не должна быть нулевая или отрицательная"),
+            PriceRejection("Планшет", 10.0, "Товар не найден"),
+            PriceRejection("Телевизор", "дорого", "Цена должна быть числом"),
+        ]
+        assert self.phone.price == 1000.0
+
+    def test_non_atomic_applies_valid_rows(self):
+        """Тест частичного применения при atomic=False."""
+        report = reprice([self.category1], {"Телефон": 1500.0, "Ноутбук": float("nan")}, atomic=False)
+
+        assert report.applied is True
+        assert report.updated == 1
+        assert report.rejected[0].reason == "Цена должна быть конечным числом"
+        assert self.phone.price == 1500.0
+        # Категория 2 не передавалась, но получает уведомление как подписчик товара
+        assert self.category2.middle_price() == 2250.0
+
+    def test_other_observers_notified(self):
+        """Тест, что посторонние подписчики уведомляются поштучно."""
+        events = []
+        self.phone.subscribe(lambda product, field, old, new: events.append((field, old, new)))
+
+        reprice([self.category1], {"Телефон": 1200.0})
+
+        assert events == [("price", 1000.0, 1200.0)]
+
+    def test_unchanged_price_not_counted(self):
+        """Тест, что совпадающая цена не считается изменением."""
+        assert reprice([self.category1], {"Телефон": 1000.0}).updated == 0
+
+    def test_reprice_catalog_from_file(self):
+        """Тест применения прайс-листа из файла ко всему каталогу."""
+        catalog = Catalog()
+        product = Product("Товар", "Описание", 10.0, 1)
+        catalog.add_category("Категория", "Описание", [product])
+        temp_file = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8")
+        json.dump({"Товар": 20.0}, temp_file, ensure_ascii=False)
+        temp_file.close()
+
+        try:
+            report = reprice_from_file(catalog, temp_file.name)
+        finally:
+            os.unlink(temp_file.name)
+
+        assert report.updated == 1
+        assert catalog.categories[0].middle_price() == 20.0
+
+    def test_missing_file(self, capsys):
+        """Тест отсутствующего файла прайс-листа."""
+        report = reprice_from_file([self.category1], "нет_такого_файла.json")
+
+        assert report == (0, [PriceRejection("нет_такого_файла.json", None, "Файл не найден")], False)
+        assert capsys.readouterr().out == ""
+
+    @pytest.mark.parametrize("content", ["{", "[1, 2]"])
+    def test_corrupt_file(self, content):
+        """Тест поврежденного файла прайс-листа."""
+        temp_file = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8")
+        temp_file.write(content)
+        temp_file.close()
+
+        try:
+            report = reprice_from_file([self.category1], temp_file.name)
+            with pytest.raises(ValueError):
+                load_price_list(temp_file.name)
+        finally:
+            os.unlink(temp_file.name)
+
+        assert report.applied is False
+        assert report.rejected == [PriceRejection(temp_file.name, None, "Файл не является прайс-листом в формате JSON")]
+        assert self.phone.price == 1000.0
@@ -1,6 +1,7 @@
 import io
 import os
 import sys
+import weakref
 
 import pytest
 
@@ -417,3 +418,234 @@ class TestProductAdditionRestrictions:
 
         assert smartphone.price == 200000.0
         assert "Цена не должна быть нулевая или отрицательная" in captured_output.getvalue()
+
+
+class TestProductFromDict:
+    """Тесты для создания продуктов по полю "type"."""
+
+    def test_from_dict_without_type(self):
+        """Тест, что запись без типа создается как Product."""
+        product = Product.from_dict({"name": "Тест", "description": "Описание", "price": 100.0, "quantity": 5})
+
+        assert type(product) is Product
+        assert product.name == "Тест"
+
+    def test_from_dict_smartphone(self):
+        """Тест создания смартфона со всеми полями."""
+        product = Product.from_dict(
+            {
+                "type": "smartphone",
+                "name": "Iphone 15",
+                "description": "512GB",
+                "price": 210000.0,
+                "quantity": 8,
+                "efficiency": 98.2,
+                "model": "15",
+                "memory": 512,
+                "color": "Gray space",
+            }
+        )
+
+        assert isinstance(product, Smartphone)
+        assert (product.efficiency, product.model, product.memory, product.color) == (98.2, "15", 512, "Gray space")
+
+    def test_from_dict_lawn_grass(self):
+        """Тест создания газонной травы со всеми полями."""
+        product = Product.from_dict(
+            {
+                "type": "lawn_grass",
+                "name": "Трава",
+                "description": "Элитная",
+                "price": 500.0,
+                "quantity": 20,
+                "country": "Россия",
+                "germination_period": "7 дней",
+                "color": "Зеленый",
+            }
+        )
+
+        assert isinstance(product, LawnGrass)
+        assert (product.country, product.germination_period, product.color) == ("Россия", "7 дней", "Зеленый")
+
+    def test_from_dict_unknown_type(self):
+        """Тест ошибки при неизвестном типе продукта."""
+        with pytest.raises(ValueError, match="Неизвестный тип продукта: телевизор"):
+            Product.from_dict({"type": "телевизор", "name": "ТВ", "price": 1.0, "quantity": 1})
+
+    def test_product_types_registry(self):
+        """Тест реестра типов продуктов."""
+        assert Product._types == {"product": Product, "smartphone": Smartphone, "lawn_grass": LawnGrass}
+
+    def test_subclass_without_own_type_is_not_registered(self):
+        """Тест, что наследник без собственного product_type не подменяет класс родителя."""
+
+        class PromoPhone(Smartphone):
+            pass
+
+        product = Product.from_dict({"type": "smartphone", "name": "Телефон", "price": 1.0, "quantity": 1})
+
+        assert type(product) is Smartphone
+        assert Product._types["smartphone"] is Smartphone
+
+    def test_duplicate_product_type(self):
+        """Тест ошибки при повторной регистрации типа продукта."""
+        with pytest.raises(ValueError, match="Тип продукта smartphone уже зарегистрирован классом Smartphone"):
+
+            class OtherPhone(Product):
+                product_type = "smartphone"
+
+        assert Product._types["smartphone"] is Smartphone
+
+
+class TestProductObservers:
+    """Тесты для подписки на изменения продукта."""
+
+    def test_subscribe_price_and_quantity(self):
+        """Тест уведомлений об изменении цены и количества."""
+        product = Product("Тест", "Описание", 100.0, 5)
+        events = []
+        product.subscribe(lambda changed, field, old, new: events.append((changed, field, old, new)))
+
+        product.price = 150.0
+        product.quantity = 7
+
+        assert events == [(product, "price", 100.0, 150.0), (product, "quantity", 5, 7)]
+
+    def test_invalid_price_does_not_notify(self):
+        """Тест, что отклоненная цена не вызывает уведомление."""
+        product = Product("Тест", "Описание", 100.0, 5)
+        events = []
+        product.subscribe(lambda *args: events.append(args))
+
+        captured_output = io.StringIO()
+        sys.stdout = captured_output
+        product.price = -1
+        sys.stdout = sys.__stdout__
+
+        assert events == []
+
+    def test_unsubscribe(self):
+        """Тест отписки обработчика."""
+        product = Product("Тест", "Описание", 100.0, 5)
+        events = []
+
+        def observer(*args):
+            events.append(args)
+
+        product.subscribe(observer)
+        product.unsubscribe(observer)
+        product.quantity = 3
+
+        assert events == []
+        with pytest.raises(ValueError):
+            product.unsubscribe(observer)
+
+    def test_weak_method_observer(self):
+        """Тест, что слабая подписка не удерживает владельца и отбрасывается после его удаления."""
+        events = []
+
+        class Owner:
+            def on_change(self, *args):
+                events.append(args)
+
+        product = Product("Тест", "Описание", 100.0, 5)
+        owner = Owner()
+        product.subscribe(weakref.WeakMethod(owner.on_change))
+        product.quantity = 3
+        del owner
+        product.quantity = 4
+
+        assert events == [(product, "quantity", 5, 3)]
+        assert product._observers == ()
+
+    def test_no_observers_by_default(self):
+        """Тест, что без подписчиков у продукта пустой кортеж обработчиков."""
+        product = Product("Тест", "Описание", 100.0, 5)
+
+        assert product._observers == ()
+        product.quantity = 3
+        assert product.quantity == 3
+
+
+class TestProductSlots:
+    """Тесты для компактного представления продуктов."""
+
+    @pytest.mark.parametrize(
+        "product",
+        [
+            Product("Тест", "Описание", 100.0, 5),
+            Smartphone("Samsung", "Описание", 50000.0, 5, 95.5, "S23", 256, "Черный"),
+            LawnGrass("Трава", "Описание", 500.0, 20, "Россия", "7 дней", "Зеленый"),
+        ],
+    )
+    def test_products_have_no_dict(self, product):
+        """Тест, что у продуктов нет __dict__."""
+        assert not hasattr(product, "__dict__")
+        with pytest.raises(AttributeError):
+            product.unknown_attribute = 1
+
+    def test_slotted_products_keep_contract(self):
+        """Тест, что слоты не меняют поведение цены и сложения."""
+        smartphone1 = Smartphone("Samsung", "Описание", 1000.0, 2, 95.5, "S23", 256, "Черный")
+        smartphone2 = Smartphone("Iphone", "Описание", 2000.0, 3, 98.2, "15", 512, "Серый")
+
+        smartphone1.price = 1500.0
+
+        assert isinstance(smartphone1, BaseProduct)
+        assert smartphone1 + smartphone2 == 9000.0
+
+
+class TestProductRenderCache:
+    """Тесты кеширования строкового представления продукта."""
+
+    def test_str_is_cached(self):
+        """Тест, что повторный вызов str возвращает закешированную строку."""
+        product = Smartphone("Samsung", "Описание", 50000.0, 5, 95.5, "S23", 256, "Черный")
+
+        first = str(product)
+
+        assert str(product) is first
+        assert first == "Samsung, 50000.0 руб. Остаток: 5 шт. Модель: S23, 256ГБ, Черный"
+
+    def test_price_and_quantity_reset_cache(self):
+        """Тест, что изменение цены и количества сбрасывает кеш строки."""
+        product = Product("Тест", "Описание", 100.0, 5)
+        str(product)
+
+        product.price = 150.0
+        assert str(product) == "Тест, 150.0 руб. Остаток: 5 шт."
+
+        product.quantity = 7
+        assert str(product) == "Тест, 150.0 руб. Остаток: 7 шт."
+
+    @pytest.mark.parametrize(
+        "product, field, value",
+        [
+            (Product("Тест", "Описание", 100.0, 5), "name", "Новое название"),
+            (Product("Тест", "Описание", 100.0, 5), "description", "Новое описание"),
+            (Smartphone("Samsung", "Описание", 50000.0, 5, 95.5, "S23", 256, "Черный"), "memory", 512),
+            (LawnGrass("Трава", "Описание", 500.0, 20, "Россия", "7 дней", "Зеленый"), "country", "Китай"),
+        ],
+    )
+    def test_field_change_resets_cache_and_notifies(self, product, field, value):
+        """Тест, что изменение любого поля сбрасывает кеш строки и уведомляет подписчиков."""
+        changes = []
+        product.subscribe(lambda changed, name, old, new: changes.append((name, old, new)))
+        old = getattr(product, field)
+        first = str(product)
+
+        setattr(product, field, value)
+
+        assert getattr(product, field) == value
+        assert changes == [(field, old, value)]
+        assert str(product) is not first
+        assert str(value) in repr(product)
+
+    def test_invalid_price_keeps_cache(self, capsys):
+        """Тест, что отклоненная цена не сбрасывает кеш."""
+        product = Product("Тест", "Описание", 100.0, 5)
+        first = str(product)
+
+        product.price = -1
+
+        assert str(product) is first
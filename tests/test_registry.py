@@ -0,0 +1,57 @@
+from src.categories import Category
+from src.products import Product
+from src.registry import ProductRegistry
+
+
+class TestProductRegistry:
+    """Тесты для реестра продуктов."""
+
+    def setup_method(self):
+        """Сбрасываем счетчики перед каждым тестом."""
+        Category.reset_counters()
+
+    def test_add_new_and_duplicate(self):
+        """Тест добавления нового продукта и повторного добавления."""
+        registry = ProductRegistry()
+        product = Product("Телефон", "Смартфон", 50000.0, 10)
+
+        assert registry.add(product) is True
+        assert registry.add(product) is False
+        assert product in registry
+        assert len(registry) == 1
+
+    def test_insertion_order_preserved(self):
+        """Тест сохранения порядка добавления."""
+        registry = ProductRegistry()
+        products = [Product(f"Товар {i}", "Описание", 100.0, 1) for i in range(5)]
+
+        for product in reversed(products):
+            registry.add(product)
+
+        assert list(registry) == list(reversed(products))
+
+    def test_clear(self):
+        """Тест очистки реестра."""
+        registry = ProductRegistry()
+        registry.add(Product("Телефон", "Смартфон", 50000.0, 10))
+        registry.clear()
+
+        assert len(registry) == 0
+
+    def test_category_uses_registry(self):
+        """Тест, что Category учитывает продукт глобально один раз."""
+        product = Product("Телефон", "Смартфон", 50000.0, 10)
+
+        Category("Категория 1", "Описание", [product])
+        Category("Категория 2", "Описание", [product])
+
+        assert isinstance(Category._all_products, ProductRegistry)
+        assert product in Category._all_products
+        assert Category.product_count == 1
+
+    def test_reset_counters_clears_registry(self):
+        """Тест, что reset_counters создает новый пустой реестр."""
+        Category("Категория", "Описание", [Product("Телефон", "Смартфон", 50000.0, 10)])
+        Category.reset_counters()
+
+        assert len(Category._all_products) == 0
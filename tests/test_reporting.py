@@ -0,0 +1,89 @@
+import io
+import logging
+import sys
+import threading
+
+import pytest
+
+from src.categories import Category
+from src.products import Product
+from src.reporting import SILENT, Reporter, configure, print_sink, reporter, silenced
+
+
+@pytest.fixture
+def restore_reporter():
+    """Фикстура, восстанавливающая настройки глобального приемника."""
+    sink, level = reporter.sink, reporter.level
+    yield
+    reporter.sink, reporter.level = sink, level
+
+
+class TestReporter:
+    """Тесты для приемника сообщений."""
+
+    def test_level_filtering(self):
+        """Тест фильтрации сообщений по уровню."""
+        messages = []
+        local_reporter = Reporter(sink=lambda level, message: messages.append((level, message)), level=logging.INFO)
+
+        local_reporter.report(logging.DEBUG, "скрыто")
+        local_reporter.report(logging.WARNING, "Товар %s", "Телефон")
+
+        assert messages == [(logging.WARNING, "Товар Телефон")]
+        assert local_reporter.is_enabled_for(logging.INFO) is True
+        assert local_reporter.is_enabled_for(logging.DEBUG) is False
+
+    def test_disabled_reporter_does_not_format(self):
+        """Тест, что при отключенном уровне аргументы не форматируются."""
+
+        class Explosive:
+            def __repr__(self):
+                raise AssertionError("repr не должен вызываться")
+
+        local_reporter = Reporter(level=SILENT)
+        local_reporter.report(logging.INFO, "%r", Explosive())
+
+    def test_silenced_disables_product_creation_output(self, restore_reporter):
+        """Тест, что в режиме silenced создание продукта ничего не печатает."""
+        captured_output = io.StringIO()
+        sys.stdout = captured_output
+        with silenced():
+            Product("Тест", "Описание", 100.0, 5)
+        sys.stdout = sys.__stdout__
+
+        assert captured_output.getvalue() == ""
+        assert reporter.sink is print_sink
+
+    def test_silenced_is_thread_local(self, restore_reporter):
+        """Тест, что silenced в одном потоке не отключает сообщения других потоков и не меняет уровень."""
+        messages = []
+        configure(sink=lambda level, message: messages.append(message), level=logging.DEBUG)
+        entered = threading.Event()
+        reported = threading.Event()
+
+        def silent_worker():
+            with silenced():
+                entered.set()
+                reported.wait()
+                reporter.report(logging.INFO, "скрыто")
+
+        worker = threading.Thread(target=silent_worker)
+        worker.start()
+        entered.wait()
+        reporter.report(logging.INFO, "видно")
+        reported.set()
+        worker.join()
+
+        assert messages == ["видно"]
+        assert reporter.level == logging.DEBUG
+
+    def test_configure_with_logger(self, restore_reporter, caplog):
+        """Тест подключения стандартного логгера в качестве приемника."""
+        configure(sink=logging.getLogger("catalog").log, level=logging.INFO)
+
+        with caplog.at_level(logging.DEBUG, logger="catalog"):
+            category = Category("Категория", "Описание", [])
+            category.add_product(Product("Телефон", "Смартфон", 50000.0, 10))
+
+        messages = [record.getMessage() for record in caplog.records]
+        assert messages == ["Product('Телефон', 'Смартфон', 50000.0, 10)", "Товар Телефон успешно добавлен"]
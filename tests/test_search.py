@@ -0,0 +1,54 @@
+from src.categories import Category
+from src.products import Product, Smartphone
+from src.search import SearchIndex, tokenize
+
+
+class TestTokenize:
+    """Тесты разбиения текста на слова."""
+
+    def test_case_and_yo_are_normalized(self):
+        """Тест приведения регистра и замены "ё"."""
+        assert tokenize("Зелёная ТРАВА, 256GB!") == ["зеленая", "трава", "256gb"]
+
+    def test_empty_text(self):
+        """Тест пустой строки."""
+        assert tokenize("  -- ") == []
+
+
+class TestSearchIndex:
+    """Тесты инвертированного индекса."""
+
+    def setup_method(self):
+        """Создаем индекс с несколькими продуктами."""
+        Category.reset_counters()
+        self.phone = Smartphone("Samsung Galaxy", "Флагманский смартфон", 1.0, 1, 95.5, "S23", 256, "Черный")
+        self.budget = Smartphone("Xiaomi Redmi", "Бюджетный смартфон", 1.0, 1, 80.0, "Note", 128, "Синий")
+        self.tv = Product("Телевизор", "Смарт-телевизор с ёмким аккумулятором пульта", 1.0, 1)
+        self.index = SearchIndex([self.phone, self.budget, self.tv])
+
+    def test_single_term(self):
+        """Тест поиска по одному слову в описании."""
+        assert self.index.search("СМАРТФОН") == [self.phone, self.budget]
+
+    def test_multi_term_intersection(self):
+        """Тест, что найденные продукты содержат все слова запроса."""
+        assert self.index.search("бюджетный смартфон") == [self.budget]
+        assert self.index.search("бюджетный телевизор") == []
+
+    def test_prefix(self):
+        """Тест поиска по префиксу."""
+        assert self.index.search("смарт", prefix=True) == [self.phone, self.budget, self.tv]
+        assert self.index.search("смарт") == [self.tv]
+        assert self.index.search("емк акк", prefix=True) == [self.tv]
+
+    def test_add_many_skips_known_products(self):
+        """Тест, что продукт индексируется один раз."""
+        laptop = Product("Ноутбук", "Игровой", 1.0, 1)
+
+        assert self.index.add_many([laptop, self.phone, laptop]) == 1
+        assert self.index.search("ноутбук") == [laptop]
+        assert len(self.index) == 4
+
+    def test_empty_query(self):
+        """Тест запроса без слов."""
+        assert self.index.search("!!!") == []
@@ -0,0 +1,159 @@
+import os
+import tempfile
+
+import pytest
+
+from src.catalog import Catalog
+from src.categories import Category
+from src.products import LawnGrass, Product, Smartphone
+from src.snapshot import load_snapshot, save_snapshot
+
+
+class TestSnapshot:
+    """Тесты для бинарного снимка каталога."""
+
+    def setup_method(self):
+        """Создаем категории и путь к файлу снимка."""
+        Category.reset_counters()
+        self.phone = Smartphone("Iphone 15", "512GB, Gray space", 210000.0, 8, 98.2, "15", 512, "Gray space")
+        self.grass = LawnGrass("Газонная трава", "Элитная трава", 500.0, 20, "Россия", "7 дней", "Зеленый")
+        self.product = Product('55" QLED 4K', "Фоновая подсветка", 123000.0, 7)
+        self.categories = [
+            Category("Смартфоны", "Описание", [self.phone, self.product]),
+            Category("Сад", "Описание", [self.grass, self.product]),
+            Category("Пустая", "Без товаров", []),
+        ]
+        temp_file = tempfile.NamedTemporaryFile(suffix=".snap", delete=False)
+        temp_file.close()
+        self.path = temp_file.name
+
+    def teardown_method(self):
+        """Удаляем файл снимка."""
+        os.unlink(self.path)
+
+    def test_round_trip(self):
+        """Тест сохранения и восстановления категорий со всеми полями."""
+        save_snapshot(self.categories, self.path)
+        Category.reset_counters()
+
+        restored = load_snapshot(self.path)
+
+        assert [category.name for category in restored] == ["Смартфоны", "Сад", "Пустая"]
+        assert [str(product) for product in restored[0]] == [str(self.phone), str(self.product)]
+        assert [repr(product) for product in restored[1]] == [repr(self.grass), repr(self.product)]
+        assert restored[0].products_list[0].efficiency == 98.2
+        assert restored[0].products_list[0].memory == 512
+        assert restored[2].products_list == []
+        assert restored[0].middle_price() == self.categories[0].middle_price()
+        # Общий продукт восстанавливается одним объектом
+        assert restored[0].products_list[1] is restored[1].products_list[1]
+        assert Category.category_count == 3
+        assert Category.product_count == 3
+
+    def test_int_numbers_round_trip(self):
+        """Тест, что целые цена и дробное поле восстанавливаются целыми и вывод продукта не меняется."""
+        phone = Smartphone("Samsung", "Описание", 100, 1, 95, "S23", 256, "Черный")
+        save_snapshot([Category("Смартфоны", "Описание", [phone, self.product])], self.path)
+
+        restored, other = load_snapshot(self.path)[0].products_list
+
+        assert (restored.price, restored.efficiency) == (100, 95)
+        assert type(restored.price) is int and type(restored.efficiency) is int
+        assert (str(restored), repr(restored)) == (str(phone), repr(phone))
+        assert type(other.price) is float
+
+    def test_restored_products_are_live(self, capsys):
+        """Тест, что восстановленные продукты работают как обычные и создаются без вывода."""
+        save_snapshot(self.categories, self.path)
+        capsys.readouterr()
+
+        restored = load_snapshot(self.path, catalog=Catalog())
+        product = restored[0].products_list[0]
+        product.quantity = 10
+
+        assert capsys.readouterr().out == ""
+        assert isinstance(product, Smartphone)
+        assert restored[0].total_quantity == 17
+        assert restored[0].catalog.product_count == 3
+
+    def test_products_are_created_on_first_access(self):
+        """Тест, что загрузка не создает продукты, а агрегаты категорий доступны сразу."""
+        save_snapshot(self.categories, self.path)
+        Category.reset_counters()
+
+        restored = load_snapshot(self.path)
+
+        assert [category._pending for category in restored] == [2, 2, 0]
+        assert restored[0].total_quantity == 15
+        assert restored[1].stock_value == self.categories[1].stock_value
+        assert restored[1].middle_price() == self.categories[1].middle_price()
+        assert Category.product_count == 3
+        assert len(Category._all_products) == 0
+
+        assert restored[0].page(0, 1)[0].name == "Iphone 15"
+        assert restored[0]._pending == 1
+
+    def test_shared_product_changed_before_access(self):
+        """Тест агрегатов категории, общий продукт которой изменили через другую категорию до обращения."""
+        save_snapshot(self.categories, self.path)
+        restored = load_snapshot(self.path)
+
+        shared = restored[0].products_list[1]
+        shared.quantity = 100
+        shared.price = 1000.0
+
+        # Агрегаты второй категории обновлены до создания ее продуктов
+        assert restored[1]._pending == 2
+        assert restored[1].total_quantity == 120
+        assert restored[1].stock_value == 500.0 * 20 + 1000.0 * 100
+        assert restored[1].middle_price() == (500.0 + 1000.0) / 2
+
+        assert restored[1].products_list[1] is shared
+        assert restored[1].total_quantity == 120
+        assert restored[1].stock_value == 500.0 * 20 + 1000.0 * 100
+
+    def test_shared_product_added_before_access(self):
+        """Тест, что общий продукт не добавляется повторно в категорию, где он еще не создан."""
+        save_snapshot(self.categories, self.path)
+        restored = load_snapshot(self.path)
+        shared = restored[0].products_list[1]
+
+        restored[1].add_product(shared)
+
+        assert len(restored[1].products_list) == 2
+        assert restored[1].products_list[1] is shared
+        assert restored[1].total_quantity == 27
+        assert len(shared._observers) == 2
+
+    def test_save_over_loaded_snapshot(self):
+        """Тест, что сохранение снимка в файл загруженного снимка не портит несозданные продукты."""
+        save_snapshot(self.categories, self.path)
+        restored = load_snapshot(self.path)
+
+        save_snapshot(self.categories[1:2], self.path)
+
+        assert [product.name for product in restored[1].page(0, 3)] == ["Газонная трава", '55" QLED 4K']
+        assert repr(restored[0].products_list[0]) == repr(self.phone)
+        assert [category.name for category in load_snapshot(self.path)] == ["Сад"]
+
+    def test_invalid_file(self):
+        """Тест загрузки файла, который не является снимком."""
+        with open(self.path, "wb") as file:
+            file.write(b"not a snapshot at all")
+
+        with pytest.raises(ValueError, match="не является снимком"):
+            load_snapshot(self.path)
+
+    def test_unsupported_product_type(self):
+        """Тест сохранения продукта неизвестного формату типа."""
+
+        class Television(Product):
+            product_type = "television"
+
+        try:
+            category = Category("ТВ", "Описание", [Television("ТВ", "Описание", 1.0, 1)])
+
+            with pytest.raises(ValueError, match="не поддерживается снимком: television"):
+                save_snapshot([category], self.path)
+        finally:
+            del Product._types["television"]
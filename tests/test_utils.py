@@ -2,9 +2,25 @@ import json
 import os
 import tempfile
 
+import pytest
+
+from src.catalog import Catalog
 from src.categories import Category
-from src.products import Product
-from src.utils import load_categories_from_json
+from src.products import LawnGrass, Product, Smartphone
+from src.utils import (
+    ShardConflict,
+    iter_categories_from_json,
+    load_categories_from_json,
+    load_categories_from_shards,
+)
+
+
+def create_test_json_file(data):
+    """Создает временный JSON файл для тестирования."""
+    temp_file = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8")
+    json.dump(data, temp_file, ensure_ascii=False, indent=2)
+    temp_file.close()
+    return temp_file.name
 
 
 class TestJsonLoader:
@@ -15,13 +31,6 @@ class TestJsonLoader:
         Category.category_count = 0
         Category.product_count = 0
 
-    def create_test_json_file(self, data):
-        """Создает временный JSON файл для тестирования."""
-        temp_file = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8")
-        json.dump(data, temp_file, ensure_ascii=False, indent=2)
-        temp_file.close()
-        return temp_file.name
-
     def test_load_categories_from_valid_json(self):
         """Тест загрузки из корректного JSON файла."""
         test_data = [
@@ -46,7 +55,7 @@ class TestJsonLoader:
         ]
 
         # Создаем временный файл
-        temp_file_path = self.create_test_json_file(test_data)
+        temp_file_path = create_test_json_file(test_data)
 
         try:
             # Загружаем данные
@@ -112,7 +121,7 @@ class TestJsonLoader:
         """Тест загрузки категории без продуктов."""
         test_data = [{"name": "Пустая категория", "description": "Категория без продуктов", "products": []}]
 
-        temp_file_path = self.create_test_json_file(test_data)
+        temp_file_path = create_test_json_file(test_data)
 
         try:
             categories = load_categories_from_json(temp_file_path)
@@ -148,7 +157,7 @@ class TestJsonLoader:
             },
         ]
 
-        temp_file_path = self.create_test_json_file(test_data)
+        temp_file_path = create_test_json_file(test_data)
 
         try:
             categories = load_categories_from_json(temp_file_path)
@@ -192,7 +201,7 @@ class TestJsonLoader:
         ]
 
         # Создаем временный файл
-        temp_file_path = self.create_test_json_file(test_data)
+        temp_file_path = create_test_json_file(test_data)
 
         try:
             # Загружаем данные
@@ -226,3 +235,292 @@ class TestJsonLoader:
         finally:
             # Удаляем временный файл
             os.unlink(temp_file_path)
+
+
+class TestStreamingJsonLoader:
+    """Тесты для потоковой загрузки данных из JSON."""
+
+    def setup_method(self):
+        """Сбрасываем счетчики перед каждым тестом."""
+        Category.category_count = 0
+        Category.product_count = 0
+
+    def test_iter_categories_small_chunks(self):
+        """Тест потоковой загрузки при блоке меньше размера категории."""
+        test_data = [
+            {
+                "name": f"Категория {i}",
+                "description": f"Описание {i}",
+                "products": [
+                    {"name": f"Продукт {i}-{j}", "description": "Описание", "price": 100.0 * j, "quantity": j}
+                    for j in range(1, 4)
+                ],
+            }
+            for i in range(5)
+        ]
+        temp_file_path = create_test_json_file(test_data)
+
+        try:
+            iterator = iter_categories_from_json(temp_file_path, chunk_size=16)
+
+            first = next(iterator)
+            # Категории создаются по мере чтения, а не все сразу
+            assert first.name == "Категория 0"
+            assert Category.category_count == 1
+
+            categories = [first, *iterator]
+            assert [category.name for category in categories] == [f"Категория {i}" for i in range(5)]
+            assert [product.name for product in categories[4]] == ["Продукт 4-1", "Продукт 4-2", "Продукт 4-3"]
+            assert Category.product_count == 15
+        finally:
+            os.unlink(temp_file_path)
+
+    def test_iter_categories_empty_array(self):
+        """Тест потоковой загрузки пустого массива."""
+        temp_file_path = create_test_json_file([])
+
+        try:
+            assert list(iter_categories_from_json(temp_file_path)) == []
+        finally:
+            os.unlink(temp_file_path)
+
+    def test_iter_categories_nonexistent_file(self, capsys):
+        """Тест потоковой загрузки из несуществующего файла."""
+        assert list(iter_categories_from_json("nonexistent_file.json")) == []
+        assert "не найден" in capsys.readouterr().out
+
+    def test_iter_categories_invalid_json(self, capsys):
+        """Тест потоковой загрузки из обрезанного JSON файла."""
+        temp_file = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8")
+        temp_file.write('[{"name": "Категория", "description": "Описание", "products": []}, {"name": ')
+        temp_file.close()
+
+        try:
+            categories = list(iter_categories_from_json(temp_file.name, chunk_size=8))
+            assert [category.name for category in categories] == ["Категория"]
+            assert "Ошибка при чтении JSON файла" in capsys.readouterr().out
+        finally:
+            os.unlink(temp_file.name)
+
+    def test_iter_categories_typed_products(self):
+        """Тест, что загрузчик создает наследников по полю "type"."""
+        test_data = [
+            {
+                "name": "Смешанная категория",
+                "description": "Описание",
+                "products": [
+                    {"name": "Продукт", "description": "Описание", "price": 100.0, "quantity": 1},
+                    {
+                        "type": "smartphone",
+                        "name": "Смартфон",
+                        "description": "Описание",
+                        "price": 50000.0,
+                        "quantity": 2,
+                        "efficiency": 90.0,
+                        "model": "X",
+                        "memory": 128,
+                        "color": "Черный",
+                    },
+                    {
+                        "type": "lawn_grass",
+                        "name": "Трава",
+                        "description": "Описание",
+                        "price": 500.0,
+                        "quantity": 20,
+                        "country": "Россия",
+                        "germination_period": "7 дней",
+                        "color": "Зеленый",
+                    },
+                ],
+            }
+        ]
+        temp_file_path = create_test_json_file(test_data)
+
+        try:
+            (streamed,) = list(iter_categories_from_json(temp_file_path))
+            (loaded,) = load_categories_from_json(temp_file_path)
+
+            for category in (streamed, loaded):
+                assert [type(product) for product in category] == [Product, Smartphone, LawnGrass]
+                assert category.products_list[1].model == "X"
+                assert category.products_list[2].country == "Россия"
+        finally:
+            os.unlink(temp_file_path)
+
+    def test_iter_categories_lazy(self, capsys):
+        """Тест отложенного создания продуктов при загрузке с lazy=True."""
+        test_data = [
+            {
+                "name": "Категория",
+                "description": "Описание",
+                "products": [
+                    {"name": f"Продукт {i}", "description": "Описание", "price": 100.0, "quantity": 1} for i in range(5)
+                ],
+            }
+        ]
+        temp_file_path = create_test_json_file(test_data)
+
+        try:
+            (category,) = list(iter_categories_from_json(temp_file_path, lazy=True))
+
+            assert category.total_quantity == 5
+            assert category._pending == 5
+            assert next(iter(category)).name == "Продукт 0"
+            assert category._pending == 4
+            assert capsys.readouterr().out == ""
+        finally:
+            os.unlink(temp_file_path)
+
+
+class TestShardLoader:
+    """Тесты для параллельной загрузки нескольких JSON файлов."""
+
+    def setup_method(self):
+        """Сбрасываем счетчики и реестр перед каждым тестом."""
+        Category.reset_counters()
+
+    def test_load_shards_merges_and_deduplicates(self):
+        """Тест объединения категорий и дедупликации продуктов между файлами."""
+        phone = {"name": "Телефон", "description": "Смартфон", "price": 50000.0, "quantity": 10}
+        grass = {
+            "type": "lawn_grass",
+            "name": "Трава",
+            "description": "Элитная",
+            "price": 500.0,
+            "quantity": 20,
+            "country": "Россия",
+            "germination_period": "7 дней",
+            "color": "Зеленый",
+        }
+        shard1 = [{"name": "Техника", "description": "Описание", "products": [phone]}]
+        shard2 = [
+            {"name": "Техника", "description": "Описание", "products": [phone, {**phone, "name": "Ноутбук"}]},
+            {"name": "Сад", "description": "Описание", "products": [grass]},
+        ]
+        paths = [create_test_json_file(shard1), create_test_json_file(shard2)]
+
+        try:
+            categories = load_categories_from_shards(paths, max_workers=2)
+
+            assert [category.name for category in categories] == ["Техника", "Сад"]
+            assert [product.name for product in categories[0]] == ["Телефон", "Ноутбук"]
+            assert isinstance(categories[1].products_list[0], LawnGrass)
+            assert categories[1].products_list[0].country == "Россия"
+            assert Category.category_count == 2
+            assert Category.product_count == 3
+        finally:
+            for path in paths:
+                os.unlink(path)
+
+    def test_load_shards_reuses_registered_products(self):
+        """Тест, что продукт из реестра не создается повторно."""
+        existing = Product("Телефон", "Смартфон", 50000.0, 10)
+        catalog = Catalog()
+        catalog.add_category("Старое", "Описание", [existing])
+        path = create_test_json_file(
+            [
+                {
+                    "name": "Новое",
+                    "description": "Описание",
+                    "products": [{"name": "Телефон", "price": 1.0, "quantity": 1}],
+                }
+            ]
+        )
+
+        try:
+            (category,) = load_categories_from_shards([path], max_workers=1, catalog=catalog)
+
+            assert category.products_list == [existing]
+            assert catalog.product_count == 1
+            assert Category.product_count == 0
+        finally:
+            os.unlink(path)
+
+    def test_load_shards_reports_conflicting_records(self):
+        """Тест, что записи с другой ценой или количеством возвращаются в conflicts."""
+        product = {"name": "X", "description": "Описание", "price": 100.0, "quantity": 5}
+        shard1 = [{"name": "Категория", "description": "Описание", "products": [product]}]
+        changed = {**product, "price": 999.0, "quantity": 50}
+        shard2 = [{"name": "Категория", "description": "Описание", "products": [product, changed]}]
+        paths = [create_test_json_file(shard1), create_test_json_file(shard2)]
+        conflicts = []
+
+        try:
+            (category,) = load_categories_from_shards(paths, max_workers=1, conflicts=conflicts)
+
+            (kept,) = category.products_list
+            assert (kept.price, kept.quantity) == (100.0, 5)
+            assert conflicts == [ShardConflict(paths[1], "Категория", kept, 999.0, 50)]
+        finally:
+            for path in paths:
+                os.unlink(path)
+
+    def test_load_shards_defers_products(self):
+        """Тест, что основной процесс не создает продукты, а агрегаты общих продуктов остаются точными."""
+        phone = {"name": "Телефон", "description": "Смартфон", "price": 100.0, "quantity": 3}
+        shard1 = [{"name": "Техника", "description": "Описание", "products": [phone]}]
+        shard2 = [{"name": "Акции", "description": "Описание", "products": [phone, {**phone, "name": "Планшет"}]}]
+        paths = [create_test_json_file(shard1), create_test_json_file(shard2)]
+
+        try:
+            technics, sales = load_categories_from_shards(paths, max_workers=2)
+
+            assert [technics._pending, sales._pending] == [1, 2]
+            assert len(Category._all_products) == 0
+            assert Category.product_count == 2
+            assert sales.total_quantity == 6
+
+            shared = technics.products_list[0]
+            shared.quantity = 10
+            shared.price = 500.0
+            assert (sales.total_quantity, sales.middle_price()) == (13, 300.0)
+
+            sales.add_product(shared)
+            assert sales.products_list[0] is shared
+            assert len(sales.products_list) == 2
+            assert sales.stock_value == 500.0 * 10 + 100.0 * 3
+        finally:
+            for path in paths:
+                os.unlink(path)
+
+    def test_load_shards_conflict_product_is_live(self):
+        """Тест, что продукт из отчета о конфликтах учитывается агрегатами категории."""
+        product = {"name": "X", "description": "Описание", "price": 100.0, "quantity": 5}
+        path = create_test_json_file(
+            [{"name": "Категория", "description": "Описание", "products": [product, {**product, "quantity": 7}]}]
+        )
+        conflicts = []
+
+        try:
+            (category,) = load_categories_from_shards([path], max_workers=1, conflicts=conflicts)
+
+            kept = conflicts[0].product
+            kept.quantity = 50
+            assert category.total_quantity == 50
+            assert category.products_list == [kept]
+            assert category.total_quantity == 50
+        finally:
+            os.unlink(path)
+
+    def test_load_shards_validates_records(self):
+        """Тест, что ошибки записей, найденные воркером, передаются вызывающему."""
+        product = {"name": "X", "description": "Описание", "price": 100.0, "quantity": 0}
+        path = create_test_json_file([{"name": "Категория", "description": "Описание", "products": [product]}])
+
+        try:
+            with pytest.raises(ValueError, match="нулевым количеством"):
+                load_categories_from_shards([path], max_workers=1)
+        finally:
+            os.unlink(path)
+
+    def test_load_shards_skips_unreadable_files(self, capfd):
+        """Тест, что нечитаемые файлы пропускаются."""
+        path = create_test_json_file([{"name": "Категория", "description": "Описание", "products": []}])
+
+        try:
+            categories = load_categories_from_shards(["nonexistent_file.json", path], max_workers=1)
+
+            assert [category.name for category in categories] == ["Категория"]
+            assert "не найден" in capfd.readouterr().out
+        finally:
+            os.unlink(path)
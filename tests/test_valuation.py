@@ -0,0 +1,48 @@
+import pytest
+
+from src.categories import Category
+from src.products import LawnGrass, Smartphone
+from src.valuation import stock_value, stock_value_by_class
+
+
+class TestValuation:
+    """Тесты для пакетной оценки стоимости товаров."""
+
+    def setup_method(self):
+        """Создаем категории с товарами разных классов."""
+        Category.reset_counters()
+        self.smartphone1 = Smartphone("Samsung", "Описание", 1000.0, 2, 95.5, "S23", 256, "Черный")
+        self.smartphone2 = Smartphone("Iphone", "Описание", 2000.0, 3, 98.2, "15", 512, "Серый")
+        self.grass = LawnGrass("Трава", "Описание", 500.0, 20, "Россия", "7 дней", "Зеленый")
+        self.phones = Category("Смартфоны", "Описание", [self.smartphone1, self.smartphone2])
+        self.mixed = Category("Разное", "Описание", [self.smartphone1, self.grass])
+
+    def test_stock_value_single_category_matches_add(self):
+        """Тест, что оценка категории совпадает со сложением через __add__."""
+        assert stock_value([self.phones], same_class=True) == self.smartphone1 + self.smartphone2
+        assert self.phones.to_columns().stock_value() == self.phones.stock_value
+
+    def test_stock_value_across_categories_counts_products_once(self):
+        """Тест, что товар из нескольких категорий учитывается один раз."""
+        # 1000 * 2 + 2000 * 3 + 500 * 20
+        assert stock_value([self.phones, self.mixed]) == 18000.0
+
+    def test_stock_value_by_class(self):
+        """Тест стоимости по классам продуктов."""
+        assert stock_value_by_class([self.phones, self.mixed]) == {"Smartphone": 8000.0, "LawnGrass": 10000.0}
+
+    def test_same_class_constraint(self):
+        """Тест, что смешанные классы запрещены так же, как в __add__."""
+        with pytest.raises(TypeError, match="Нельзя складывать товары разных классов: Smartphone и LawnGrass"):
+            stock_value([self.mixed], same_class=True)
+
+    def test_empty(self):
+        """Тест оценки без товаров."""
+        assert stock_value([]) == 0.0
+        assert stock_value_by_class([Category("Пустая", "Описание", [])]) == {}
+
+    def test_filtered_columns_skip_absent_classes(self):
+        """Тест, что после фильтрации классы без строк не попадают в отчет."""
+        columns = self.mixed.to_columns().filter("price", lambda price: price < 1000)
+
+        assert columns.stock_value_by_type() == {"LawnGrass": 10000.0}